@@ -1,3 +1,21 @@
-from .central_orchestrator_agent import root_agent
+from services.lazy import lazy_globals
+from services.telemetry import setup_telemetry, start_metrics_server
+from utils.config import INTENT_ROUTER, TELEMETRY_METRICS_PORT
 
-__all__ = ["root_agent"]
\ No newline at end of file
+# Jira, tool, agent and LLM spans of the ADK server process (TELEMETRY=1)
+if setup_telemetry("sprintmind-agents"):
+    start_metrics_server(TELEMETRY_METRICS_PORT)
+
+
+def _root_agent():
+    if INTENT_ROUTER:
+        from .intent_router_agent import intent_router_agent
+        return intent_router_agent
+    from .central_orchestrator_agent import central_orchestrator_agent
+    return central_orchestrator_agent
+
+
+# The agent tree (and google.adk with it) is built when ADK first looks up root_agent
+__getattr__ = lazy_globals(globals(), root_agent=_root_agent)
+
+__all__ = ["root_agent"]
@@ -41,7 +41,8 @@ central_orchestrator_agent = LlmAgent(
     1. **Classify Intent:** Identify if the request is related to standups, epic breakdown, ticket search, risk detection, or release notes.
     2. **Route to Agent(s):**
     - For a single-agent task, forward the request directly.
-    - For multi-agent tasks, execute in sequence and merge results.
+    - For multi-agent tasks, call the agents for independent parts in the same step (they run concurrently)
+      and merge the results; call them one after another only when a part needs another agent's output.
     3. **Format the Output:**
     - Always produce clear, concise summaries.
     - Use bullet points, tables, or sections when possible.
@@ -54,7 +55,8 @@ central_orchestrator_agent = LlmAgent(
         AgentTool(epic_decomposer_agent),
         AgentTool(kb_extractor_agent)
         ],
-    output_key="central_orchestrator_agent_result"
+    output_key="central_orchestrator_agent_result",
+    # Under the intent router it must answer itself rather than hand the session over
+    disallow_transfer_to_parent=True,
+    disallow_transfer_to_peers=True
 )
-
-root_agent = central_orchestrator_agent
@@ -0,0 +1,209 @@
+import asyncio
+import inspect
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from pydantic import PrivateAttr
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.tools import FunctionTool
+from google.genai import types
+from utils.config import (
+    INTENT_ROUTER_THRESHOLD, INTENT_ROUTER_MARGIN,
+    INTENT_FANOUT, INTENT_FANOUT_CONCURRENCY, INTENT_FANOUT_TIMEOUT,
+    AGENT_CACHE, AGENT_CACHE_TTL, AGENT_CACHE_MAXSIZE, AGENT_CACHE_SIMILARITY,
+)
+from services.agent_cache import AgentResponseCache, CachedResponse
+from services.intent_router import IntentRouter, ORCHESTRATOR
+from services.tenants import tenant_registry, use_tenant
+from agents.central_orchestrator_agent import central_orchestrator_agent
+from agents.sprint_manager_agent import sprint_manager_agent
+from agents.kb_extractor_aget import kb_extractor_agent
+from agents.epic_decomposer_agent import epic_decomposer_agent
+from agents.response_merger_agent import response_merger_agent
+
+
+class IntentRouterAgent(BaseAgent):
+    """
+    Sends each request straight to the one agent that handles it when the
+    IntentRouter is confident, skipping the orchestrator's LLM round-trips;
+    everything else goes to the orchestrator as before.
+
+    Compound requests whose parts are independent ("standup plus any past
+    tickets about the blockers") fan out: the agents run concurrently, each
+    on its own branch, at most ``max_concurrency`` at a time and each cut
+    off after ``branch_timeout`` seconds. Their ``output_key`` results are
+    then combined by the merger agent.
+
+    With a ``cache``, answers to routed requests are reused for
+    near-identical questions from the same tenant while the Jira data
+    behind them is unchanged. Agents in ``uncached_agents`` write to Jira
+    or produce output that is not derived from read-only tool calls
+    (e.g. the epic decomposer's drafted stories), so they are never cached.
+    """
+
+    router: IntentRouter
+    cache: Optional[AgentResponseCache] = None
+    uncached_agents: Tuple[str, ...] = ("epic_decomposer_agent",)
+    merger_name: str = "response_merger_agent"
+    max_concurrency: int = 3
+    branch_timeout: float = 120.0
+
+    _semaphore: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+    _tools: Optional[Dict[str, FunctionTool]] = PrivateAttr(default=None)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        parts = ctx.user_content.parts if ctx.user_content and ctx.user_content.parts else []
+        text = " ".join(part.text for part in parts if part.text)
+        # Embedding the request is CPU work; keep it off the event loop
+        decision = await asyncio.to_thread(self.router.route, text)
+        agents = [agent for agent in map(self.find_sub_agent, decision['agents']) if agent is not None]
+        if not agents:
+            agents = [self.find_sub_agent(ORCHESTRATOR)]
+        print(f"Routed to {', '.join(agent.name for agent in agents)} ({decision['method']}, "
+              f"confidence {decision['confidence']}, {1000 * decision['seconds']:.1f}ms)")
+
+        # Only confidently routed asks are cached; orchestrator answers depend on more context
+        names = tuple(agent.name for agent in agents)
+        tenant = tenant_registry.get(ctx.session.state.get('tenant')).name
+        key = None
+        if self.cache is not None and decision['method'] != 'fallback' \
+                and not set(names).intersection(self.uncached_agents):
+            key = await asyncio.to_thread(self.cache.key, text)
+            cached = await self.cache.lookup(key, names, lambda name, args: self._run_tool(name, args, tenant),
+                                             tenant=tenant)
+            if cached is not None:
+                yield self._cached_event(ctx, cached)
+                return
+
+        failed = []
+        run = agents[0].run_async(ctx) if len(agents) == 1 else self._fan_out(ctx, agents, text, failed)
+        calls, responses, final = {}, [], None
+        async with aclosing(run) as events:
+            async for event in events:
+                if key is not None:
+                    # Remember what the answer was built from, to revalidate it later
+                    for call in event.get_function_calls():
+                        calls[call.id] = (call.name, dict(call.args or {}))
+                    for response in event.get_function_responses():
+                        responses.append((response.name, response.response))
+                    answer = self._answer_text(event)
+                    if answer:
+                        final = (event.author, answer)
+                yield event
+        if key is not None and final and not failed:
+            self.cache.put(key, names, list(calls.values()), responses, *final, tenant=tenant)
+
+    def _answer_text(self, event: Event) -> str:
+        """Text of a complete (non-partial) model reply from a sub-agent, else ''."""
+        if not event.content or not event.content.parts or event.partial or event.author == self.name:
+            return ""
+        return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+    def _function_tools(self) -> Dict[str, FunctionTool]:
+        """FunctionTools of every agent below the router, by name."""
+        if self._tools is None:
+            tools, pending = {}, list(self.sub_agents)
+            while pending:
+                agent = pending.pop()
+                pending.extend(agent.sub_agents)
+                for tool in getattr(agent, 'tools', []):
+                    if isinstance(tool, FunctionTool):
+                        tools[tool.name] = tool
+            self._tools = tools
+        return self._tools
+
+    async def _run_tool(self, name: str, args: Dict, tenant: str) -> Any:
+        """Repeat one tool call outside any agent, as ``tenant``, to revalidate a cached answer."""
+        func = self._function_tools()[name].func
+        with use_tenant(tenant):
+            result = await func(**args) if inspect.iscoroutinefunction(func) else await asyncio.to_thread(func, **args)
+        # ADK wraps non-dict tool results the same way before recording them
+        return result if isinstance(result, dict) else {'result': result}
+
+    def _cached_event(self, ctx: InvocationContext, cached: CachedResponse) -> Event:
+        author = self.find_sub_agent(cached.author)
+        output_key = getattr(author, 'output_key', None) if author else None
+        return Event(author=cached.author, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                     content=types.Content(role='model', parts=[types.Part(text=cached.text)]),
+                     actions=EventActions(state_delta={output_key: cached.text} if output_key else {}))
+
+    def _fan_out_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency cap shared by every fan-out on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore_loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _fan_out(self, ctx: InvocationContext, agents: List[BaseAgent], text: str,
+                       failed: List[str]) -> AsyncGenerator[Event, None]:
+        """Run ``agents`` concurrently, then merge their results; names of branches that fail go to ``failed``."""
+        keys = {agent.name: getattr(agent, 'output_key', None) or f"{agent.name}_result" for agent in agents}
+        # Clear last turn's results so a branch that fails is not merged with a stale answer
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                    actions=EventActions(state_delta=dict({key: "" for key in keys.values()}, fanout_request=text)))
+
+        semaphore = self._fan_out_semaphore()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run_branch(agent: BaseAgent) -> None:
+            note = None
+            branch = f"{self.name}.{agent.name}"
+            branch_ctx = ctx.model_copy(update={'branch': f"{ctx.branch}.{branch}" if ctx.branch else branch})
+            try:
+                async with semaphore:
+                    async with asyncio.timeout(self.branch_timeout):
+                        async with aclosing(agent.run_async(branch_ctx)) as events:
+                            async for event in events:
+                                # Wait until the event is appended to the session before the
+                                # branch continues; its next model call reads that history
+                                consumed = asyncio.Event()
+                                await queue.put((event, consumed))
+                                await consumed.wait()
+            except TimeoutError:
+                note = f"(no answer: {agent.name} timed out after {self.branch_timeout:.0f}s)"
+            except Exception as e:
+                print(f"Error in {agent.name}: {e}")
+                note = f"(no answer: {agent.name} failed: {e})"
+            finally:
+                await queue.put((agent, note))
+
+        tasks = [asyncio.create_task(run_branch(agent)) for agent in agents]
+        try:
+            finished = 0
+            while finished < len(tasks):
+                item, payload = await queue.get()
+                if isinstance(item, Event):
+                    yield item
+                    payload.set()
+                    continue
+                finished += 1
+                if payload:
+                    failed.append(item.name)
+                    yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                                actions=EventActions(state_delta={keys[item.name]: payload}))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        async for event in self.find_sub_agent(self.merger_name).run_async(ctx):
+            yield event
+
+
+intent_router_agent = IntentRouterAgent(
+    name="intent_router_agent",
+    description="Routes clear single-agent requests directly to that agent and the rest to the orchestrator.",
+    router=IntentRouter(threshold=INTENT_ROUTER_THRESHOLD, margin=INTENT_ROUTER_MARGIN, fan_out=INTENT_FANOUT),
+    cache=AgentResponseCache(AGENT_CACHE_TTL, AGENT_CACHE_MAXSIZE, AGENT_CACHE_SIMILARITY) if AGENT_CACHE else None,
+    max_concurrency=INTENT_FANOUT_CONCURRENCY,
+    branch_timeout=INTENT_FANOUT_TIMEOUT,
+    sub_agents=[
+        central_orchestrator_agent,
+        sprint_manager_agent,
+        epic_decomposer_agent,
+        kb_extractor_agent,
+        response_merger_agent
+        ],
+)
@@ -1,7 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 from utils.config import LLM_MODEL
-from services.jira_client import search_issues_tool, get_issue_details_tool
+from services.jira_client import search_issues_tool, get_issue_details_tool, get_issues_details_tool
+from services.kb_search import search_knowledge_base_tool
+from services.kb_index import semantic_search_issues_tool
+from services.tool_budget import read_tool_output_tool
 
 kb_extractor_agent = LlmAgent(
     name="kb_extractor_agent",
@@ -15,6 +18,12 @@ kb_extractor_agent = LlmAgent(
     - Parse Jira tickets, comments, and related docs.
     - Build embeddings or semantic indexes for efficient retrieval.
     - Return the **most relevant matches** for a given query, not just keyword matches.
+    - Use `search_knowledge_base` first: it matches paraphrases, exact error strings and ticket keys, and returns
+      the relevant excerpt, so only call `get_issue_details` when more than the snippet is needed.
+    - Use `semantic_search_issues` for a list of tickets similar to a described problem when no excerpt is
+      needed (e.g. "what tickets are similar to this bug?").
+    - Fall back to JQL search for exact field filters (status, assignee, dates). Large results come back
+      `summarized`; call `read_tool_output` with its handle to page through the matching issues.
 
     2. **Context Summarization**
     - When a query is asked, summarize the context into a **clear, concise answer**.
@@ -39,9 +48,15 @@ kb_extractor_agent = LlmAgent(
     """,
     model=LiteLlm(model=LLM_MODEL),
     tools=[
+        search_knowledge_base_tool,
+        semantic_search_issues_tool,
         search_issues_tool,
-        get_issue_details_tool
+        get_issue_details_tool,
+        get_issues_details_tool,
+        read_tool_output_tool
         ],
-    output_key="kb_extractor_agent_result"
+    output_key="kb_extractor_agent_result",
+    disallow_transfer_to_parent=True,
+    disallow_transfer_to_peers=True
 )
 
@@ -0,0 +1,36 @@
+from google.adk.agents import LlmAgent
+from google.adk.models.lite_llm import LiteLlm
+from utils.config import LLM_MODEL
+
+response_merger_agent = LlmAgent(
+    name="response_merger_agent",
+    description="Merges the answers of specialized agents that ran in parallel into one reply.",
+    instruction="""
+    Several SprintMind agents answered parts of the user's last request at the same time.
+    Combine their answers into ONE reply to that request.
+
+    ### Request
+    {fanout_request?}
+
+    ### Sprint Manager Agent
+    {sprint_manager_agent_result?}
+
+    ### Epic Decomposer Agent
+    {epic_decomposer_agent_result?}
+
+    ### Knowledge Base Extractor Agent
+    {kb_extractor_agent_result?}
+
+    ### Rules
+    - Use only the sections above that have content; skip empty ones without mentioning them.
+    - Keep every figure, ticket key and JSON/YAML block exactly as given; do not invent new facts.
+    - Link the parts where they relate (e.g. a blocker in the standup and a past ticket that solved it).
+    - If an agent timed out or failed, say which part could not be answered.
+    - Use short sections and bullet points suitable for Slack.
+    """,
+    model=LiteLlm(model=LLM_MODEL),
+    include_contents="none",
+    output_key="response_merger_agent_result",
+    disallow_transfer_to_parent=True,
+    disallow_transfer_to_peers=True
+)
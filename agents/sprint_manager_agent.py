@@ -1,7 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 from utils.config import LLM_MODEL
-from services.jira_client import get_active_sprint_tool, get_sprint_issues_tool, get_issue_details_tool
+from services.jira_client import get_active_sprint_tool, get_sprint_issues_tool, get_issue_details_tool, get_issues_details_tool
+from services.sprint_metrics import get_sprint_health_tool
+from services.standup_digest import get_standup_digest_tool
+from services.tool_budget import read_tool_output_tool
 
 sprint_manager_agent = LlmAgent(
     name="sprint_manager_agent",
@@ -12,6 +15,11 @@ sprint_manager_agent = LlmAgent(
     instruction="""
     ### Responsibilities:
     1. **Daily Standups**
+    - The team's Jira board id is `{board_id?}` (if empty, omit `board_id` and the team's default board is used).
+    - Call `get_standup_digest` for the board first: it is precomputed each morning. Update it with
+      `changed_since_digest` (issues changed after it was built) rather than refetching the sprint.
+    - Large issue lists come back `summarized` (counts by status and assignee, blocked and overdue issues
+      in full). Call `read_tool_output` with its handle only for issues beyond those.
     - Summarize tasks that are **Completed**, **In Progress**, and **Blocked**.
     - Highlight what each team member is working on.
     - Provide a concise "yesterday, today, blockers" view.
@@ -23,6 +31,8 @@ sprint_manager_agent = LlmAgent(
     - Raise warnings early with suggested actions.
 
     3. **Sprint Health**
+    - Call `get_sprint_health` for velocity, burndown, scope creep, workload and overdue numbers and report
+      its figures as-is; do not recompute them from raw issue lists.
     - Report on sprint velocity vs committed.
     - Show burn-down style insights (tasks done vs remaining).
     - Detect if sprint goals are at risk.
@@ -40,9 +50,15 @@ sprint_manager_agent = LlmAgent(
     model=LiteLlm(model=LLM_MODEL),
     # model=GEMINI_MODEL,
     tools=[
+        get_standup_digest_tool,
+        get_sprint_health_tool,
         get_issue_details_tool,
+        get_issues_details_tool,
         get_active_sprint_tool,
-        get_sprint_issues_tool
+        get_sprint_issues_tool,
+        read_tool_output_tool
         ],
-    output_key="sprint_manager_agent_result"
+    output_key="sprint_manager_agent_result",
+    disallow_transfer_to_parent=True,
+    disallow_transfer_to_peers=True
 )
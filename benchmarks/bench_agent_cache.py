@@ -0,0 +1,129 @@
+"""
+Agent response cache: many users asking near-identical questions about the
+same sprint, with a Jira change halfway through.
+
+A stub sprint manager stands in for the LLM agent: it "thinks" for
+``--llm-latency`` seconds, calls a real FunctionTool reading a fake sprint
+and answers from it. Requests run through IntentRouterAgent on ADK's
+InMemoryRunner with and without the cache. The report shows latency of
+cached vs uncached answers, agent runs saved, and that nobody gets the old
+answer after the sprint changes.
+
+    python -m benchmarks.bench_agent_cache --users 30 --llm-latency 2
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import time
+from typing import AsyncGenerator, List
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from google.adk.agents import BaseAgent  # noqa: E402
+from google.adk.events import Event, EventActions  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.adk.tools import FunctionTool  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from agents.intent_router_agent import IntentRouterAgent  # noqa: E402
+from benchmarks.bench_kb_search import HashingEmbedder  # noqa: E402
+from services.agent_cache import AgentResponseCache  # noqa: E402
+from services.intent_router import IntentRouter  # noqa: E402
+
+QUESTIONS = ["what's blocked?", "What's blocked", "whats blocked??", "hey, what's blocked?",
+             "standup please", "standup", "Standup!", "any blockers?"]
+
+SPRINT = {"id": "42", "blocked": ["PROJ-7"], "updated": "2026-10-17T09:00:00"}
+
+
+async def get_sprint_health(sprint_id: str) -> dict:
+    """Fake sprint read."""
+    await asyncio.sleep(0.005)
+    return dict(SPRINT, blocked=list(SPRINT["blocked"]))
+
+
+class StubSprintManager(BaseAgent):
+    tools: List[FunctionTool] = []
+    latency: float = 1.0
+    runs: int = 0
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        self.runs += 1
+        call = types.FunctionCall(id=f"call-{self.runs}", name="get_sprint_health", args={"sprint_id": "42"})
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                    content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+        health = await get_sprint_health("42")
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                    content=types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                        id=call.id, name=call.name, response=health))]))
+        await asyncio.sleep(self.latency)
+        text = f"Blocked: {', '.join(health['blocked'])}"
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                    content=types.Content(role="model", parts=[types.Part(text=text)]),
+                    actions=EventActions(state_delta={"sprint_manager_agent_result": text}))
+
+
+async def _ask(runner, user: str, text: str) -> tuple:
+    session = await runner.session_service.create_session(app_name="bench", user_id=user)
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    start = time.perf_counter()
+    answer = ""
+    async for event in runner.run_async(user_id=user, session_id=session.id, new_message=message):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            answer = event.content.parts[0].text
+    return time.perf_counter() - start, answer
+
+
+async def _run(args, cache) -> dict:
+    SPRINT["blocked"] = ["PROJ-7"]
+    agent = StubSprintManager(name="sprint_manager_agent", latency=args.llm_latency,
+                              tools=[FunctionTool(get_sprint_health)])
+    orchestrator = StubSprintManager(name="central_orchestrator_agent", latency=args.llm_latency)
+    root = IntentRouterAgent(name="intent_router_agent", router=IntentRouter(examples={}), cache=cache,
+                             sub_agents=[orchestrator, agent])
+    runner = InMemoryRunner(agent=root, app_name="bench")
+
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for wave in range(2):
+            if wave == 1:
+                # Someone moves a ticket: the next answer must reflect it
+                SPRINT["blocked"] = ["PROJ-7", "PROJ-9"]
+            for start in range(0, args.users, args.concurrency):
+                batch = range(start, min(start + args.concurrency, args.users))
+                results += [(wave,) + r for r in await asyncio.gather(
+                    *(_ask(runner, f"U{i}", QUESTIONS[i % len(QUESTIONS)]) for i in batch))]
+    stale = sum(1 for wave, _, answer in results if wave == 1 and "PROJ-9" not in answer)
+    return {"latencies": sorted(latency for _, latency, _ in results), "runs": agent.runs, "stale": stale,
+            "requests": len(results)}
+
+
+async def main_async(args) -> None:
+    embedder = None if args.model else HashingEmbedder()
+    for label, cache in (("no cache", None), ("cache", AgentResponseCache(600, 256, 0.92, embedder=embedder))):
+        result = await _run(args, cache)
+        latencies = result["latencies"]
+        print(f"{label:<9} {result['requests']} requests  agent runs {result['runs']:3d}  "
+              f"p50 {1000 * statistics.median(latencies):8.1f}ms  p90 {1000 * latencies[int(0.9 * (len(latencies) - 1))]:8.1f}ms  "
+              f"stale answers after the Jira change {result['stale']}")
+        if cache is not None:
+            print(f"          {cache.snapshot()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=30, help="questions per wave (two waves)")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="agent think time (s)")
+    parser.add_argument("--model", action="store_true", help="use the configured embedding model")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
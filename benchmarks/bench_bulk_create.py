@@ -0,0 +1,90 @@
+"""
+Materializing an approved epic breakdown: one create_issue call per item (as
+the epic decomposer did, one LLM tool round-trip each) vs the bulk pipeline.
+
+Runs against the in-process Jira stub. A second bulk run of the same draft
+shows idempotency; a run after a simulated crash halfway shows that only the
+missing issues are created.
+
+    python -m benchmarks.bench_bulk_create --stories 12 --subtasks 3 --latency 0.15
+"""
+import argparse
+import os
+import time
+
+import yaml
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services.bulk_create import BulkIssueCreator, load_draft  # noqa: E402
+from services.jira_client import JiraAPI  # noqa: E402
+
+
+def make_draft(stories: int, subtasks: int) -> str:
+    items = []
+    for i in range(1, stories + 1):
+        items.append({
+            "id": f"S{i}",
+            "type": "Story",
+            "summary": f"Story {i} of the export revamp",
+            "description": f"As a user I can do step {i} of the export.",
+            "acceptance_criteria": [f"Step {i} works for CSV", f"Step {i} works for XLSX"],
+            "suggested_estimate": "3 points",
+            "suggested_owner": "Backend",
+            "depends_on": [f"S{i - 1}"] if i > 1 else [],
+            "subtasks": [{"summary": f"Part {j} of story {i}"} for j in range(1, subtasks + 1)],
+        })
+    return yaml.safe_dump({"epic": "PROJ-1", "project": "PROJ", "items": items}, sort_keys=False)
+
+
+def _calls(jira: StubJira) -> int:
+    return sum(count for route, count in jira.calls.items() if route != "429")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stories", type=int, default=12)
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.15, help="Jira stub latency per request (s)")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="model time per tool round-trip (s)")
+    args = parser.parse_args()
+    draft = load_draft(make_draft(args.stories, args.subtasks))
+    total = args.stories * (1 + args.subtasks)
+
+    with StubJira(issue_count=1, latency=args.latency) as jira:
+        client = JiraAPI(jira.url, "user", "token")
+
+        start = time.perf_counter()
+        for item in draft["items"]:
+            client.create_issue("PROJ", item["summary"], item["description"], "Story")
+            for sub in item["subtasks"]:
+                client.create_issue("PROJ", sub["summary"], "", "Sub-task")
+        elapsed = time.perf_counter() - start
+        print(f"one call per issue     {total} issues  jira requests {_calls(jira):3d}  {elapsed:6.2f}s  "
+              f"+ {total} LLM tool round-trips (~{total * args.llm_latency:.0f}s); no parents, links or estimates")
+
+        creator = BulkIssueCreator(client)
+        for label, run_draft in (("bulk", draft), ("bulk, same draft again", draft)):
+            jira.calls.clear()
+            start = time.perf_counter()
+            report = creator.run(run_draft)
+            elapsed = time.perf_counter() - start
+            links = sum(1 for link in report["links"] if link["status"] == "created")
+            print(f"{label:<22} {report['counts']}  jira requests {_calls(jira):3d} "
+                  f"({report['bulk_requests']} bulk)  links created {links}  {elapsed:6.2f}s  + 1 LLM tool round-trip")
+
+    with StubJira(issue_count=1, latency=args.latency) as jira:
+        creator = BulkIssueCreator(JiraAPI(jira.url, "user", "token"))
+        # A run that died after the first half of the stories
+        creator.run(dict(draft, items=draft["items"][:args.stories // 2]))
+        jira.calls.clear()
+        report = creator.run(draft)
+        print(f"{'retry after a crash':<22} {report['counts']}  jira requests {_calls(jira):3d}  "
+              f"issues in Jira {len(jira.issues) - 1} (expected {total})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+End-to-end benchmark, fully offline: the real agent tree (``root_agent``,
+intent router, agent cache, tools, Jira client) answering standup, epic
+decomposition and knowledge base requests, both in-process through ADK's
+runner and through ``services/slack_bot.py`` talking to a local ADK API
+server.
+
+Jira is the in-process stub seeded with ``--boards`` x ``--sprints`` sprints
+and ``--issues`` issues; the LLM is ``benchmarks.stub_llm.ScriptedLiteLLM``
+(fixed think time per call plus per-token time, provider-like token usage);
+Slack is ``benchmarks.stub_slack.StubSlack``; a hashing embedder stands in
+for the embedding model (routing, agent cache, knowledge base). The usual
+settings (JIRA_MIRROR_PATH, AGENT_CACHE, INTENT_ROUTER, SLACK_STREAMING, ...)
+are read from the environment, so each optimization can be toggled.
+
+Reports p50/p95 latency per request, throughput, Jira and LLM calls and
+tokens per request, and process RSS. ``--json`` saves the results and
+``--compare`` prints the change against a saved run.
+
+    python -m benchmarks.bench_e2e --requests 20 --concurrency 4 --issues 500 --sprints 3
+    python -m benchmarks.bench_e2e --json before.json
+    python -m benchmarks.bench_e2e --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+# Resolve LiteLLM's model list locally instead of fetching it at import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from benchmarks.fixtures import PEOPLE, WORDS  # noqa: E402
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from benchmarks.stub_llm import ScriptedLiteLLM, install  # noqa: E402
+from benchmarks.stub_slack import StubSlack  # noqa: E402
+
+SCENARIOS = ("standup", "epic", "kb")
+
+
+def conversation(scenario: str, rng: random.Random, issues: int) -> List[str]:
+    """The user turns of one conversation; distinct per call unless the rng repeats itself."""
+    key = f"PROJ-{rng.randint(1, issues)}"
+    if scenario == "standup":
+        return [f"standup for board 1 please, mostly the {' '.join(rng.sample(WORDS, 3))} work: "
+                f"what is {rng.choice(PEOPLE)} on, and is {key} blocked?"]
+    if scenario == "epic":
+        return [f"break down epic {key} into stories", f"approve the breakdown of epic {key}"]
+    return [f"has the {' '.join(rng.sample(WORDS, 3))} problem happened before? similar to {key}"]
+
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def measure(run: Callable[[List[List[str]]], List[float]], conversations: List[List[str]], jira: StubJira,
+            llm: ScriptedLiteLLM) -> Dict:
+    """Run the conversations and summarize per-request latency and per-request costs."""
+    jira_before, llm_before, tokens_before = sum(jira.calls.values()), sum(llm.calls.values()), sum(llm.tokens.values())
+    start = time.perf_counter()
+    latencies = run(conversations)
+    elapsed = time.perf_counter() - start
+    n = len(latencies)
+    return {
+        "requests": n,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * _percentile(latencies, 0.95),
+        "throughput_rps": n / elapsed,
+        "jira_calls_per_request": (sum(jira.calls.values()) - jira_before) / n,
+        "llm_calls_per_request": (sum(llm.calls.values()) - llm_before) / n,
+        "tokens_per_request": (sum(llm.tokens.values()) - tokens_before) / n,
+        "rss_mib": rss_mib(),
+    }
+
+
+def agent_runner(root_agent, concurrency: int) -> Callable[[List[List[str]]], List[float]]:
+    """Conversations straight through ADK's runner, ``concurrency`` at a time."""
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(agent=root_agent, app_name="agents")
+
+    async def converse(turns: List[str], gate: asyncio.Semaphore, latencies: List[float]) -> None:
+        async with gate:
+            session = await runner.session_service.create_session(app_name="agents", user_id="bench")
+            for text in turns:
+                start = time.perf_counter()
+                message = types.Content(role="user", parts=[types.Part(text=text)])
+                async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+                    pass
+                latencies.append(time.perf_counter() - start)
+
+    async def run_all(conversations: List[List[str]]) -> List[float]:
+        gate, latencies = asyncio.Semaphore(concurrency), []
+        await asyncio.gather(*(converse(turns, gate, latencies) for turns in conversations))
+        return latencies
+
+    return lambda conversations: asyncio.run(run_all(conversations))
+
+
+def slack_runner(slack_bot, concurrency: int) -> Callable[[List[List[str]]], List[float]]:
+    """Conversations as Slack DMs handled by the bot, ``concurrency`` at a time; a request ends when the reply is final."""
+    counter = iter(range(10 ** 9))
+
+    def converse(turns: List[str]) -> List[float]:
+        n = next(counter)
+        latencies = []
+        for text in turns:
+            start = time.perf_counter()
+            slack_bot.handle_event({"user": f"U{n:05d}", "channel": f"D{n:05d}", "text": text})
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    def run_all(conversations: List[List[str]]) -> List[float]:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return [latency for latencies in pool.map(converse, conversations) for latency in latencies]
+
+    return run_all
+
+
+def start_adk_server(agents_dir: str):
+    """The ADK API server (as ``adk api_server`` runs it) on a free local port."""
+    import uvicorn
+    from google.adk.cli.fast_api import get_fast_api_app
+
+    app = get_fast_api_app(agents_dir=agents_dir, web=False)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+def report(results: Dict, baseline: Dict) -> None:
+    columns = ("p50_ms", "p95_ms", "throughput_rps", "jira_calls_per_request", "llm_calls_per_request",
+               "tokens_per_request", "rss_mib")
+    print(f"{'':<16}{'reqs':>5}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>7}{'jira/req':>9}{'llm/req':>8}"
+          f"{'tok/req':>9}{'rss MiB':>8}")
+    for name, row in results.items():
+        print(f"{name:<16}{row['requests']:>5}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}{row['throughput_rps']:>7.2f}"
+              f"{row['jira_calls_per_request']:>9.1f}{row['llm_calls_per_request']:>8.1f}"
+              f"{row['tokens_per_request']:>9.0f}{row['rss_mib']:>8.0f}")
+        if name in baseline:
+            changes = [f"{column} {100 * (row[column] / baseline[name][column] - 1):+.0f}%"
+                       for column in columns if baseline[name].get(column)]
+            print(f"{'  vs baseline':<16}" + "  ".join(changes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated: standup, epic, kb")
+    parser.add_argument("--paths", default="agent,slack", help="comma-separated: agent (runner), slack (bot)")
+    parser.add_argument("--requests", type=int, default=20, help="conversations per scenario and path")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat-rate", type=float, default=0.0, help="fraction of conversations asked before")
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--boards", type=int, default=1)
+    parser.add_argument("--sprints", type=int, default=3, help="sprints per board (last one active)")
+    parser.add_argument("--jira-latency", type=float, default=0.05, help="Jira stub latency per request (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="stub LLM time to first token (s)")
+    parser.add_argument("--token-time", type=float, default=0.005, help="stub LLM time per output token (s)")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+    logging.disable(logging.WARNING)
+    baseline = json.load(open(args.compare)) if args.compare else {}
+
+    workdir = tempfile.TemporaryDirectory()
+    jira = StubJira(issue_count=args.issues, latency=args.jira_latency, boards=args.boards, sprints=args.sprints).start()
+    slack = StubSlack().start()
+    # Configuration is read at import time, so the stubs are wired in before anything from services/agents loads
+    os.environ.update(JIRA_URL=jira.url, JIRA_USER="bench", JIRA_API_TOKEN="bench",
+                      KB_INDEX_PATH=os.path.join(workdir.name, "kb_index"),
+                      STANDUP_DIGEST_PATH=os.path.join(workdir.name, "standup_digests.sqlite3"),
+                      SLACK_API_URL=slack.url, SLACK_BOT_TOKEN="xoxb-bench", SLACK_SESSION_DB="")
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        from benchmarks.bench_kb_search import HashingEmbedder
+        from services.embeddings import set_embedder
+
+        set_embedder(HashingEmbedder())
+        from agents import root_agent
+        from services.kb_search import get_knowledge_base
+
+        llm = ScriptedLiteLLM(latency=args.llm_latency, token_time=args.token_time)
+        install(root_agent, llm)
+        get_knowledge_base().index_issues(jira.issues)
+    print(f"stub Jira: {args.boards} board(s) x {args.sprints} sprint(s), {args.issues} issues; "
+          f"{args.jira_latency * 1000:.0f}ms per request; stub LLM {args.llm_latency:.2f}s + "
+          f"{args.token_time * 1000:.1f}ms/token; concurrency {args.concurrency}")
+
+    runners = {}
+    paths = args.paths.split(",")
+    if "agent" in paths:
+        runners["agent"] = agent_runner(root_agent, args.concurrency)
+    if "slack" in paths:
+        server, os.environ["ADK_BASE_URL"] = start_adk_server(os.path.dirname(os.path.dirname(__file__)) or ".")
+        with quiet:
+            from services import slack_bot
+        runners["slack"] = slack_runner(slack_bot, args.concurrency)
+
+    rng = random.Random(0)
+    results = {}
+    for path, run in runners.items():
+        for scenario in args.scenarios.split(","):
+            asked = []
+            conversations = []
+            for _ in range(args.requests):
+                if asked and rng.random() < args.repeat_rate:
+                    conversations.append(rng.choice(asked))
+                else:
+                    conversations.append(conversation(scenario, rng, args.issues))
+                    asked.append(conversations[-1])
+            with quiet:
+                # One unmeasured conversation pays for first-use setup (digest build, index load, connections)
+                run([conversation(scenario, rng, args.issues)])
+                results[f"{path}/{scenario}"] = measure(run, conversations, jira, llm)
+
+    report(results, baseline)
+    cache = getattr(root_agent, "cache", None)
+    if cache is not None:
+        print(f"agent cache: {cache.snapshot()}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if "slack" in runners:
+        server.should_exit = True
+    jira.stop()
+    slack.stop()
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compound requests: running the specialist agents one after another (what the
+orchestrator did) vs the intent router's parallel fan-out.
+
+Stub agents stand in for the LLM agents; each sleeps for its think time and
+writes its ``output_key`` result, and a stub merger combines them. Runs
+through ADK's InMemoryRunner, so branching, state and event handling are the
+real thing. A last run makes one agent hang to show the branch timeout.
+
+    python -m benchmarks.bench_fanout --latency 3 --branches 3 --concurrency 3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from typing import AsyncGenerator
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from google.adk.agents import BaseAgent  # noqa: E402
+from google.adk.events import Event, EventActions  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from agents.intent_router_agent import IntentRouterAgent  # noqa: E402
+from services.intent_router import IntentRouter  # noqa: E402
+
+SPECIALISTS = ["sprint_manager_agent", "kb_extractor_agent", "epic_decomposer_agent"]
+REQUEST = "standup, similar past tickets for the blockers and break down epic PROJ-7"
+
+
+class StubAgent(BaseAgent):
+    latency: float = 1.0
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.latency)
+        text = f"{self.name} answer"
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, branch=ctx.branch,
+                    content=types.Content(role="model", parts=[types.Part(text=text)]),
+                    actions=EventActions(state_delta={f"{self.name}_result": text}))
+
+
+class StubMerger(BaseAgent):
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        parts = [f"{name}: {ctx.session.state.get(f'{name}_result') or '-'}" for name in SPECIALISTS]
+        yield Event(author=self.name, invocation_id=ctx.invocation_id,
+                    content=types.Content(role="model", parts=[types.Part(text="; ".join(parts))]))
+
+
+class SequentialRun(BaseAgent):
+    """The old plan: one specialist after another, then merge."""
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        for agent in self.sub_agents:
+            async for event in agent.run_async(ctx):
+                yield event
+
+
+def _agents(latency: float, branches: int, slow: float = 0.0):
+    specialists = [StubAgent(name=name, latency=slow if slow and i == 0 else latency)
+                   for i, name in enumerate(SPECIALISTS[:branches])]
+    return specialists, StubMerger(name="response_merger_agent")
+
+
+async def _timed(root: BaseAgent) -> tuple:
+    runner = InMemoryRunner(agent=root, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text=REQUEST)])
+    start = time.perf_counter()
+    answer = ""
+    # The router logs each routing decision
+    with contextlib.redirect_stdout(io.StringIO()):
+        async for event in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            if event.author == "response_merger_agent":
+                answer = event.content.parts[0].text
+    return time.perf_counter() - start, answer
+
+
+async def main_async(args) -> None:
+    specialists, merger = _agents(args.latency, args.branches)
+    sequential, _ = await _timed(SequentialRun(name="sequential", sub_agents=specialists + [merger]))
+    print(f"sequential            {sequential:6.2f}s")
+
+    for concurrency in sorted({1, args.concurrency}):
+        specialists, merger = _agents(args.latency, args.branches)
+        router = IntentRouterAgent(name="intent_router_agent", router=IntentRouter(examples={}),
+                                   max_concurrency=concurrency, branch_timeout=args.timeout,
+                                   sub_agents=specialists + [merger])
+        elapsed, answer = await _timed(router)
+        print(f"fan-out, cap {concurrency}        {elapsed:6.2f}s  ({sequential / elapsed:.1f}x)")
+
+    specialists, merger = _agents(args.latency, args.branches, slow=args.timeout * 10)
+    router = IntentRouterAgent(name="intent_router_agent", router=IntentRouter(examples={}),
+                               max_concurrency=args.concurrency, branch_timeout=args.timeout,
+                               sub_agents=specialists + [merger])
+    elapsed, answer = await _timed(router)
+    print(f"fan-out, one hangs    {elapsed:6.2f}s  (timeout {args.timeout}s) -> {answer}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=3.0, help="think time per specialist (s)")
+    parser.add_argument("--branches", type=int, default=3, choices=[2, 3])
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-branch timeout (s)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Intent pre-router: routing latency, how many requests skip the orchestrator
+LLM, and how often a direct route picks the wrong agent.
+
+Runs held-out labelled requests (not the router's own examples) through
+IntentRouter. Each direct route saves the orchestrator's two model calls
+(choosing the AgentTool and restating its answer) and each fan-out at least
+one; ``--llm-latency`` turns that into model time saved.
+
+    python -m benchmarks.bench_intent_router --repeat 50
+    python -m benchmarks.bench_intent_router --model    # real embedding model instead of hashing
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.bench_kb_search import HashingEmbedder
+from services.intent_router import IntentRouter, ORCHESTRATOR
+
+SPRINT, EPIC, KB = "sprint_manager_agent", "epic_decomposer_agent", "kb_extractor_agent"
+
+LABELLED = [
+    ("standup", SPRINT),
+    ("can you post the daily stand-up for team falcon", SPRINT),
+    ("what's the sprint status", SPRINT),
+    ("show me the burndown", SPRINT),
+    ("is anyone overloaded? check the workload", SPRINT),
+    ("which tickets are overdue", SPRINT),
+    ("any blockers today?", SPRINT),
+    ("how are we doing on velocity vs commitment", SPRINT),
+    ("how is the sprint going so far", SPRINT),
+    ("what did people finish yesterday", SPRINT),
+    ("are we going to make the sprint goal", SPRINT),
+    ("who has the most tickets this sprint", SPRINT),
+    ("break down epic PROJ-120", EPIC),
+    ("please split the billing epic into stories", EPIC),
+    ("decompose this epic: customer self-service portal", EPIC),
+    ("write user stories for the epic PROJ-88", EPIC),
+    ("epic breakdown for the mobile onboarding revamp", EPIC),
+    ("turn the analytics epic into small stories with estimates", EPIC),
+    ("draft subtasks and acceptance criteria for the export epic", EPIC),
+    ("plan the work for the notifications epic", EPIC),
+    ("have we seen error ECONNRESET in the gateway", KB),
+    ("have we ever hit a deadlock on the orders table", KB),
+    ("getting a NullPointerException in InvoiceService, any ideas", KB),
+    ("how did we fix the SSO redirect loop last time", KB),
+    ("are there similar tickets about slow search", KB),
+    ("TimeoutError when calling the pricing API", KB),
+    ("find old tickets about the flaky e2e tests", KB),
+    ("what was the workaround for the certificate expiry outage", KB),
+    ("is there a known fix for the memory leak in the worker", KB),
+    ("did anyone solve the cache invalidation bug before", KB),
+    ("hi", ORCHESTRATOR),
+    ("what can you help me with", ORCHESTRATOR),
+    ("give me the standup and break down epic PROJ-7", (SPRINT, EPIC)),
+    ("write release notes for version 2.4", ORCHESTRATOR),
+    ("summarize blockers and check if we saw similar tickets before", (SPRINT, KB)),
+    ("standup plus any past incidents about the API gateway", (SPRINT, KB)),
+    ("break down epic PROJ-9 based on similar past tickets", ORCHESTRATOR),
+    ("thank you!", ORCHESTRATOR),
+    ("prepare the retro agenda", ORCHESTRATOR),
+    ("compare this sprint to the last two and plan the next one", ORCHESTRATOR),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the labelled set for timing")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="seconds per orchestrator model call")
+    parser.add_argument("--model", action="store_true", help="use the configured embedding model")
+    args = parser.parse_args()
+
+    router = IntentRouter(embedder=None if args.model else HashingEmbedder())
+    router.route("warm up")
+
+    timings = {"rule": [], "embedding": [], "fanout": [], "fallback": []}
+    decisions = []
+    for _ in range(args.repeat):
+        for text, expected in LABELLED:
+            start = time.perf_counter()
+            agents, _, method = router.classify(text)
+            timings[method].append(time.perf_counter() - start)
+            decisions.append((agents[0] if len(agents) == 1 else tuple(agents), method, expected))
+
+    direct = [(agent, expected) for agent, method, expected in decisions if method in ("rule", "embedding")]
+    fanned = [(agents, expected) for agents, method, expected in decisions if method == "fanout"]
+    single = [expected for _, _, expected in decisions if isinstance(expected, str) and expected != ORCHESTRATOR]
+    compound = [expected for _, _, expected in decisions if isinstance(expected, tuple)]
+    wrong = sum(1 for agent, expected in direct + fanned if agent != expected)
+    per_pass = len(LABELLED)
+    saved_calls = (2 * len(direct) + len(fanned)) / args.repeat
+
+    for method, values in timings.items():
+        if values:
+            values.sort()
+            print(f"{method:<9}  {len(values) // args.repeat:3d}/{per_pass} requests  "
+                  f"p50 {1000 * statistics.median(values):7.3f}ms  p99 {1000 * values[int(0.99 * (len(values) - 1))]:7.3f}ms")
+    print(f"routed directly: {len(direct) // args.repeat}/{len(single) // args.repeat} single-agent requests, "
+          f"compound requests fanned out: {len(fanned) // args.repeat}/{len(compound) // args.repeat}, "
+          f"misroutes {wrong // args.repeat}")
+    print(f"orchestrator LLM calls: {2 * per_pass} -> {2 * per_pass - saved_calls:.0f} per pass "
+          f"({saved_calls:.0f} saved, ~{saved_calls * args.llm_latency:.1f}s of model time at {args.llm_latency}s/call)")
+
+
+if __name__ == "__main__":
+    main()
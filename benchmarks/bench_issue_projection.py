@@ -0,0 +1,82 @@
+"""
+Payload size of the sprint tools: raw Jira JSON vs compact IssueRecords.
+
+Runs on a recorded sprint fixture (a JSON file holding a Jira sprint-issues
+response, i.e. ``{"issues": [...]}``) or on a synthetic sprint when none is
+given. Record one from your own site with::
+
+    python -m benchmarks.bench_issue_projection --record SPRINT_ID sprint.json
+    python -m benchmarks.bench_issue_projection --fixture sprint.json
+"""
+import argparse
+import json
+import time
+
+from benchmarks.fixtures import make_issues
+from services.jira_models import IssueRecord, ISSUE_FIELDS
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # not installed, or the BPE file cannot be downloaded
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """cl100k token count, or the usual ~4 characters/token estimate."""
+    if _encoding is None:
+        return len(text) // 4
+    return len(_encoding.encode(text))
+
+
+def _measure(label: str, payload) -> int:
+    text = json.dumps(payload)
+    tokens = count_tokens(text)
+    print(f"{label:<10} {len(text.encode()):>12,} bytes {tokens:>10,} tokens")
+    return tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixture", help="recorded Jira sprint-issues JSON")
+    parser.add_argument("--issues", type=int, default=120, help="synthetic sprint size")
+    parser.add_argument("--record", nargs=2, metavar=("SPRINT_ID", "PATH"),
+                        help="record a sprint from the configured Jira site and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        from services.jira_client import jira_client
+        sprint_id, path = args.record
+        with open(path, "w") as f:
+            json.dump({"issues": list(jira_client.iter_sprint_issues(sprint_id))}, f)
+        print(f"Recorded sprint {sprint_id} to {path}")
+        return
+
+    if args.fixture:
+        with open(args.fixture) as f:
+            issues = json.load(f)["issues"]
+    else:
+        issues = make_issues(args.issues)
+
+    print(f"{len(issues)} issues, projected fields: {', '.join(ISSUE_FIELDS)}")
+    raw_tokens = _measure("raw", {"issues": issues})
+
+    # What Jira sends back when the tool asks for fields=ISSUE_FIELDS
+    projected = [
+        {"id": issue.get("id"), "key": issue["key"],
+         "fields": {f: issue["fields"].get(f) for f in ISSUE_FIELDS if f in issue["fields"]}}
+        for issue in issues
+    ]
+    _measure("projected", {"issues": projected})
+
+    start = time.perf_counter()
+    compact = [IssueRecord.from_jira(issue).to_dict() for issue in projected]
+    elapsed = time.perf_counter() - start
+    compact_tokens = _measure("compact", {"issues": compact})
+
+    print(f"token reduction: {raw_tokens / max(compact_tokens, 1):.1f}x, "
+          f"projection time {1000 * elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
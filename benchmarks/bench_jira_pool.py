@@ -0,0 +1,48 @@
+"""
+Connection-pool benchmark for JiraAPI against the local stub Jira server.
+
+Compares the pooled session against a fresh connection per call (the old
+module-level ``requests.get`` behaviour) and prints the client counters.
+
+    python -m benchmarks.bench_jira_pool --calls 500 --threads 8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stub_jira import StubJira
+from services.jira_client import JiraAPI
+
+
+def _run(fetch, calls: int, threads: int) -> float:
+    keys = [f"PROJ-{i % 50 + 1}" for i in range(calls)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(fetch, keys))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server latency (s)")
+    args = parser.parse_args()
+
+    with StubJira(issue_count=50, latency=args.latency) as jira:
+        pooled = JiraAPI(jira.url, "user", "token", pool_maxsize=args.threads)
+        elapsed = _run(pooled.get_issue_details, args.calls, args.threads)
+        print(f"pooled:   {args.calls / elapsed:8.1f} req/s  {pooled.get_request_stats()}")
+
+        def unpooled(key):
+            return requests.get(f"{jira.url}/rest/api/3/issue/{key}", auth=pooled.auth,
+                                headers=pooled.headers, timeout=pooled.timeout).json()
+
+        elapsed = _run(unpooled, args.calls, args.threads)
+        print(f"per-call: {args.calls / elapsed:8.1f} req/s  (new connection per request)")
+
+
+if __name__ == "__main__":
+    main()
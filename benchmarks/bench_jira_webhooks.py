@@ -0,0 +1,171 @@
+"""
+Jira webhooks vs polling: how fast a change reaches local state, what it
+costs in Jira requests, and how many recorded webhook events per second the
+ingestion pipeline (mirror, response cache, knowledge base) absorbs.
+
+Runs against the in-process Jira stub; a hashing embedder stands in for the
+embedding model, so the knowledge base numbers exclude model inference.
+The recorded payloads are written to a JSON-lines file and replayed with
+``services.jira_webhooks.replay``, as ``python -m services.jira_webhooks
+replay`` does with a file recorded by the receiver (JIRA_WEBHOOK_RECORD).
+
+    python -m benchmarks.bench_jira_webhooks --issues 500 --events 5000 --latency 0.02
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from benchmarks.bench_kb_search import HashingEmbedder  # noqa: E402
+from benchmarks.fixtures import PEOPLE, STATUSES, _user, make_issues, make_sprint  # noqa: E402
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services.jira_cache import build_cache  # noqa: E402
+from services.jira_client import JiraAPI  # noqa: E402
+from services.jira_mirror import JiraMirror  # noqa: E402
+from services.jira_webhooks import JiraEventIngestor, load_payloads, replay  # noqa: E402
+from services.kb_index import SemanticIndex  # noqa: E402
+from services.kb_search import BM25Index, KnowledgeBase  # noqa: E402
+
+
+def _jira_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def status_event(issue: dict, status: tuple, ts: float, history_id: int) -> dict:
+    """A jira:issue_updated payload moving ``issue`` to ``status``."""
+    issue = copy.deepcopy(issue)
+    fields = issue["fields"]
+    old = fields["status"]["name"]
+    fields["status"] = dict(fields["status"], name=status[0], statusCategory={"key": status[1], "name": status[0]})
+    fields["updated"] = _jira_time(ts)
+    return {
+        "timestamp": int(ts * 1000),
+        "webhookEvent": "jira:issue_updated",
+        "issue_event_type_name": "issue_generic",
+        "user": _user(PEOPLE[history_id % len(PEOPLE)]),
+        "issue": issue,
+        "changelog": {"id": str(history_id), "items": [
+            {"field": "status", "fieldtype": "jira", "fromString": old, "toString": status[0]}]},
+    }
+
+
+def make_events(issues: list, count: int, seed: int = 0) -> list:
+    """Recorded traffic: status changes, comments, new issues, sprint edits and redeliveries."""
+    rng = random.Random(seed)
+    by_key = {issue["key"]: issue for issue in issues}
+    events = []
+    start = time.time() - count
+    for n in range(count):
+        ts = start + n
+        key = rng.choice(list(by_key))
+        roll = rng.random()
+        if roll < 0.55:
+            event = status_event(by_key[key], rng.choice(STATUSES), ts, 500000 + n)
+            by_key[key] = event["issue"]
+        elif roll < 0.8:
+            event = {"timestamp": int(ts * 1000), "webhookEvent": "comment_created",
+                     "issue": {"id": by_key[key]["id"], "key": key, "fields": {"summary": by_key[key]["fields"]["summary"]}},
+                     "comment": {"id": str(900000 + n), "author": _user(rng.choice(PEOPLE)),
+                                 "body": f"Update {n}: still looking at the webhook retry path",
+                                 "created": _jira_time(ts), "updated": _jira_time(ts)}}
+        elif roll < 0.85:
+            issue = copy.deepcopy(issues[0])
+            issue["key"], issue["id"] = f"PROJ-{len(by_key) + 1}", str(20000 + n)
+            issue["fields"].update(summary=f"New issue {n}", created=_jira_time(ts), updated=_jira_time(ts))
+            by_key[issue["key"]] = issue
+            event = {"timestamp": int(ts * 1000), "webhookEvent": "jira:issue_created", "issue": issue}
+        elif roll < 0.9:
+            event = {"timestamp": int(ts * 1000), "webhookEvent": "sprint_updated",
+                     "sprint": dict(make_sprint(1), goal=f"Goal revision {n}")}
+        else:
+            # Jira redelivers, and does not keep order: an older update arriving late
+            earlier = [e for e in events if e["webhookEvent"] == "jira:issue_updated"]
+            event = rng.choice(earlier) if earlier else status_event(by_key[key], STATUSES[0], ts, 500000 + n)
+        events.append(event)
+    return events
+
+
+def seeded_mirror(path: str, issues: list) -> JiraMirror:
+    mirror = JiraMirror(None, path, "project = PROJ", ["1"])
+    for issue in issues:
+        mirror.upsert_issue(issue, commit=False)
+    mirror.upsert_sprint(make_sprint(1))
+    mirror.commit()
+    return mirror
+
+
+def freshness(args, workdir: str) -> None:
+    with StubJira(issue_count=args.issues, latency=args.latency) as jira:
+        client = JiraAPI(jira.url, "user", "token", cache=build_cache("memory", "", 1024))
+        mirror = JiraMirror(client, os.path.join(workdir, "polled.sqlite3"), "project = PROJ", ["1"])
+        mirror.full_sync()
+
+        jira.calls.clear()
+        start = time.perf_counter()
+        for _ in range(10):
+            mirror.incremental_sync()
+        idle = time.perf_counter() - start
+        requests_per_sync = sum(jira.calls.values()) / 10
+        per_hour = requests_per_sync * 3600 / args.poll_interval
+        print(f"{'polling':<10} every {args.poll_interval:.0f}s: a change shows up after up to {args.poll_interval:.0f}s; "
+              f"{requests_per_sync:.0f} Jira requests and {1000 * idle / 10:.0f}ms per sync even when nothing changed "
+              f"({per_hour:.0f} requests/hour)")
+
+        jira.touch("PROJ-1", status={"name": "Done", "statusCategory": {"key": "done", "name": "Done"}})
+        jira.calls.clear()
+        ingestor = JiraEventIngestor(mirror, client)
+        event = status_event(jira.by_key["PROJ-1"], ("Done", "done"), time.time(), 1)
+        start = time.perf_counter()
+        ingestor.apply([event])
+        applied = time.perf_counter() - start
+        status = mirror.get_issue("PROJ-1")["fields"]["status"]["name"]
+        print(f"{'webhook':<10} change applied {1000 * applied:.1f}ms after delivery, "
+              f"{sum(jira.calls.values())} Jira requests; mirror says PROJ-1 is {status}")
+
+
+def throughput(args, workdir: str) -> None:
+    issues = make_issues(args.issues)
+    recording = os.path.join(workdir, "webhooks.jsonl")
+    with open(recording, "w") as f:
+        for event in make_events(issues, args.events):
+            f.write(json.dumps(event) + "\n")
+    client = JiraAPI("http://127.0.0.1:9", "user", "token", cache=build_cache("memory", "", 1024))
+
+    for label, batch_size, with_kb in (("batch 1", 1, False), (f"batch {args.batch_size}", args.batch_size, False),
+                                       (f"batch {args.batch_size} + KB", args.batch_size, True)):
+        run_dir = tempfile.mkdtemp(dir=workdir)
+        mirror = seeded_mirror(os.path.join(run_dir, "mirror.sqlite3"), issues)
+        kb = None
+        if with_kb:
+            kb_dir = os.path.join(run_dir, "kb")
+            kb = KnowledgeBase(SemanticIndex(kb_dir, ann="off", embedder=HashingEmbedder()), BM25Index(kb_dir),
+                               rerank_model="")
+            kb.index_issues(mirror.iter_issues())
+        result = replay(JiraEventIngestor(mirror, client, kb), load_payloads(recording), batch_size)
+        print(f"replay {label:<16} {result['events_per_second']:8.1f} events/s  applied {result.get('applied', 0)}  "
+              f"stale skipped {result.get('stale', 0)}  {result['seconds']:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--events", type=int, default=5000, help="recorded webhook events to replay")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="Jira stub latency per request (s)")
+    parser.add_argument("--poll-interval", type=float, default=60, help="mirror sync interval being replaced (s)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        freshness(args, workdir)
+        throughput(args, workdir)
+
+
+if __name__ == "__main__":
+    main()
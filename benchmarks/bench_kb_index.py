@@ -0,0 +1,71 @@
+"""
+Knowledge base index benchmark: exact (memory-mapped scan) vs HNSW search.
+
+Uses synthetic clustered unit vectors in place of model embeddings so the
+numbers isolate index cost from embedding cost. Reports build time, query
+latency (p50/p95) and recall@k of the HNSW graph against the exact scan.
+
+    python -m benchmarks.bench_kb_index --rows 100000 --dim 384
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from services.kb_index import SemanticIndex
+
+
+def _vectors(rows: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, rows)] + 0.6 * rng.standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _timed_queries(index: SemanticIndex, queries: np.ndarray, k: int, exact: bool):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append({row for row, _ in index.search_vector(query, k, exact=exact)})
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ann", default="auto", choices=["auto", "on", "off"])
+    parser.add_argument("--ef", type=int, default=200, help="HNSW ef_search")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    vectors = _vectors(args.rows, args.dim, clusters=200, rng=rng)
+    queries = _vectors(args.queries, args.dim, clusters=200, rng=rng)
+
+    with tempfile.TemporaryDirectory() as path:
+        index = SemanticIndex(path, ann=args.ann, ef_search=args.ef)
+        start = time.perf_counter()
+        for first in range(0, args.rows, 10_000):
+            chunk = vectors[first:first + 10_000]
+            index.add([(f"PROJ-{row}", "issue") for row in range(first, first + len(chunk))], chunk)
+        index.save()
+        print(f"build: {args.rows} rows x {args.dim} in {time.perf_counter() - start:.1f}s")
+
+        exact_ms, exact = _timed_queries(index, queries, args.k, exact=True)
+        print(f"exact scan: p50 {statistics.median(exact_ms):6.2f}ms  p95 {exact_ms[int(0.95 * len(exact_ms))]:6.2f}ms")
+        if index._ann is None:
+            print("hnswlib not installed / disabled: exact search only")
+            return
+        ann_ms, approx = _timed_queries(index, queries, args.k, exact=False)
+        recall = sum(len(a & e) for a, e in zip(approx, exact)) / (args.k * len(exact))
+        print(f"hnsw:       p50 {statistics.median(ann_ms):6.2f}ms  p95 {ann_ms[int(0.95 * len(ann_ms))]:6.2f}ms  "
+              f"recall@{args.k} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Hybrid knowledge base search benchmark: BM25 alone and BM25 + vector fusion.
+
+Builds a synthetic corpus (Zipf-distributed vocabulary, one description and
+0-3 comments per ticket, occasional error codes) and times queries end to
+end, snippets included. A hashing embedder stands in for the model so the
+numbers exclude model inference; add ~5-15 ms per query for MiniLM on CPU.
+
+    python -m benchmarks.bench_kb_search --tickets 100000
+"""
+import argparse
+import hashlib
+import itertools
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from services.kb_index import SemanticIndex
+from services.kb_search import BM25Index, KnowledgeBase
+
+VOCAB = [f"w{i}" for i in range(20_000)]
+ERRORS = [f"ERR_{code}" for code in ("CONN_RESET", "TIMEOUT", "AUTH_EXPIRED", "QUOTA", "DEADLOCK")]
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words hashing into a dense vector."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            digest = int(hashlib.blake2b(token.encode(), digest_size=8).hexdigest(), 16)
+            vector[digest % self.dim] += 1 if digest & 1 else -1
+        return vector
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    picks = rng.choices(VOCAB, cum_weights=_CUM_WEIGHTS, k=words)
+    if rng.random() < 0.05:
+        picks.insert(rng.randrange(len(picks)), rng.choice(ERRORS))
+    return " ".join(picks)
+
+
+_CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCAB))))
+
+
+def make_corpus(tickets: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(1, tickets + 1):
+        yield {
+            "key": f"PROJ-{i}",
+            "fields": {
+                "summary": _text(rng, 8),
+                "description": _text(rng, 60),
+                "comment": {"comments": [{"id": str(i * 10 + c), "body": _text(rng, 30)}
+                                         for c in range(rng.randint(0, 3))]},
+            },
+        }
+
+
+def _time(fn, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.95 * len(latencies))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.choices(VOCAB[:2000], k=rng.randint(2, 6))) for _ in range(args.queries)]
+    queries += [f"{rng.choice(ERRORS)} when syncing" for _ in range(args.queries // 4)]
+    queries += [f"PROJ-{rng.randint(1, args.tickets)}" for _ in range(args.queries // 4)]
+
+    with tempfile.TemporaryDirectory() as path:
+        kb = KnowledgeBase(SemanticIndex(path, embedder=HashingEmbedder()), BM25Index(path), rerank_model="")
+        start = time.perf_counter()
+        kb.index_issues(make_corpus(args.tickets), batch_size=1024)
+        print(f"build: {args.tickets} tickets, {len(kb.bm25)} passages in {time.perf_counter() - start:.1f}s")
+
+        p50, p95 = _time(lambda q: kb.bm25.search(q), queries)
+        print(f"bm25 only:         p50 {p50:6.2f}ms  p95 {p95:6.2f}ms")
+        p50, p95 = _time(lambda q: kb.search(q, 10), queries)
+        print(f"hybrid + snippets: p50 {p50:6.2f}ms  p95 {p95:6.2f}ms")
+
+        hit = sum(1 for q in queries if q.startswith("PROJ-") and kb.search(q, 1)[0]["key"] == q)
+        print(f"ticket-key queries answered first: {hit}/{args.queries // 4}")
+
+
+if __name__ == "__main__":
+    main()
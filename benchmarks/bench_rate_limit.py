@@ -0,0 +1,53 @@
+"""
+Rate-limit/retry benchmark: JiraAPI against a stub Jira that injects 429s.
+
+Without a scheduler every throttled call surfaces as an error result; with
+the shared RequestScheduler the calls are paced and retried per Retry-After.
+
+    python -m benchmarks.bench_rate_limit --throttle-rate 0.2 --rate 50
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_jira import StubJira
+from services.jira_client import JiraAPI
+from services.rate_limit import RequestScheduler, RetryPolicy
+
+
+def _run(client: JiraAPI, calls: int, threads: int):
+    keys = [f"PROJ-{i % 50 + 1}" for i in range(calls)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(client.get_issue_summary, keys))
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if not result or 'error' in result)
+    return elapsed, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--throttle-rate", type=float, default=0.2, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", default="0.05", help="Retry-After sent by the stub (s)")
+    parser.add_argument("--rate", type=float, default=200, help="client rate limit (req/s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with StubJira(issue_count=50, throttle_rate=args.throttle_rate, retry_after=args.retry_after) as jira:
+        plain = JiraAPI(jira.url, "user", "token")
+        elapsed, failed = _run(plain, args.calls, args.threads)
+        print(f"no scheduler: {elapsed:6.2f}s  failed {failed}/{args.calls}")
+
+        scheduler = RequestScheduler(rate=args.rate, burst=args.concurrency, max_concurrency=args.concurrency,
+                                     policy=RetryPolicy(max_retries=6, base_delay=0.05, max_delay=2))
+        paced = JiraAPI(jira.url, "user", "token", scheduler=scheduler)
+        elapsed, failed = _run(paced, args.calls, args.threads)
+        print(f"scheduler:    {elapsed:6.2f}s  failed {failed}/{args.calls}")
+        print(f"throttle stats: {paced.get_throttle_stats()}")
+        print(f"stub 429s sent: {jira.calls['429']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Slack event load test: replays bursts of message events (plus Slack-style
+retries of some of them) against the bot, wired to a stub ADK server and a
+stub Slack API.
+
+Reports ack latency against Slack's 3-second deadline, how long until every
+reply was posted, and whether any event produced a duplicate agent run or
+reply.
+
+    python -m benchmarks.bench_slack_events --events 200 --agent-latency 2 --retry-rate 0.3
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.stub_slack import StubADK, StubSlack
+
+
+def _event(i: int) -> dict:
+    return {
+        "type": "event_callback",
+        "event_id": f"Ev{i:06d}",
+        "event": {"type": "message", "user": f"U{i % 25:04d}", "channel": f"D{i % 25:04d}", "text": f"status of PROJ-{i}?"},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=50, help="events sent concurrently")
+    parser.add_argument("--agent-latency", type=float, default=2.0, help="stub /run time (s)")
+    parser.add_argument("--retry-rate", type=float, default=0.3, help="fraction of events Slack redelivers")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--queue-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubSlack() as slack, StubADK(latency=args.agent_latency) as adk:
+        os.environ.update(SLACK_API_URL=slack.url, ADK_BASE_URL=adk.url, SLACK_BOT_TOKEN="xoxb-test",
+                          SLACK_WORKERS=str(args.workers), SLACK_QUEUE_SIZE=str(args.queue_size))
+        # The bot logs every message; keep the report readable
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        from services import slack_bot
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        server = make_server("127.0.0.1", 0, slack_bot.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/slack/events"
+
+        rng = random.Random(0)
+        deliveries = [(_event(i), None) for i in range(args.events)]
+        deliveries += [(_event(i), "1") for i in range(args.events) if rng.random() < args.retry_rate]
+        rng.shuffle(deliveries)
+
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.burst))
+
+        def deliver(item):
+            body, retry = item
+            headers = {"X-Slack-Retry-Num": retry, "X-Slack-Retry-Reason": "http_timeout"} if retry else {}
+            start = time.perf_counter()
+            status = session.post(url, json=body, headers=headers, timeout=10).status_code
+            return time.perf_counter() - start, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.burst) as pool:
+            acks = list(pool.map(deliver, deliveries))
+        sent = time.perf_counter() - start
+
+        slack_bot.event_queue.join()
+        done = time.perf_counter() - start
+        server.shutdown()
+        quiet.__exit__(None, None, None)
+
+    latencies = sorted(latency for latency, _ in acks)
+    replies = [message["text"] for message in slack.messages]
+    print(f"deliveries: {len(deliveries)} ({len(deliveries) - args.events} retries), "
+          f"statuses {dict(sorted((s, sum(1 for _, x in acks if x == s)) for s in {x for _, x in acks}))}")
+    print(f"ack latency: p50 {statistics.median(latencies) * 1000:.1f}ms  "
+          f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:.1f}ms  max {latencies[-1] * 1000:.1f}ms  "
+          f"over 3s: {sum(1 for latency in latencies if latency > 3)}")
+    print(f"all {len(deliveries)} deliveries answered in {sent:.2f}s; {len(replies)} replies posted after {done:.2f}s"
+          f" (503s are left for Slack to redeliver)")
+    print(f"agent runs: {adk.calls['run'] + adk.calls['run_sse']}  duplicate replies: {len(replies) - len(set(replies))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Slack bridge HTTP clients: startup time, connection reuse and behaviour
+under Slack rate limits.
+
+- startup: importing ``services.slack_bot`` with Slack unreachable (the
+  bot user id used to be fetched at import time)
+- pooling: chat.update throughput through ``SlackAPI`` vs a fresh
+  ``requests.post`` per call, and the TCP connections each opened
+- rate limits: a burst of replies to one channel against a stub that allows
+  one chat.postMessage per second per channel; bare posts lose the
+  throttled ones, the send queue delivers all of them
+
+    python -m benchmarks.bench_slack_http --calls 400 --burst 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stub_slack import StubSlack
+from services.slack_api import SlackAPI
+
+
+def _timed(fn, items, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(fn, items))
+    return time.perf_counter() - start
+
+
+def bench_startup() -> None:
+    # A blackholed address: connecting would hang until the OS gives up
+    os.environ.update(SLACK_API_URL="http://10.255.255.1", ADK_BASE_URL="http://10.255.255.1",
+                      SLACK_BOT_TOKEN="xoxb-test")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from services import slack_bot  # noqa: F401
+    print(f"startup:     import slack_bot with Slack unreachable {1000 * (time.perf_counter() - start):7.1f} ms")
+
+
+def bench_pooling(calls: int, threads: int) -> None:
+    with StubSlack() as slack:
+        client = SlackAPI(slack.url, "xoxb-test", pool_maxsize=threads, rates={"chat.update": 1e6}, burst=1e6)
+        payloads = [{"channel": "C1", "ts": "1.000100", "text": f"update {i}"} for i in range(calls)]
+        client.call("chat.postMessage", {"channel": "C1", "text": "hello"})
+
+        slack.connections.clear()
+        elapsed = _timed(lambda p: client.call("chat.update", p), payloads, threads)
+        print(f"pooling:     SlackAPI   {calls / elapsed:8.1f} calls/s  connections {len(slack.connections)}")
+
+        slack.connections.clear()
+        headers = {"Authorization": "Bearer xoxb-test"}
+        elapsed = _timed(lambda p: requests.post(f"{slack.url}/chat.update", headers=headers, json=p),
+                         payloads, threads)
+        print(f"pooling:     per-call   {calls / elapsed:8.1f} calls/s  connections {len(slack.connections)}")
+
+
+def bench_rate_limits(burst: int) -> None:
+    payloads = [{"channel": "C1", "text": f"reply {i}"} for i in range(burst)]
+    with StubSlack(limits={"chat.postMessage": 1.0}) as slack:
+        start = time.perf_counter()
+        responses = []
+        _timed(lambda p: responses.append(requests.post(f"{slack.url}/chat.postMessage", json=p)), payloads, burst)
+        delivered = sum(r.status_code == 200 for r in responses)
+        print(f"rate limits: bare posts {delivered:3d}/{burst} delivered  429s {slack.calls['429']:3d}  "
+              f"{time.perf_counter() - start:5.2f}s")
+
+    with StubSlack(limits={"chat.postMessage": 1.0}) as slack:
+        client = SlackAPI(slack.url, "xoxb-test")
+        start = time.perf_counter()
+        responses = []
+        _timed(lambda p: responses.append(client.call("chat.postMessage", p)), payloads, burst)
+        delivered = sum(r.status_code == 200 for r in responses)
+        print(f"rate limits: send queue {delivered:3d}/{burst} delivered  429s {slack.calls['429']:3d}  "
+              f"{time.perf_counter() - start:5.2f}s  {client.get_throttle_stats()['chat.postMessage:C1']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=400, help="chat.update calls for the pooling run")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--burst", type=int, default=8, help="replies posted to one channel at once")
+    args = parser.parse_args()
+
+    bench_startup()
+    bench_pooling(args.calls, args.threads)
+    bench_rate_limits(args.burst)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Jira calls per Slack conversation: a fresh ADK session per message (the old
+behaviour, reproduced with a zero session TTL) vs one session per
+(user, channel, thread) from the SessionRegistry.
+
+Conversations are several follow-up messages in one thread. The stub ADK
+server models the orchestrator's Jira usage: a session that has not loaded
+the active sprint yet fetches it, and issues already looked up in the
+session are not fetched again.
+
+    python -m benchmarks.bench_slack_sessions --conversations 20 --turns 6
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+
+from benchmarks.stub_jira import StubJira
+from benchmarks.stub_slack import StubADK, StubSlack
+from services.slack_sessions import SessionRegistry
+
+
+def _run(slack_bot, jira, adk, conversations: int, turns: int, ttl: float):
+    slack_bot.session_registry = SessionRegistry(ttl)
+    jira.calls.clear()
+    adk.calls.clear()
+    rng = random.Random(0)
+    for c in range(conversations):
+        thread_ts = f"{1700000000 + c}.000100"
+        keys = [f"PROJ-{rng.randint(1, 200)}" for _ in range(3)]
+        for t in range(turns):
+            event = {"user": f"U{c % 5:04d}", "channel": "C0001", "thread_ts": thread_ts,
+                     "text": f"what is blocking {rng.choice(keys)}?"}
+            slack_bot.handle_event(event)
+    jira_calls = sum(jira.calls.values())
+    return jira_calls / conversations, adk.calls["create_session"] / conversations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--sprint-issues", type=int, default=250)
+    args = parser.parse_args()
+
+    with StubJira(issue_count=args.sprint_issues) as jira, StubSlack() as slack, \
+            StubADK(latency=0, jira_url=jira.url) as adk:
+        os.environ.update(SLACK_API_URL=slack.url, ADK_BASE_URL=adk.url, SLACK_BOT_TOKEN="xoxb-test")
+        with contextlib.redirect_stdout(io.StringIO()):
+            from services import slack_bot
+            fresh = _run(slack_bot, jira, adk, args.conversations, args.turns, ttl=0)
+            reused = _run(slack_bot, jira, adk, args.conversations, args.turns, ttl=3600)
+
+    print(f"{args.conversations} conversations x {args.turns} messages")
+    print(f"session per message:      {fresh[0]:6.1f} Jira calls, {fresh[1]:4.1f} sessions created per conversation")
+    print(f"session per conversation: {reused[0]:6.1f} Jira calls, {reused[1]:4.1f} sessions created per conversation")
+    print(f"Jira calls saved: {100 * (1 - reused[0] / fresh[0]):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
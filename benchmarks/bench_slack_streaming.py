@@ -0,0 +1,63 @@
+"""
+Slack reply latency: waiting for /run vs streaming /run_sse into a
+placeholder message with throttled chat.update.
+
+Reports, per message, when the user first sees something, when the first
+words of the answer appear and when the full answer is there, plus the
+chat.update rate (Slack allows roughly one update per second per message).
+
+    python -m benchmarks.bench_slack_streaming --agent-latency 20 --messages 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_slack import StubADK, StubSlack
+
+
+def _run(slack_bot, slack, messages: int, streaming: bool):
+    slack_bot.SLACK_STREAMING = streaming
+    slack.messages.clear()
+    events = [{"user": f"U{i:04d}", "channel": "C0002" if streaming else "C0001", "text": f"sprint summary please ({i})"}
+              for i in range(messages)]
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=messages) as pool:
+        list(pool.map(slack_bot.handle_event, events))
+
+    first_seen, first_words, complete, rates = [], [], [], []
+    for message in slack.messages:
+        updates = [(message["posted_at"], message.get("text") if not message["updates"] else "")] + message["updates"]
+        first_seen.append(message["posted_at"] - start)
+        first_words.append(next(at for at, text in updates if text and "Echo" in text) - start)
+        complete.append(updates[-1][0] - start)
+        times = [at for at, _ in message["updates"]]
+        rates.append(max((sum(1 for t in times if at <= t < at + 1) for at in times), default=0))
+    return first_seen, first_words, complete, rates, sum(len(m["updates"]) for m in slack.messages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agent-latency", type=float, default=20.0, help="total agent run time (s)")
+    parser.add_argument("--messages", type=int, default=5, help="concurrent conversations")
+    parser.add_argument("--chunks", type=int, default=200, help="streamed text chunks per reply")
+    args = parser.parse_args()
+
+    with StubSlack() as slack, StubADK(latency=args.agent_latency, chunks=args.chunks) as adk:
+        os.environ.update(SLACK_API_URL=slack.url, ADK_BASE_URL=adk.url, SLACK_BOT_TOKEN="xoxb-test")
+        with contextlib.redirect_stdout(io.StringIO()):
+            from services import slack_bot
+            results = {mode: _run(slack_bot, slack, args.messages, mode == "streaming")
+                       for mode in ("blocking", "streaming")}
+
+    for mode, (first_seen, first_words, complete, rates, updates) in results.items():
+        print(f"{mode:<9}  first visible {statistics.median(first_seen):5.2f}s  "
+              f"first words {statistics.median(first_words):5.2f}s  complete {statistics.median(complete):5.2f}s  "
+              f"chat.update calls {updates:4d}  max updates/s per message {max(rates)}")
+
+
+if __name__ == "__main__":
+    main()
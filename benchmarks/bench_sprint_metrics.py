@@ -0,0 +1,65 @@
+"""
+Sprint health benchmark: time to compute the get_sprint_health summary for a
+large synthetic sprint (issues already fetched), and the summary's size.
+
+About a fifth of the issues get a changelog that adds them to the sprint
+mid-way, and some are re-estimated, so scope-creep paths are exercised.
+
+    python -m benchmarks.bench_sprint_metrics --issues 2000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from benchmarks.fixtures import make_issues, make_sprint
+from services.sprint_metrics import SprintColumns, parse_time, sprint_health
+from utils.config import JIRA_SPRINT_FIELD, JIRA_STORY_POINTS_FIELD
+
+
+def _with_changelogs(issues, sprint, seed: int = 0):
+    rng = random.Random(seed)
+    start = parse_time(sprint["startDate"])
+    for issue in issues:
+        histories = []
+        if rng.random() < 0.2:
+            at = time.strftime("%Y-%m-%dT%H:%M:%S.000+0000", time.gmtime(start + rng.uniform(1, 10) * 86400))
+            histories.append({"id": f"{issue['id']}1", "created": at, "items": [
+                {"field": "Sprint", "fieldId": JIRA_SPRINT_FIELD, "from": "", "to": str(sprint["id"])}]})
+        if rng.random() < 0.1:
+            at = time.strftime("%Y-%m-%dT%H:%M:%S.000+0000", time.gmtime(start + rng.uniform(1, 10) * 86400))
+            histories.append({"id": f"{issue['id']}2", "created": at, "items": [
+                {"field": "Story Points", "fieldId": JIRA_STORY_POINTS_FIELD, "fromString": "3", "toString": "5"}]})
+        issue["changelog"] = {"histories": histories}
+    return issues
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sprint = make_sprint(1)
+    issues = _with_changelogs(make_issues(args.issues), sprint)
+    now = parse_time(sprint["startDate"]) + 9 * 86400
+
+    build, compute = [], []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        columns = SprintColumns(sprint, issues)
+        build.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        summary = sprint_health(columns, now=now)
+        compute.append((time.perf_counter() - start) * 1000)
+
+    raw = len(json.dumps({"issues": issues}))
+    compact = len(json.dumps(summary))
+    print(f"{args.issues} issues: columns {statistics.median(build):.1f}ms  metrics {statistics.median(compute):.2f}ms")
+    print(f"payload: raw issues {raw:,} bytes -> summary {compact:,} bytes")
+    print(json.dumps({k: summary[k] for k in ("progress", "scope_change", "overdue", "risk_flags")}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Standup herd: everyone asks for the standup at once. Building it on demand
+per request (the sprint manager's old tool calls) vs serving the digest
+precomputed off-peak plus the issues changed since.
+
+Runs against the in-process Jira stub with the real clients and response
+cache. Reports Jira requests, latency per request and the size of the tool
+output the LLM has to read.
+
+    python -m benchmarks.bench_standup_digest --users 40 --issues 300 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+os.environ.setdefault("STANDUP_DIGEST_PATH", ":memory:")
+
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services.jira_async import AsyncJiraAPI  # noqa: E402
+from services.jira_cache import build_cache  # noqa: E402
+from services.jira_client import JiraAPI  # noqa: E402
+from services.sprint_metrics import load_sprint, sprint_health  # noqa: E402
+from services.standup_digest import DigestScheduler, DigestStore, digest_changes  # noqa: E402
+
+
+def _report(label: str, latencies, requests: int, payload: int) -> None:
+    latencies = sorted(latencies)
+    print(f"{label:<22} jira requests {requests:4d}  p50 {1000 * statistics.median(latencies):7.1f}ms  "
+          f"max {1000 * latencies[-1]:7.1f}ms  tool output {payload / 1024:6.1f} KiB/request")
+
+
+def on_demand(client: JiraAPI, sprint_id: str) -> tuple:
+    """What each standup request did before: health metrics plus the sprint's issue list."""
+    start = time.perf_counter()
+    health = sprint_health(load_sprint(client, sprint_id))
+    issues = client.list_sprint_issues(sprint_id)
+    return time.perf_counter() - start, len(json.dumps(health)) + len(json.dumps(issues))
+
+
+async def from_digest(scheduler: DigestScheduler, async_client: AsyncJiraAPI) -> tuple:
+    """What get_standup_digest does: the stored digest plus one search for changes."""
+    start = time.perf_counter()
+    digest = await asyncio.to_thread(scheduler.get, "1", 43200)
+    changes = await digest_changes(async_client, digest)
+    return time.perf_counter() - start, len(json.dumps(digest)) + len(json.dumps(changes)), changes
+
+
+async def main_async(args) -> None:
+    with StubJira(issue_count=args.issues, latency=args.latency) as jira:
+        client = JiraAPI(jira.url, "user", "token", cache=build_cache("memory", "", 1024))
+        with ThreadPoolExecutor(args.users) as pool:
+            results = list(pool.map(lambda _: on_demand(client, "1"), range(args.users)))
+        _report("on demand", [r[0] for r in results], sum(jira.calls.values()), statistics.mean(r[1] for r in results))
+
+        for cold in (True, False):
+            jira.calls.clear()
+            client = JiraAPI(jira.url, "user", "token", cache=build_cache("memory", "", 1024))
+            async_client = AsyncJiraAPI(jira.url, "user", "token", cache=client.cache)
+            scheduler = DigestScheduler(client, DigestStore(":memory:"), {"1": ""})
+            if not cold:
+                start = time.perf_counter()
+                scheduler.run_once()
+                built = time.perf_counter() - start
+                print(f"{'  off-peak build':<22} jira requests {sum(jira.calls.values()):4d}  took {1000 * built:7.1f}ms")
+                jira.calls.clear()
+                # Work done between the scheduled run and standup
+                jira.touch("PROJ-1", status={"name": "Done", "statusCategory": {"key": "done", "name": "Done"}})
+                jira.touch("PROJ-2", status={"name": "Blocked", "statusCategory": {"key": "indeterminate"}})
+            results = await asyncio.gather(*(from_digest(scheduler, async_client) for _ in range(args.users)))
+            label = "digest, not built yet" if cold else "precomputed digest"
+            _report(label, [r[0] for r in results], sum(jira.calls.values()), statistics.mean(r[1] for r in results))
+            if not cold:
+                print(f"{'  changes since build':<22} {[(c['key'], c['status']) for c in results[0][2]]}")
+            await async_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=40, help="concurrent standup requests")
+    parser.add_argument("--issues", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="Jira stub latency per request (s)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cold start: what each entry point costs before it can serve anything.
+Every target runs in a fresh interpreter and reports the time its imports
+(and first use, for the agent tree) take, the process's peak RSS and which
+heavy packages ended up loaded. Each target is also imported with JIRA_URL
+unset, the way a container starts when a secret is not mounted yet.
+
+Nothing is contacted: Jira points at a closed local port and the LLM cost
+map is read locally.
+
+    python -m benchmarks.bench_startup --repeat 5
+    python -m benchmarks.bench_startup --json before.json
+    python -m benchmarks.bench_startup --compare before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "import agents": "import agents",
+    "agents.root_agent": "from agents import root_agent",
+    "slack bot": "import services.slack_bot",
+    "webhook receiver": "import services.jira_webhooks",
+    "standup digest": "import services.standup_digest",
+    "bulk create": "import services.bulk_create",
+}
+
+HEAVY = ("google.adk", "google.genai", "litellm", "langchain_huggingface", "sentence_transformers")
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+try:
+    exec({statement!r})
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                   "loaded": [name for name in {heavy!r} if name in sys.modules], "error": error}}))
+"""
+
+
+def run_child(statement: str, env: Dict[str, str]) -> Dict:
+    """Run ``statement`` in a fresh interpreter and return its measurements."""
+    proc = subprocess.run([sys.executable, "-c", CHILD.format(statement=statement, heavy=HEAVY)], cwd=ROOT,
+                          env=env, capture_output=True, text=True)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode or not lines:
+        return {"seconds": 0.0, "rss_mib": 0.0, "loaded": [], "error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+    return json.loads(lines[-1])
+
+
+def measure(statement: str, repeat: int) -> Dict:
+    env = dict(os.environ, JIRA_URL="http://127.0.0.1:9", JIRA_USER="bench", JIRA_API_TOKEN="bench",
+               LITELLM_LOCAL_MODEL_COST_MAP="True", PYTHONWARNINGS="ignore")
+    runs = [run_child(statement, env) for _ in range(repeat)]
+    unset = run_child(statement, {name: value for name, value in env.items() if name != "JIRA_URL"})
+    return {"seconds": statistics.median(run["seconds"] for run in runs),
+            "rss_mib": statistics.median(run["rss_mib"] for run in runs),
+            "loaded": runs[0]["loaded"], "error": runs[0]["error"],
+            "without_jira_url": unset["error"] or "ok"}
+
+
+def _delta(value: float, before: Optional[float]) -> str:
+    if not before:
+        return ""
+    return f" ({100 * (value - before) / before:+.0f}%)"
+
+
+def report(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> None:
+    for name, row in results.items():
+        before = baseline.get(name, {})
+        heavy = ", ".join(row["loaded"]) or "-"
+        print(f"{name:<19}{1000 * row['seconds']:7.0f}ms{_delta(row['seconds'], before.get('seconds')):<7}"
+              f"{row['rss_mib']:7.0f} MiB{_delta(row['rss_mib'], before.get('rss_mib')):<7}  loads {heavy}")
+        if row["error"]:
+            print(f"{'':<19}error: {row['error']}")
+        if row["without_jira_url"] != "ok":
+            print(f"{'':<19}without JIRA_URL: {row['without_jira_url']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated subset of the targets")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per target (median is reported)")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+    baseline = json.load(open(args.compare)) if args.compare else {}
+
+    results = {name: measure(TARGETS[name], args.repeat) for name in args.targets.split(",")}
+    report(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
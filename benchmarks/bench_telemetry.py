@@ -0,0 +1,133 @@
+"""
+Telemetry: what it costs on the hot path, and what it tells you.
+
+1. Overhead: sequential Jira reads against the in-process stub with
+   telemetry off (the default) and on, per request.
+2. Breakdown: a stub LLM agent (fixed think time and token usage) calls a
+   real FunctionTool that reads Jira through JiraAPI; the recorded spans
+   split the answer time into LLM, tool and Jira time, and the /metrics
+   endpoint shows the same as Prometheus series.
+
+    python -m benchmarks.bench_telemetry --requests 2000 --llm-latency 0.3 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import urllib.request
+import warnings
+from typing import AsyncGenerator
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from google.adk.agents import LlmAgent  # noqa: E402
+from google.adk.models.base_llm import BaseLlm  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.adk.tools import FunctionTool  # noqa: E402
+from google.genai import types  # noqa: E402
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services import telemetry  # noqa: E402
+from services.jira_client import JiraAPI  # noqa: E402
+
+
+class StubLlm(BaseLlm):
+    """Calls the first tool once, then answers; reports fixed token usage."""
+    model: str = "stub-llm"
+    latency: float = 0.3
+
+    async def generate_content_async(self, llm_request, stream=False) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        prompt = sum(len(part.text or "") for content in llm_request.contents for part in content.parts) // 4
+        usage = types.GenerateContentResponseUsageMetadata(prompt_token_count=900 + prompt, candidates_token_count=60,
+                                                           total_token_count=960 + prompt)
+        if llm_request.contents[-1].parts[0].function_response is None:
+            call = types.FunctionCall(name="get_issue_summary", args={"issue_key": "PROJ-7"})
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]),
+                              usage_metadata=usage)
+        else:
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="PROJ-7 is in progress.")]),
+                              usage_metadata=usage)
+
+
+def reads(client: JiraAPI, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        client.get_issue_details(f"PROJ-{i % 50 + 1}")
+    return (time.perf_counter() - start) / count
+
+
+async def ask(runner: InMemoryRunner, text: str) -> None:
+    session = await runner.session_service.create_session(app_name="bench", user_id="U1")
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    async for _ in runner.run_async(user_id="U1", session_id=session.id, new_message=message):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000, help="Jira reads per overhead run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Jira stub latency in the breakdown run (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stub LLM time per call (s)")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    with StubJira(issue_count=50) as jira:
+        client = JiraAPI(jira.url, "user", "token")
+        reads(client, 200)
+        off = statistics.median(reads(client, args.requests) for _ in range(3))
+        telemetry.setup_telemetry("bench", enabled=True, exporter="none")
+        spans = InMemorySpanExporter()
+        trace.get_tracer_provider().add_span_processor(SimpleSpanProcessor(spans))
+        on = statistics.median(reads(client, args.requests) for _ in range(3))
+        start = time.perf_counter()
+        for _ in range(100000):
+            with telemetry._NOOP_SPAN:
+                pass
+        noop = (time.perf_counter() - start) / 100000
+        print(f"jira read, telemetry off  {1e6 * off:7.1f}us/request  (disabled span: {1e9 * noop:.0f}ns)")
+        print(f"jira read, telemetry on   {1e6 * on:7.1f}us/request  (+{1e6 * (on - off):.1f}us for span, "
+              f"span metrics and in-memory export)")
+
+    spans.clear()
+    telemetry.metrics.reset()
+    with StubJira(issue_count=50, latency=args.latency) as jira:
+        client = JiraAPI(jira.url, "user", "token")
+        agent = LlmAgent(name="sprint_manager_agent", model=StubLlm(latency=args.llm_latency),
+                         instruction="Answer questions about Jira issues.",
+                         tools=[FunctionTool(client.get_issue_summary)])
+        runner = InMemoryRunner(agent=agent, app_name="bench")
+        start = time.perf_counter()
+        asyncio.run(ask(runner, "what's the status of PROJ-7?"))
+        total = time.perf_counter() - start
+
+    def seconds(predicate) -> float:
+        return sum((s.end_time - s.start_time) / 1e9 for s in spans.get_finished_spans() if predicate(s))
+
+    finished = spans.get_finished_spans()
+    llm = seconds(lambda s: s.attributes.get("gen_ai.operation.name") == "generate_content")
+    tool = seconds(lambda s: s.attributes.get("gen_ai.operation.name") == "execute_tool")
+    jira_time = seconds(lambda s: s.name.startswith("jira "))
+    tokens = sum(s.attributes.get("gen_ai.usage.input_tokens", 0) + s.attributes.get("gen_ai.usage.output_tokens", 0)
+                 for s in finished if s.attributes.get("gen_ai.operation.name") == "generate_content")
+    print(f"answer {1000 * total:.0f}ms: LLM {1000 * llm:.0f}ms, tool {1000 * tool:.0f}ms (Jira {1000 * jira_time:.0f}ms), "
+          f"other {1000 * (total - llm - tool):.0f}ms; {tokens} tokens; {len(finished)} spans")
+
+    server = telemetry.start_metrics_server(19464, host="127.0.0.1")
+    body = urllib.request.urlopen("http://127.0.0.1:19464/metrics").read().decode()
+    server.shutdown()
+    for line in body.splitlines():
+        if line.startswith(("sprintmind_llm_tokens_total", "sprintmind_tool_duration_seconds_sum",
+                            "sprintmind_jira_request_duration_seconds_count", "sprintmind_agent_duration_seconds_sum")):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Many teams on two Jira sites from one process: the tenant registry (one
+connection pool, response cache and request budget per site; a per-team
+budget under it) against one set of clients per team, which is what one
+process per team amounts to.
+
+Part 1: every team fetches its board's active sprint and sprint issues,
+twice, all teams at once. Reports TCP connections opened, Jira requests and
+the request rate the sites would have to absorb (one process per team
+brings a whole site budget of its own).
+
+Part 2: one team floods its site with ``--flood`` uncached issue reads while
+the other teams on it make ``--requests`` each, ``--interval`` apart.
+Reports the quiet teams' latency with per-team budgets (``--share``) and
+with one site-wide budget only (share 1.0).
+
+    python -m benchmarks.bench_tenants --teams 40 --site-rate 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services.jira_async import AsyncJiraAPI  # noqa: E402
+from services.jira_cache import LRUCache  # noqa: E402
+from services.rate_limit import RequestScheduler  # noqa: E402
+from services.tenants import Tenant, TenantRegistry  # noqa: E402
+
+
+def make_tenants(sites: List[StubJira], teams: int, boards: int) -> List[Tenant]:
+    """Teams spread over the sites, each on its own board and Jira account."""
+    return [Tenant(f"team{n}", sites[n % len(sites)].url, f"team{n}@example.com", "token",
+                   board_id=str(n // len(sites) % boards + 1)) for n in range(teams)]
+
+
+async def standup_reads(client: AsyncJiraAPI, board_id: str) -> None:
+    sprint = await client.get_active_sprint(board_id)
+    await client.list_sprint_issues(str(sprint["id"]))
+
+
+async def run_reads(clients: Dict[str, AsyncJiraAPI], tenants: List[Tenant], rounds: int) -> None:
+    for _ in range(rounds):
+        await asyncio.gather(*(standup_reads(clients[t.name], t.board_id) for t in tenants))
+
+
+def part1(sites: List[StubJira], tenants: List[Tenant], args) -> None:
+    print(f"{len(tenants)} teams on {len(sites)} sites, {args.boards} boards per site; "
+          f"site budget {args.site_rate:g} req/s, {args.site_concurrency} in flight")
+    print(f"{'':<13}{'connections':>12}{'requests':>10}{'budget req/s':>14}")
+
+    def separate():
+        # What a process per team has: its own pool, cache and full site budget
+        return {t.name: AsyncJiraAPI(t.jira_url, t.email, t.api_token, cache=LRUCache(),
+                                     scheduler=RequestScheduler(args.site_rate, args.site_rate,
+                                                                args.site_concurrency))
+                for t in tenants}, len(tenants) * args.site_rate
+
+    def shared():
+        registry = registry_for(tenants, args, args.share)
+        return {t.name: registry.clients(t).async_jira for t in tenants}, len(sites) * args.site_rate
+
+    for name, build in (("per team", separate), ("registry", shared)):
+        clients, budget = build()
+        connections, requests = [s.connections for s in sites], [sum(s.calls.values()) for s in sites]
+        asyncio.run(run_reads(clients, tenants, args.rounds))
+        opened = sum(s.connections - c for s, c in zip(sites, connections))
+        sent = sum(sum(s.calls.values()) - r for s, r in zip(sites, requests))
+        print(f"{name:<13}{opened:>12}{sent:>10}{budget:>14.0f}")
+
+
+def registry_for(tenants: List[Tenant], args, share: float) -> TenantRegistry:
+    registry = TenantRegistry(tenants, Tenant("default", "", "", ""), share=share,
+                              sites={t.site: {"rate": args.site_rate, "burst": args.site_rate,
+                                              "max_concurrency": args.site_concurrency} for t in tenants})
+    registry.cache = LRUCache(4096)
+    return registry
+
+
+async def flood(sites: List[StubJira], tenants: List[Tenant], args, share: float) -> Dict:
+    registry = registry_for(tenants, args, share)
+    registry.cache = None
+    site = tenants[0].site
+    noisy, quiet = tenants[0], [t for t in tenants[1:] if t.site == site]
+    latencies: List[float] = []
+
+    async def flooder():
+        client = registry.clients(noisy).async_jira
+        await asyncio.gather(*(client.get_issue_summary(f"PROJ-{i % args.issues + 1}") for i in range(args.flood)))
+
+    async def team(tenant: Tenant):
+        client = registry.clients(tenant).async_jira
+        for i in range(args.requests):
+            await asyncio.sleep(args.interval)
+            start = time.perf_counter()
+            await client.get_issue_summary(f"PROJ-{i + 1}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    noisy_task = asyncio.create_task(flooder())
+    await asyncio.gather(*(team(t) for t in quiet))
+    quiet_done = time.perf_counter() - start
+    await noisy_task
+    latencies.sort()
+    return {"p50": 1000 * statistics.median(latencies), "p95": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+            "quiet_done": quiet_done, "flood_done": time.perf_counter() - start}
+
+
+def part2(sites: List[StubJira], tenants: List[Tenant], args) -> None:
+    quiet = sum(1 for t in tenants[1:] if t.site == tenants[0].site)
+    print(f"\n1 team sends {args.flood} requests at once; {quiet} teams on its site send {args.requests} each, "
+          f"{args.interval:g}s apart")
+    print(f"{'':<22}{'quiet p50 ms':>13}{'quiet p95 ms':>13}{'quiet done s':>13}{'flood done s':>13}")
+    for name, share in (("site budget only", 1.0), (f"per-team share {args.share:g}", args.share)):
+        row = asyncio.run(flood(sites, tenants, args, share))
+        print(f"{name:<22}{row['p50']:>13.0f}{row['p95']:>13.0f}{row['quiet_done']:>13.2f}{row['flood_done']:>13.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--sites", type=int, default=2)
+    parser.add_argument("--boards", type=int, default=20, help="boards per site")
+    parser.add_argument("--issues", type=int, default=400, help="issues per site")
+    parser.add_argument("--rounds", type=int, default=2, help="times every team asks (part 1)")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub Jira latency per request (s)")
+    parser.add_argument("--site-rate", type=float, default=50, help="site request budget (req/s)")
+    parser.add_argument("--site-concurrency", type=int, default=8)
+    parser.add_argument("--share", type=float, default=0.25, help="per-team share of the site budget")
+    parser.add_argument("--flood", type=int, default=200, help="requests of the noisy team (part 2)")
+    parser.add_argument("--requests", type=int, default=5, help="requests of each quiet team (part 2)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between a quiet team's requests")
+    args = parser.parse_args()
+
+    sites = [StubJira(issue_count=args.issues, latency=args.latency, boards=args.boards).start()
+             for _ in range(args.sites)]
+    tenants = make_tenants(sites, args.teams, args.boards)
+    part1(sites, tenants, args)
+    part2(sites, tenants, args)
+    for site in sites:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Tool-output token budget: prompt tokens of list_sprint_issues for growing
+sprints, as the model received it before (every issue, compact form) and
+with the budget applied (summary plus a handle to page through the rest),
+and what summarizing and paging cost.
+
+Runs against the in-process Jira stub. Tokens are the budgeter's own
+estimate (JSON characters / 4).
+
+    python -m benchmarks.bench_tool_budget --sizes 50,200,500,1000 --budget 4000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JIRA_URL", "http://127.0.0.1:9")
+os.environ.setdefault("JIRA_USER", "bench")
+os.environ.setdefault("JIRA_API_TOKEN", "bench")
+
+from benchmarks.stub_jira import StubJira  # noqa: E402
+from services.jira_async import AsyncJiraAPI  # noqa: E402
+from services.tool_budget import apply_budget, estimate_tokens, read_tool_output  # noqa: E402
+
+
+async def run(size: int, budget: int) -> None:
+    with StubJira(issue_count=size) as jira:
+        client = AsyncJiraAPI(jira.url, "user", "token")
+        result = await client.list_sprint_issues("1")
+        await client.aclose()
+    start = time.perf_counter()
+    summary = apply_budget("list_sprint_issues", result, budget)
+    took = time.perf_counter() - start
+    tokens, summary_tokens = estimate_tokens(result), estimate_tokens(summary)
+    if summary is result:
+        print(f"{size:5d} issues  {tokens:7d} tokens  under budget, passed through")
+        return
+    listed = len(summary["blocked_or_overdue"])
+    start = time.perf_counter()
+    page = read_tool_output(summary["handle"], 1)
+    page_took = time.perf_counter() - start
+    print(f"{size:5d} issues  {tokens:7d} tokens -> {summary_tokens:5d} ({100 * summary_tokens / tokens:4.1f}%)  "
+          f"blocked/overdue listed {listed:3d} (+{summary.get('blocked_or_overdue_omitted', 0)} counted)  "
+          f"keys by status {'yes' if 'keys_by_status' in summary else 'no ':3}  summarize {1000 * took:5.1f}ms  "
+          f"{summary['pages']} pages of ~{estimate_tokens(page['issues'])} tokens ({1000 * page_took:.1f}ms each)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50,200,500,1000", help="sprint sizes (issues)")
+    parser.add_argument("--budget", type=int, default=4000, help="token budget of list_sprint_issues")
+    args = parser.parse_args()
+    for size in map(int, args.sizes.split(",")):
+        asyncio.run(run(size, args.budget))
+
+
+if __name__ == "__main__":
+    main()
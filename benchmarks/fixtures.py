@@ -0,0 +1,136 @@
+"""
+Synthetic, Jira-shaped fixtures for the offline benchmarks.
+
+The generated payloads mimic Jira Cloud responses closely enough (``self``
+URLs, avatar maps, ADF descriptions, custom fields) that payload-size and
+parsing numbers are representative of a real tenant.
+"""
+import random
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+BASE_URL = "https://stub.atlassian.net"
+STATUSES = [
+    ("To Do", "new"),
+    ("In Progress", "indeterminate"),
+    ("In Review", "indeterminate"),
+    ("Blocked", "indeterminate"),
+    ("Done", "done"),
+]
+PEOPLE = ["Asha Rao", "Ben Ortiz", "Chen Wei", "Dana Kim", "Eli Novak", "Farah Haddad"]
+WORDS = (
+    "api auth cache timeout login payment checkout search index sync webhook "
+    "dashboard export import report retry queue worker session token upload "
+    "migration schema latency error crash regression mobile android ios billing"
+).split()
+
+
+def _user(name: str) -> Dict:
+    account_id = f"acc-{zlib.crc32(name.encode()) % 10 ** 8}"
+    return {
+        "self": f"{BASE_URL}/rest/api/3/user?accountId={account_id}",
+        "accountId": account_id,
+        "emailAddress": f"{name.split()[0].lower()}@example.com",
+        "avatarUrls": {size: f"{BASE_URL}/avatar/{account_id}/{size}" for size in ("48x48", "24x24", "16x16", "32x32")},
+        "displayName": name,
+        "active": True,
+        "timeZone": "UTC",
+        "accountType": "atlassian",
+    }
+
+
+def _adf(text: str) -> Dict:
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]}],
+    }
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+
+def make_sprint(sprint_id: int, board_id: int = 1, state: str = "active") -> Dict:
+    start = datetime(2024, 5, 6, 9, 0) + timedelta(days=14 * (sprint_id - 1))
+    return {
+        "id": sprint_id,
+        "self": f"{BASE_URL}/rest/agile/1.0/sprint/{sprint_id}",
+        "state": state,
+        "name": f"Sprint {sprint_id}",
+        "startDate": start.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+        "endDate": (start + timedelta(days=14)).strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+        "originBoardId": board_id,
+        "goal": "",
+    }
+
+
+def make_issue(i: int, project: str = "PROJ", sprint_id: int = 1, seed: int = 0) -> Dict:
+    """Build one full (unprojected) Jira issue payload."""
+    rng = random.Random(seed * 1_000_003 + i)
+    key = f"{project}-{i}"
+    status, category = rng.choice(STATUSES)
+    assignee = rng.choice(PEOPLE + [None])
+    created = datetime(2024, 5, 1) + timedelta(hours=rng.randint(0, 24 * 20))
+    updated = created + timedelta(hours=rng.randint(1, 24 * 10))
+    sprint = make_sprint(sprint_id)
+    links = []
+    if rng.random() < 0.2:
+        other = f"{project}-{max(1, i - rng.randint(1, 5))}"
+        links.append({
+            "id": str(10000 + i),
+            "self": f"{BASE_URL}/rest/api/3/issueLink/{10000 + i}",
+            "type": {"id": "10000", "name": "Blocks", "inward": "is blocked by", "outward": "blocks"},
+            "outwardIssue": {"id": str(i), "key": other, "self": f"{BASE_URL}/rest/api/3/issue/{other}"},
+        })
+    comments = [
+        {
+            "self": f"{BASE_URL}/rest/api/3/issue/{key}/comment/{i * 10 + c}",
+            "id": str(i * 10 + c),
+            "author": _user(rng.choice(PEOPLE)),
+            "body": _adf(_sentence(rng, 18)),
+            "created": updated.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+            "updated": updated.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+        }
+        for c in range(rng.randint(0, 3))
+    ]
+    return {
+        "expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+        "id": str(10000 + i),
+        "self": f"{BASE_URL}/rest/api/3/issue/{10000 + i}",
+        "key": key,
+        "fields": {
+            "summary": _sentence(rng, 6),
+            "description": _adf(_sentence(rng, 40)),
+            "status": {
+                "self": f"{BASE_URL}/rest/api/3/status/1",
+                "name": status,
+                "id": "1",
+                "statusCategory": {"self": f"{BASE_URL}/rest/api/3/statuscategory/2", "key": category, "name": status},
+            },
+            "assignee": _user(assignee) if assignee else None,
+            "reporter": _user(rng.choice(PEOPLE)),
+            "creator": _user(rng.choice(PEOPLE)),
+            "priority": {"self": f"{BASE_URL}/rest/api/3/priority/3", "name": rng.choice(["High", "Medium", "Low"]), "id": "3"},
+            "issuetype": {"self": f"{BASE_URL}/rest/api/3/issuetype/10001", "name": rng.choice(["Story", "Task", "Bug"]), "subtask": False},
+            "project": {"self": f"{BASE_URL}/rest/api/3/project/10000", "key": project, "name": project.title()},
+            "labels": rng.sample(WORDS, 2),
+            "created": created.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+            "updated": updated.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+            "duedate": (created + timedelta(days=rng.randint(3, 20))).strftime("%Y-%m-%d") if rng.random() < 0.7 else None,
+            "resolutiondate": updated.strftime("%Y-%m-%dT%H:%M:%S.000+0000") if category == "done" else None,
+            "customfield_10016": float(rng.choice([1, 2, 3, 5, 8])) if rng.random() < 0.85 else None,
+            "customfield_10020": [sprint],
+            "customfield_10021": None,
+            "customfield_10030": {"self": f"{BASE_URL}/rest/api/3/customFieldOption/1", "value": "Team A", "id": "1"},
+            "issuelinks": links,
+            "watches": {"self": f"{BASE_URL}/rest/api/3/issue/{key}/watchers", "watchCount": rng.randint(1, 4), "isWatching": False},
+            "votes": {"self": f"{BASE_URL}/rest/api/3/issue/{key}/votes", "votes": 0, "hasVoted": False},
+            "comment": {"comments": comments, "maxResults": len(comments), "total": len(comments), "startAt": 0},
+        },
+    }
+
+
+def make_issues(count: int, project: str = "PROJ", sprint_id: int = 1, seed: int = 0) -> List[Dict]:
+    return [make_issue(i, project, sprint_id, seed) for i in range(1, count + 1)]
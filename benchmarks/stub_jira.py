@@ -0,0 +1,283 @@
+"""
+In-process stub of the Jira Cloud REST endpoints used by ``JiraAPI``.
+
+Speaks HTTP/1.1 with keep-alive and gzip so connection-reuse and transfer
+numbers measured against it are meaningful. Usage::
+
+    with StubJira(issue_count=500, latency=0.005) as jira:
+        client = JiraAPI(jira.url, "user", "token")
+        ...
+        print(jira.calls)
+"""
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timezone
+from time import sleep, time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import make_issues, make_sprint
+
+
+def _project(issue: Dict, fields: Optional[List[str]]) -> Dict:
+    if not fields or any(f.startswith("*") for f in fields):
+        return issue
+    projected = {k: v for k, v in issue.items() if k != "fields"}
+    projected["fields"] = {f: issue["fields"].get(f) for f in fields if f in issue["fields"]}
+    return projected
+
+
+def _timestamp(value: Optional[str]) -> float:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.000%z").timestamp() if value else 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        # One handler per TCP connection; keep-alive requests reuse it
+        self.server.stub.record_connection()
+
+    def _send(self, status: int, body: Optional[Dict] = None, headers: Optional[Dict] = None) -> None:
+        data = json.dumps(body if body is not None else {}).encode()
+        headers = dict(headers or {})
+        if status == 200 and self.command == "GET":
+            etag = f'"{hashlib.sha1(data).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            data = gzip.compress(data, compresslevel=1)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _page(self, issues: List[Dict], start_at: int, max_results: int, fields) -> Dict:
+        max_results = min(max_results, self.server.stub.max_page_size)
+        page = issues[start_at:start_at + max_results]
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(issues),
+            "issues": [_project(issue, fields) for issue in page],
+        }
+
+    def _dispatch(self, method: str) -> None:
+        stub = self.server.stub
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = f"{method} {url.path}"
+        stub.record(route)
+        if stub.latency:
+            sleep(stub.latency)
+        if stub.should_throttle():
+            return self._send(429, {"errorMessages": ["Rate limit exceeded"]},
+                              {"Retry-After": stub.retry_after})
+
+        fields = query.get("fields", "").split(",") if query.get("fields") else None
+        start_at = int(query.get("startAt", 0))
+        max_results = int(query.get("maxResults", 50))
+
+        if m := re.fullmatch(r"GET /rest/agile/1.0/board", route):
+            return self._send(200, {"values": stub.boards})
+        if m := re.fullmatch(r"GET /rest/agile/1.0/board/(\d+)", route):
+            board = next((b for b in stub.boards if b["id"] == int(m.group(1))), None)
+            return self._send(200, board) if board else self._send(404, {"errorMessages": ["Board does not exist"]})
+        if m := re.fullmatch(r"GET /rest/agile/1.0/board/(\d+)/issue", route):
+            return self._send(200, self._page(stub.board_issues(int(m.group(1))), start_at, max_results, fields))
+        if m := re.fullmatch(r"GET /rest/agile/1.0/board/(\d+)/sprint", route):
+            state = query.get("state")
+            return self._send(200, {"values": [s for s in stub.sprints if s["originBoardId"] == int(m.group(1))
+                                               and (not state or s["state"] == state)]})
+        if m := re.fullmatch(r"GET /rest/agile/1.0/sprint/(\d+)", route):
+            sprint = next((s for s in stub.sprints if s["id"] == int(m.group(1))), None)
+            return self._send(200, sprint) if sprint else self._send(404, {"errorMessages": ["Sprint does not exist"]})
+        if m := re.fullmatch(r"GET /rest/agile/1.0/sprint/(\d+)/issue", route):
+            issues = stub.sprint_issues.get(int(m.group(1)), [])
+            return self._send(200, self._page(issues, start_at, max_results, fields))
+        if m := re.fullmatch(r"GET /rest/api/3/issue/([A-Z]+-\d+)", route):
+            issue = stub.by_key.get(m.group(1))
+            if issue is None:
+                return self._send(404, {"errorMessages": ["Issue does not exist"]})
+            return self._send(200, _project(issue, fields))
+        if route == "POST /rest/api/3/search":
+            body = self._body()
+            issues = stub.issues
+            if m := re.search(r"sprint = (\d+)", body.get("jql", "")):
+                issues = stub.sprint_issues.get(int(m.group(1)), [])
+            if m := re.search(r"key in \(([^)]*)\)", body.get("jql", "")):
+                keys = [k.strip() for k in m.group(1).split(",")]
+                issues = [stub.by_key[k] for k in keys if k in stub.by_key]
+            if m := re.search(r"labels in \(([^)]*)\)", body.get("jql", "")):
+                labels = {label.strip().strip('"') for label in m.group(1).split(",")}
+                issues = [issue for issue in issues if labels & set(issue["fields"].get("labels") or [])]
+            if m := re.search(r"updated >= -(\d+)m", body.get("jql", "")):
+                cutoff = time() - 60 * int(m.group(1))
+                issues = [issue for issue in issues if _timestamp(issue["fields"].get("updated")) >= cutoff]
+            return self._send(200, self._page(issues, body.get("startAt", 0),
+                                              body.get("maxResults", 50), body.get("fields")))
+        if route == "POST /rest/api/3/issue/bulk":
+            created, errors = [], []
+            for index, update in enumerate(self._body().get("issueUpdates", [])):
+                fields = update.get("fields", {})
+                if not fields.get("summary"):
+                    errors.append({"status": 400, "failedElementNumber": index,
+                                   "elementErrors": {"errors": {"summary": "You must specify a summary of the issue."}}})
+                    continue
+                key = stub.create(fields)
+                created.append({"id": key.split("-")[1], "key": key, "self": f"{stub.url}/rest/api/3/issue/{key}"})
+            return self._send(201 if created else 400, {"issues": created, "errors": errors})
+        if route == "POST /rest/api/3/issueLink":
+            body = self._body()
+            stub.link(body["type"]["name"], body["inwardIssue"]["key"], body["outwardIssue"]["key"])
+            return self._send(201)
+        if route == "POST /rest/api/3/issue":
+            body = self._body()
+            key = stub.create(body.get("fields", {}))
+            return self._send(201, {"id": key.split("-")[1], "key": key, "self": f"{stub.url}/rest/api/3/issue/{key}"})
+        self._send(404, {"errorMessages": [f"No stub route for {route}"]})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # A burst of new clients would otherwise overflow the default backlog of 5
+    request_queue_size = 128
+    stub: "StubJira"
+
+
+class StubJira:
+    def __init__(self, issue_count: int = 200, latency: float = 0.0, max_page_size: int = 100,
+                 project: str = "PROJ", seed: int = 0, throttle_rate: float = 0.0,
+                 retry_after: str = "1", boards: int = 1, sprints: int = 1):
+        """
+        Args:
+            issue_count: Number of synthetic issues, spread round-robin over the sprints
+            latency: Artificial per-request server latency in seconds
+            max_page_size: Cap applied to ``maxResults`` like Jira Cloud does
+            project: Project key used for generated issues
+            seed: Seed for the fixture generator
+            throttle_rate: Fraction of requests answered with 429
+            retry_after: Retry-After header sent with injected 429s
+            boards: Number of boards
+            sprints: Sprints per board; the last one of each board is active
+        """
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.project = project
+        self.issues = make_issues(issue_count, project=project, seed=seed)
+        self.by_key = {issue["key"]: issue for issue in self.issues}
+        self.boards = [{"id": b, "self": "", "name": f"{project} board" if b == 1 else f"{project} board {b}",
+                        "type": "scrum"} for b in range(1, boards + 1)]
+        self.sprints = [make_sprint((b - 1) * sprints + n, b, "active" if n == sprints else "closed")
+                        for b in range(1, boards + 1) for n in range(1, sprints + 1)]
+        self.sprint_issues = {sprint["id"]: [] for sprint in self.sprints}
+        for n, issue in enumerate(self.issues):
+            sprint = self.sprints[n % len(self.sprints)]
+            issue["fields"]["customfield_10020"] = [sprint]
+            self.sprint_issues[sprint["id"]].append(issue)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, route: str) -> None:
+        with self._lock:
+            self.calls[route] += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def board_issues(self, board_id: int) -> List[Dict]:
+        sprints = [s["id"] for s in self.sprints if s["originBoardId"] == board_id]
+        if len(sprints) == 1:
+            return self.sprint_issues[sprints[0]]
+        return [issue for sprint_id in sprints for issue in self.sprint_issues[sprint_id]]
+
+    def should_throttle(self) -> bool:
+        with self._lock:
+            if self.throttle_rate and self._rng.random() < self.throttle_rate:
+                self.calls["429"] += 1
+                return True
+            return False
+
+    def create(self, fields: Dict) -> str:
+        with self._lock:
+            key = f"{self.project}-{len(self.issues) + 1}"
+            issue = {"id": key.split("-")[1], "key": key, "fields": fields}
+            self.issues.append(issue)
+            self.by_key[key] = issue
+            # New issues land in the first board's active sprint
+            active = next(s for s in self.sprints if s["state"] == "active")
+            self.sprint_issues[active["id"]].append(issue)
+            return key
+
+    def link(self, link_type: str, inward_key: str, outward_key: str) -> None:
+        """Record "inward <outward verb> outward" on both issues, as Jira shows it."""
+        with self._lock:
+            kind = {"name": link_type, "inward": "is blocked by", "outward": "blocks"}
+            self.by_key[inward_key]["fields"].setdefault("issuelinks", []).append(
+                {"type": kind, "outwardIssue": {"key": outward_key}})
+            self.by_key[outward_key]["fields"].setdefault("issuelinks", []).append(
+                {"type": kind, "inwardIssue": {"key": inward_key}})
+
+    def touch(self, key: str, **fields) -> None:
+        """Change an issue's fields and bump its ``updated`` time to now."""
+        with self._lock:
+            issue = self.by_key[key]
+            issue["fields"].update(fields)
+            issue["fields"]["updated"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000%z")
+
+    def start(self) -> "StubJira":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubJira":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
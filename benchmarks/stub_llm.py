@@ -0,0 +1,173 @@
+"""
+Scripted, deterministic stand-in for the LiteLLM completion API, so the real
+agent tree (``root_agent``) can run offline::
+
+    install(root_agent, ScriptedLiteLLM(latency=0.8))
+
+Every ``LiteLlm`` model in the tree gets the stub as its ``llm_client``, so
+ADK's own request building, tool-call parsing and streaming code still run.
+Each agent follows a fixed script: the orchestrator hands the request to the
+specialist its keywords point at, the specialists call their main tool once
+and then answer from its result, and the epic decomposer drafts a breakdown
+(or, on "approve", creates it). A call takes ``latency`` seconds plus
+``token_time`` per output token and reports token usage like a provider.
+"""
+import asyncio
+import json
+import re
+import threading
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from google.adk.models.lite_llm import LiteLlm, LiteLLMClient
+
+ROUTES = [
+    ("sprint_manager_agent", re.compile(r"standup|sprint|blocked|health|velocity", re.I)),
+    ("epic_decomposer_agent", re.compile(r"epic|break\s*down|approve", re.I)),
+]
+
+
+def _get(message: Any, name: str, default=None):
+    if isinstance(message, dict):
+        return message.get(name, default)
+    return getattr(message, name, default)
+
+
+def _text(message: Any) -> str:
+    content = _get(message, "content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def make_draft(epic_key: str, stories: int = 4) -> str:
+    """The breakdown the scripted epic decomposer proposes for ``epic_key``."""
+    items = [{"id": f"S{i}", "type": "Story", "summary": f"{epic_key} slice {i}",
+              "description": f"Deliver slice {i} of {epic_key}.",
+              "acceptance_criteria": [f"Slice {i} works end to end"], "suggested_estimate": "3 points",
+              "suggested_owner": "Backend", "depends_on": [f"S{i - 1}"] if i > 1 else [],
+              "subtasks": [{"summary": f"Tests for slice {i}"}]}
+             for i in range(1, stories + 1)]
+    return json.dumps({"epic": epic_key, "project": epic_key.split("-")[0], "items": items})
+
+
+class ScriptedLiteLLM(LiteLLMClient):
+    """LiteLLMClient whose completions come from the per-agent script, not a provider."""
+
+    def __init__(self, latency: float = 0.8, token_time: float = 0.01, answer_words: int = 120):
+        """
+        Args:
+            latency: Seconds before the first token of every completion
+            token_time: Seconds per output token after that
+            answer_words: Words in a final answer (on top of the tool excerpt)
+        """
+        self.latency = latency
+        self.token_time = token_time
+        self.answer_words = answer_words
+        self.calls = Counter()
+        self.tokens = Counter()
+        self._lock = threading.Lock()
+
+    def plan(self, messages: List[Any], tools: Optional[List[Dict]]) -> Tuple[str, Optional[Tuple[str, Dict]], str]:
+        """The agent making the call, and its next step: a (tool, args) call or the answer text."""
+        system = next((_text(m) for m in messages if _get(m, "role") == "system"), "")
+        agent = m.group(1) if (m := re.search(r'internal name is "?(\w+)', system)) else "unknown"
+        offered = {tool["function"]["name"] for tool in tools or []}
+        last = messages[-1] if messages else {}
+        request = next((_text(m) for m in reversed(messages) if _get(m, "role") == "user"), "")
+
+        if _get(last, "role") != "tool":
+            call = self._script(agent, request)
+            if call and call[0] in offered:
+                return agent, call, ""
+            if agent == "epic_decomposer_agent":
+                keys = re.findall(r"[A-Z]+-\d+", request)
+                return agent, None, make_draft(keys[0] if keys else "PROJ-1")
+        results = [_text(m) for m in messages[-8:] if _get(m, "role") == "tool"]
+        excerpt = " ".join(results)[:600]
+        filler = " ".join(f"point{i}" for i in range(self.answer_words))
+        return agent, None, f"{agent} answer to '{request[:80]}': {excerpt} {filler}"
+
+    @staticmethod
+    def _script(agent: str, request: str) -> Optional[Tuple[str, Dict]]:
+        keys = re.findall(r"[A-Z]+-\d+", request)
+        if agent == "sprint_manager_agent":
+            return "get_standup_digest", {"board_id": "1"}
+        if agent == "kb_extractor_agent":
+            return "search_knowledge_base", {"query": request, "k": 5}
+        if agent == "epic_decomposer_agent" and re.search(r"approve", request, re.I):
+            epic = keys[0] if keys else "PROJ-1"
+            return "create_issues_from_draft", {"draft": make_draft(epic), "epic_key": epic}
+        if agent == "central_orchestrator_agent":
+            target = next((name for name, pattern in ROUTES if pattern.search(request)), "kb_extractor_agent")
+            return target, {"request": request}
+        return None
+
+    async def acompletion(self, model, messages, tools, **kwargs) -> Any:
+        from litellm.types.utils import (ChatCompletionDeltaToolCall, ChatCompletionMessageToolCall, Choices,
+                                         Delta, Function, Message, ModelResponse, ModelResponseStream,
+                                         StreamingChoices, Usage)
+
+        agent, call, text = self.plan(messages, tools)
+        prompt_tokens = (len(json.dumps(messages, default=str)) + len(json.dumps(tools or []))) // 4
+        output = json.dumps(call[1]) if call else text
+        usage = Usage(prompt_tokens=prompt_tokens, completion_tokens=len(output) // 4,
+                      total_tokens=prompt_tokens + len(output) // 4)
+        with self._lock:
+            self.calls[agent] += 1
+            self.tokens["input"] += usage.prompt_tokens
+            self.tokens["output"] += usage.completion_tokens
+            call_id = f"call_{agent}_{self.calls[agent]}"
+
+        if not kwargs.get("stream"):
+            await asyncio.sleep(self.latency + self.token_time * usage.completion_tokens)
+            if call:
+                message = Message(role="assistant", content=None, tool_calls=[ChatCompletionMessageToolCall(
+                    id=call_id, type="function", function=Function(name=call[0], arguments=output))])
+            else:
+                message = Message(role="assistant", content=text)
+            return ModelResponse(model=model, usage=usage, choices=[
+                Choices(index=0, message=message, finish_reason="tool_calls" if call else "stop")])
+
+        async def chunks() -> AsyncIterator[Any]:
+            await asyncio.sleep(self.latency)
+            if call:
+                await asyncio.sleep(self.token_time * usage.completion_tokens)
+                yield ModelResponseStream(choices=[StreamingChoices(index=0, delta=Delta(tool_calls=[
+                    ChatCompletionDeltaToolCall(index=0, id=call_id, type="function",
+                                                function=Function(name=call[0], arguments=output))]))])
+            else:
+                words = text.split(" ")
+                for i, word in enumerate(words):
+                    await asyncio.sleep(self.token_time * usage.completion_tokens / len(words))
+                    yield ModelResponseStream(choices=[StreamingChoices(
+                        index=0, delta=Delta(content=word if i == 0 else f" {word}"))])
+            yield ModelResponseStream(choices=[StreamingChoices(
+                index=0, delta=Delta(), finish_reason="tool_calls" if call else "stop")])
+            final = ModelResponseStream(choices=[])
+            final.usage = usage
+            yield final
+
+        return chunks()
+
+
+def install(agent, client: LiteLLMClient) -> int:
+    """
+    Point every LiteLlm model under ``agent`` (sub-agents and AgentTools
+    included) at ``client``.
+
+    Returns:
+        Number of models patched
+    """
+    seen, stack, patched = set(), [agent], 0
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(getattr(node, "model", None), LiteLlm):
+            node.model.llm_client = client
+            patched += 1
+        stack.extend(getattr(node, "sub_agents", []) or [])
+        stack.extend(tool.agent for tool in getattr(node, "tools", []) or [] if hasattr(tool, "agent"))
+    return patched
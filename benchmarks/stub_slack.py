@@ -0,0 +1,242 @@
+"""
+In-process stubs of the Slack Web API and the ADK API server, for exercising
+``services.slack_bot`` offline::
+
+    with StubSlack() as slack, StubADK(latency=2.0, jira_url=jira.url) as adk:
+        os.environ["SLACK_API_URL"] = slack.url
+        os.environ["ADK_BASE_URL"] = adk.url
+        ...
+        print(slack.messages, adk.calls)
+"""
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
+from time import sleep
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+BOT_USER_ID = "UBOT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body=None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body if body is not None else {}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _dispatch(self, method: str) -> None:
+        stub = self.server.stub
+        route = f"{method} {self.path.split('?')[0]}"
+        stub.connections.add(self.client_address)
+        body = self._body() if method == "POST" else {}
+        status, response, *headers = stub.handle(route, body)
+        if isinstance(response, Iterator):
+            return self._stream(response)
+        self._send(status, response, *headers)
+
+    def _stream(self, events: Iterator[Dict]) -> None:
+        """Server-sent events, one ``data:`` line per event in its own chunk (like uvicorn)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = f"data: {json.dumps(event)}\n\n".encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "_Stub"
+
+
+class _Stub:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+
+    def handle(self, route: str, body: Dict):
+        raise NotImplementedError
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class StubSlack(_Stub):
+    """
+    Slack Web API: auth.test, chat.postMessage and chat.update. Posted
+    messages are kept in ``messages`` with their post time and every
+    update as ``(time, text)``.
+    
+    ``limits`` maps a method to the calls per second it accepts (per
+    channel for chat.postMessage, like Slack); calls over the limit get a
+    429 with Retry-After.
+    """
+
+    def __init__(self, latency: float = 0.0, limits: Optional[Dict[str, float]] = None):
+        super().__init__(latency)
+        self.messages: List[Dict] = []
+        self.limits = limits or {}
+        self._next_allowed: Dict[str, float] = {}
+
+    def _throttle(self, method: str, body: Dict) -> Optional[float]:
+        """Seconds the caller must wait if this call is over the method's limit."""
+        if method not in self.limits:
+            return None
+        key = f"{method}:{body.get('channel')}" if method == "chat.postMessage" else method
+        now = time.monotonic()
+        with self._lock:
+            allowed = self._next_allowed.get(key, 0.0)
+            if now < allowed:
+                return allowed - now
+            self._next_allowed[key] = max(allowed, now) + 1 / self.limits[method]
+        return None
+
+    def handle(self, route: str, body: Dict):
+        self.record(route)
+        if self.latency:
+            sleep(self.latency)
+        wait = self._throttle(route.split("/")[-1], body)
+        if wait is not None:
+            self.record("429")
+            return 429, {"ok": False, "error": "ratelimited"}, {"Retry-After": str(max(1, round(wait)))}
+        if route.endswith("/auth.test"):
+            return 200, {"ok": True, "user_id": BOT_USER_ID}
+        if route == "POST /chat.postMessage":
+            with self._lock:
+                ts = f"{len(self.messages) + 1}.000100"
+                self.messages.append(dict(body, ts=ts, posted_at=time.monotonic(), updates=[]))
+            return 200, {"ok": True, "channel": body.get("channel"), "ts": ts}
+        if route == "POST /chat.update":
+            with self._lock:
+                message = self.messages[int(body["ts"].split(".")[0]) - 1]
+                message["text"] = body.get("text")
+                message["updates"].append((time.monotonic(), body.get("text")))
+            return 200, {"ok": True, "channel": body.get("channel"), "ts": body["ts"]}
+        return 404, {"ok": False, "error": "unknown_method"}
+
+
+class StubADK(_Stub):
+    """
+    ADK API server: session creation and ``/run``, which sleeps ``latency``
+    seconds (the agent's think time) and echoes the user's message. Unknown
+    sessions get a 404 like the real server.
+    
+    With ``jira_url`` each run also models the orchestrator's Jira usage
+    against a StubJira: a session without the active sprint in its state
+    fetches the sprint and its issues, and any issue key in the message not
+    looked up earlier in the session is fetched.
+    """
+
+    def __init__(self, latency: float = 1.0, jira_url: Optional[str] = None, chunks: int = 40):
+        super().__init__(latency)
+        self.chunks = chunks
+        self.sessions: Dict[str, Dict] = {}
+        self.jira_url = jira_url
+        self._jira = requests.Session()
+
+    def _use_jira(self, state: Dict, text: str) -> None:
+        if "sprint_id" not in state:
+            sprint = self._jira.get(f"{self.jira_url}/rest/agile/1.0/board/1/sprint", params={"state": "active"}).json()
+            state["sprint_id"] = sprint["values"][0]["id"]
+            start_at, total = 0, 1
+            while start_at < total:
+                page = self._jira.get(f"{self.jira_url}/rest/agile/1.0/sprint/{state['sprint_id']}/issue",
+                                      params={"startAt": start_at, "maxResults": 100, "fields": "summary"}).json()
+                total = page["total"]
+                start_at += len(page["issues"]) or total
+        looked_up = state.setdefault("issues", [])
+        for key in re.findall(r"[A-Z]+-\d+", text):
+            if key not in looked_up:
+                self._jira.get(f"{self.jira_url}/rest/api/3/issue/{key}")
+                looked_up.append(key)
+
+    def handle(self, route: str, body: Dict):
+        if m := re.fullmatch(r"POST /apps/(\w+)/users/([^/]+)/sessions/([^/]+)", route):
+            self.record("create_session")
+            with self._lock:
+                self.sessions[m.group(3)] = {"id": m.group(3), "userId": m.group(2), "state": body}
+            return 200, self.sessions[m.group(3)]
+        if route in ("POST /run", "POST /run_sse"):
+            self.record(route.split("/")[-1])
+            session = self.sessions.get(body.get("sessionId"))
+            if session is None:
+                return 404, {"detail": "Session not found"}
+            if self.jira_url:
+                self._use_jira(session["state"], body["newMessage"]["parts"][0].get("text", ""))
+            text = "".join(part.get("text", "") for part in body["newMessage"]["parts"])
+            reply = f"Echo: {text} " + " ".join(f"word{i}" for i in range(self.chunks))
+            if route == "POST /run_sse":
+                return 200, self._stream_run(reply)
+            sleep(self.latency)
+            return 200, [{"author": "central_orchestrator_agent",
+                          "content": {"role": "model", "parts": [{"text": reply}]}}]
+        return 404, {"detail": "Not Found"}
+
+    def _stream_run(self, reply: str) -> Iterator[Dict]:
+        """A quarter of the run delegating and calling a tool, the rest streaming tokens."""
+        def event(author, parts, partial=False):
+            return {"author": author, "partial": partial, "content": {"role": "model", "parts": parts}}
+
+        sleep(self.latency / 8)
+        yield event("central_orchestrator_agent", [{"functionCall": {
+            "name": "transfer_to_agent", "args": {"agent_name": "sprint_manager_agent"}}}])
+        sleep(self.latency / 8)
+        yield event("sprint_manager_agent", [{"functionCall": {"name": "get_sprint_health", "args": {}}}])
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            sleep(0.75 * self.latency / len(words))
+            yield event("sprint_manager_agent", [{"text": word if i == 0 else f" {word}"}], partial=True)
+        yield event("sprint_manager_agent", [{"text": reply}])
@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from services.embeddings import embed_query
+
+# Tools that only read Jira or the knowledge base; an answer built from
+# anything else (e.g. create_issue) is never cached
+READ_ONLY_TOOLS = frozenset({
+    'get_active_sprint', 'list_sprint_issues', 'get_issue_summary', 'get_issues_details',
+    'search_issues', 'get_sprint_health', 'get_standup_digest', 'search_knowledge_base', 'semantic_search_issues',
+    'read_tool_output',
+})
+
+# Fields derived from the clock rather than Jira data; they change every
+# few minutes without the sprint changing, so the fingerprint ignores them
+VOLATILE_FIELDS = frozenset({'days_elapsed', 'actual_points_per_day', 'required_points_per_day'})
+
+# Words that do not change what is being asked
+FILLER_WORDS = frozenset({'please', 'pls', 'plz', 'hey', 'hi', 'hello', 'thanks', 'thank', 'you', 'bot', 'sprintmind'})
+
+
+# Specifics that make two otherwise similar questions different ones
+QUOTED_RE = re.compile(r'"([^"]+)"|\u201c([^\u201d]+)\u201d|`([^`]+)`|(?<!\w)\'([^\']+)\'(?!\w)')
+ISSUE_KEY_RE = re.compile(r"\b[A-Za-z][A-Za-z0-9_]*-\d+\b")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+MENTION_RE = re.compile(r"<@(\w+)(?:\|[^>]*)?>|(?<!\w)@([\w.-]+)")
+WORD_RE = re.compile(r"[A-Za-z][\w'-]*")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, drop punctuation and filler words, collapse whitespace."""
+    words = re.sub(r"[^\w\s-]", " ", (text or "").lower()).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def query_entities(text: str) -> Tuple[str, ...]:
+    """
+    The specifics of a question that must match exactly for two questions
+    to share an answer, however similar their embeddings: quoted strings,
+    issue keys, numbers (sprint and board ids, dates), @mentions and names
+    (capitalized words other than the first of a sentence).
+
+    Returns:
+        Sorted, type-prefixed entities
+    """
+    text = text or ""
+    entities = {f"quote:{normalize_query(next(g for g in m.groups() if g))}" for m in QUOTED_RE.finditer(text)}
+    text = QUOTED_RE.sub(" ", text)
+    entities.update(f"mention:{(a or b).lower()}" for a, b in MENTION_RE.findall(text))
+    text = MENTION_RE.sub(" ", text)
+    entities.update(f"key:{key.upper()}" for key in ISSUE_KEY_RE.findall(text))
+    text = ISSUE_KEY_RE.sub(" ", text)
+    entities.update(f"number:{number}" for number in NUMBER_RE.findall(text))
+    for sentence in re.split(r"[.!?\n]+", text):
+        for word in WORD_RE.findall(sentence)[1:]:
+            if word[0].isupper() and word.lower() not in FILLER_WORDS:
+                entities.add(f"name:{word.lower()}")
+    return tuple(sorted(entities))
+
+
+def argument_words(query: str, calls: List[Tuple[str, Dict]]) -> Tuple[str, ...]:
+    """Words of a normalized question that its tool calls were given (e.g. a name in a JQL query)."""
+    passed = set(re.findall(r"[\w-]+", json.dumps([args for _, args in calls], default=str).lower()))
+    return tuple(sorted(word for word in set(query.split()) if len(word) > 1 and word in passed))
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def data_fingerprint(responses: List[Tuple[str, Any]]) -> str:
+    """
+    Hash the tool results an answer was built from
+
+    Args:
+        responses: (tool name, response) pairs, in any order
+
+    Returns:
+        Hex digest that changes whenever the underlying Jira data does
+    """
+    rows = sorted(json.dumps([name, _strip_volatile(response)], sort_keys=True, default=str)
+                  for name, response in responses)
+    return hashlib.sha256("\n".join(rows).encode()).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    query: str
+    vector: np.ndarray
+    agents: Tuple[str, ...]
+    calls: List[Tuple[str, Dict]]
+    fingerprint: str
+    author: str
+    text: str
+    created: float
+    tenant: str = ""
+    entities: Tuple[str, ...] = ()
+    # Words of the question passed to its tool calls; another question must contain them too
+    anchors: Tuple[str, ...] = ()
+
+
+class AgentResponseCache:
+    def __init__(self, ttl: float = 600, maxsize: int = 256, similarity: float = 0.92, embedder=None):
+        """
+        Cache of final agent answers for near-identical questions
+
+        An entry is found by the normalized question (exact match first,
+        then embedding similarity), the agents it was routed to and the
+        tenant that asked (teams never share answers). Similar questions
+        must also name the same issue keys, numbers, quoted strings and
+        people, and contain every word of the cached question that went
+        into its tool calls, since revalidation repeats the cached calls
+        with their old arguments. Before it is served, the read-only tool calls the answer was built from are
+        repeated (cheap: they hit the Jira response cache or mirror) and
+        their fingerprint compared, so any change in Jira invalidates it.
+
+        Args:
+            ttl: Seconds an entry may be served
+            maxsize: Maximum number of entries (least recently used evicted)
+            similarity: Minimum cosine similarity of two questions to share an answer
+            embedder: Override for the shared embedder
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.similarity = similarity
+        self.embedder = embedder
+        self._entries: "OrderedDict[int, CachedResponse]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0, 'stores': 0,
+                       'uncacheable': 0}
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def key(self, text: str) -> Tuple[str, np.ndarray, Tuple[str, ...]]:
+        """Normalize, embed and extract the entities of a question (CPU work; run it off the event loop)."""
+        normalized = normalize_query(text)
+        return normalized, embed_query(normalized, embedder=self.embedder), query_entities(text)
+
+    def candidates(self, key: Tuple[str, np.ndarray, Tuple[str, ...]], agents: Tuple[str, ...],
+                   tenant: str = "") -> List[Tuple[int, CachedResponse]]:
+        """Live entries for the same agents, tenant and entities, exact question first, then by similarity."""
+        normalized, vector, entities = key
+        words = set(normalized.split())
+        now = time.time()
+        scored = []
+        with self._lock:
+            for entry_id, entry in list(self._entries.items()):
+                if now - entry.created > self.ttl:
+                    del self._entries[entry_id]
+                    self._stats['expired'] += 1
+                    continue
+                if entry.agents != agents or entry.tenant != tenant or entry.entities != entities \
+                        or not words.issuperset(entry.anchors):
+                    continue
+                score = 2.0 if entry.query == normalized else float(entry.vector @ vector)
+                if score >= self.similarity:
+                    scored.append((score, entry_id, entry))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(entry_id, entry) for _, entry_id, entry in scored]
+
+    async def lookup(self, key: Tuple[str, np.ndarray, Tuple[str, ...]], agents: Tuple[str, ...],
+                     run_tool: Callable[[str, Dict], Awaitable[Any]], tries: int = 2,
+                     tenant: str = "") -> Optional[CachedResponse]:
+        """
+        Find a cached answer whose Jira data is unchanged
+
+        Args:
+            key: Result of ``key(question)``
+            agents: Agents the question was routed to
+            run_tool: Coroutine function repeating one tool call (name, args)
+            tries: Most candidates to revalidate
+            tenant: Tenant asking
+
+        Returns:
+            The cached answer, or None
+        """
+        for entry_id, entry in self.candidates(key, agents, tenant)[:tries]:
+            try:
+                responses = await asyncio.gather(*(run_tool(name, args) for name, args in entry.calls))
+            except Exception as e:
+                print(f"Error revalidating cached answer: {e}")
+                responses = None
+            if responses is not None and data_fingerprint(
+                    [(name, response) for (name, _), response in zip(entry.calls, responses)]) == entry.fingerprint:
+                with self._lock:
+                    if entry_id in self._entries:
+                        self._entries.move_to_end(entry_id)
+                    self._stats['hits'] += 1
+                return entry
+            # Jira changed since the answer was built
+            with self._lock:
+                if self._entries.pop(entry_id, None) is not None:
+                    self._stats['stale'] += 1
+        self._incr('misses')
+        return None
+
+    def put(self, key: Tuple[str, np.ndarray, Tuple[str, ...]], agents: Tuple[str, ...], calls: List[Tuple[str, Dict]],
+            responses: List[Tuple[str, Any]], author: str, text: str, tenant: str = "") -> bool:
+        """
+        Store an answer and the tool calls it was built from
+
+        Args:
+            key: Result of ``key(question)``
+            agents: Agents the question was routed to
+            calls: (tool name, args) of every tool call made
+            responses: (tool name, response) of those calls
+            author: Agent that wrote the final answer
+            text: The final answer
+            tenant: Tenant that asked
+
+        Returns:
+            False if the answer used no tool (nothing to revalidate it
+            against) or a tool that is not read-only
+        """
+        if not text or not calls or any(name not in READ_ONLY_TOOLS for name, _ in calls):
+            self._incr('uncacheable')
+            return False
+        normalized, vector, entities = key
+        entry = CachedResponse(normalized, vector, agents, calls, data_fingerprint(responses), author, text, time.time(),
+                               tenant, entities, argument_words(normalized, calls))
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            self._stats['stores'] += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, stale (Jira changed), expired,
+            evicted and stored entries, and the current size
+        """
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
@@ -0,0 +1,372 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import yaml
+from utils.config import JIRA_SUBTASK_TYPE, JIRA_BULK_BATCH_SIZE
+from services.tenants import tenant_jira, tenant_scoped
+from services.jira_models import issue_create_payload
+from services.lazy import function_tool, lazy_globals
+
+# Label on every issue created from a draft; each issue also gets a
+# "sprintmind-<hash>" label that identifies its draft item across retries
+BULK_LABEL = "sprintmind"
+# Labels looked up per search
+LABEL_CHUNK = 50
+ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+FENCED = re.compile(r"```[\w-]*\s*\n(.*?)\n\s*```", re.S)
+
+
+@dataclass
+class PlannedIssue:
+    ref: str
+    summary: str
+    description: str
+    issue_type: str
+    dedup_label: str
+    parent_ref: Optional[str] = None
+    story_points: Optional[float] = None
+    depends_on: List[str] = field(default_factory=list)
+    key: Optional[str] = None
+    status: str = "pending"
+    error: Optional[str] = None
+
+    def result(self) -> Dict:
+        data = {'ref': self.ref, 'summary': self.summary, 'type': self.issue_type, 'status': self.status}
+        if self.key:
+            data['key'] = self.key
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+def load_draft(text: str) -> Dict:
+    """
+    Parse an epic breakdown draft
+
+    Args:
+        text: JSON or YAML, optionally inside a fenced code block
+
+    Returns:
+        The draft object
+
+    Raises:
+        ValueError: if the text is not a JSON or YAML object
+    """
+    match = FENCED.search(text or "")
+    text = match.group(1) if match else (text or "")
+    try:
+        draft = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            draft = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Draft is neither JSON nor YAML: {e}")
+    if not isinstance(draft, dict):
+        raise ValueError("Draft must be a JSON or YAML object")
+    return draft
+
+
+def _first(item: Dict, *names):
+    for name in names:
+        value = item.get(name)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def _as_list(value) -> List:
+    if value in (None, ""):
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _estimate(value) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = re.search(r"\d+(\.\d+)?", str(value or ""))
+    return float(match.group()) if match else None
+
+
+def _describe(item: Dict) -> str:
+    parts = []
+    description = _first(item, 'description', 'details')
+    if description:
+        parts.append(str(description))
+    criteria = _as_list(_first(item, 'acceptance_criteria', 'acceptanceCriteria'))
+    if criteria:
+        parts.append("Acceptance criteria:")
+        parts.append("\n".join(f"- {criterion}" for criterion in criteria))
+    owner = _first(item, 'suggested_owner', 'owner')
+    if owner:
+        parts.append(f"Suggested owner: {owner}")
+    return "\n\n".join(parts)
+
+
+def dedup_label(scope: str, parent_summary: str, summary: str) -> str:
+    """Label identifying one draft item; the same item always gets the same label."""
+    digest = hashlib.sha1(f"{scope}|{parent_summary}|{summary}".lower().encode()).hexdigest()[:12]
+    return f"{BULK_LABEL}-{digest}"
+
+
+def plan_issues(draft: Dict, scope: str, story_type: str = "Story",
+                subtask_type: str = JIRA_SUBTASK_TYPE) -> List[PlannedIssue]:
+    """
+    Flatten a draft into the issues to create, stories before their sub-tasks
+
+    Args:
+        draft: Parsed draft with ``items`` (or ``stories``), each optionally with ``subtasks``
+        scope: Epic or project key the dedup labels are scoped to
+        story_type: Issue type for items that do not name one
+        subtask_type: Issue type for sub-tasks
+
+    Returns:
+        PlannedIssue list; items without a summary are already marked failed
+    """
+    planned = []
+    for i, item in enumerate(_as_list(_first(draft, 'items', 'stories', 'breakdown', 'issues')), 1):
+        if isinstance(item, str):
+            item = {'summary': item}
+        ref = str(_first(item, 'id', 'ref') or f"S{i}")
+        summary = str(_first(item, 'summary', 'title') or "").strip()
+        story = PlannedIssue(ref, summary, _describe(item), str(_first(item, 'type', 'issue_type') or story_type),
+                             dedup_label(scope, "", summary),
+                             story_points=_estimate(_first(item, 'suggested_estimate', 'estimate', 'story_points', 'points')),
+                             depends_on=[str(dep) for dep in _as_list(_first(item, 'depends_on', 'dependencies'))])
+        planned.append(story)
+        for j, sub in enumerate(_as_list(item.get('subtasks')), 1):
+            if isinstance(sub, str):
+                sub = {'summary': sub}
+            sub_summary = str(_first(sub, 'summary', 'title') or "").strip()
+            planned.append(PlannedIssue(
+                str(_first(sub, 'id', 'ref') or f"{ref}.{j}"), sub_summary, _describe(sub), subtask_type,
+                dedup_label(scope, summary, sub_summary), parent_ref=ref,
+                story_points=_estimate(_first(sub, 'suggested_estimate', 'estimate', 'story_points', 'points')),
+                depends_on=[str(dep) for dep in _as_list(_first(sub, 'depends_on', 'dependencies'))]))
+    for issue in planned:
+        if not issue.summary:
+            issue.status, issue.error = "failed", "missing summary"
+    return planned
+
+
+def _element_error(error: Dict) -> str:
+    element = error.get('elementErrors') or {}
+    messages = list(element.get('errorMessages') or [])
+    messages += [f"{name}: {message}" for name, message in (element.get('errors') or {}).items()]
+    return "; ".join(messages) or f"status {error.get('status')}"
+
+
+class BulkIssueCreator:
+    """
+    Creates an approved epic breakdown in Jira: stories (under the epic),
+    then their sub-tasks, estimates and "blocks" links for dependencies,
+    through the bulk create endpoint in batches of ``batch_size``.
+
+    Runs are idempotent: each issue carries a label derived from the epic
+    and its summary (and its story's, for sub-tasks), and issues whose label
+    already exists in Jira are reused instead of created again, so retrying
+    a failed or interrupted run only creates what is missing.
+    """
+
+    def __init__(self, client, batch_size: int = JIRA_BULK_BATCH_SIZE, subtask_type: str = JIRA_SUBTASK_TYPE):
+        """
+        Args:
+            client: JiraAPI instance
+            batch_size: Issues per bulk request (Jira accepts at most 50)
+            subtask_type: Issue type name for sub-tasks
+        """
+        self.client = client
+        self.batch_size = min(batch_size, 50)
+        self.subtask_type = subtask_type
+
+    def find_existing(self, labels: List[str]) -> Dict[str, Dict]:
+        """
+        Look up issues already created for ``labels``
+
+        Returns:
+            Label -> issue (key and issuelinks)
+        """
+        found = {}
+        for start in range(0, len(labels), LABEL_CHUNK):
+            chunk = labels[start:start + LABEL_CHUNK]
+            jql = f"labels in ({', '.join(json.dumps(label) for label in chunk)})"
+            start_at = 0
+            while True:
+                page = self.client.search_issues(jql, 100, ['labels', 'issuelinks'], start_at, use_cache=False)
+                if 'issues' not in page:
+                    # Creating without knowing what exists could duplicate issues
+                    raise RuntimeError(f"Could not look up existing issues: {page.get('error', 'Jira search failed')}")
+                for issue in page['issues']:
+                    for label in (issue.get('fields') or {}).get('labels') or []:
+                        if label in chunk:
+                            found[label] = issue
+                start_at += len(page['issues'])
+                if not page['issues'] or start_at >= page.get('total', 0):
+                    break
+        return found
+
+    def _create(self, project_key: str, issues: List[PlannedIssue], parent_keys: Dict[str, str]) -> int:
+        """Create ``issues`` in batches; returns the number of bulk requests sent."""
+        requests_sent = 0
+        for start in range(0, len(issues), self.batch_size):
+            batch = issues[start:start + self.batch_size]
+            payloads = [issue_create_payload(project_key, issue.summary, issue.description, issue.issue_type,
+                                             parent_keys.get(issue.parent_ref or ""), issue.story_points,
+                                             [BULK_LABEL, issue.dedup_label])
+                        for issue in batch]
+            result = self.client.bulk_create_issues(payloads)
+            requests_sent += 1
+            if 'error' in result:
+                # The request may still have gone through; trust only what Jira now has
+                try:
+                    existing = self.find_existing([issue.dedup_label for issue in batch])
+                except RuntimeError as e:
+                    print(f"Error reconciling bulk create: {e}")
+                    existing = {}
+                for issue in batch:
+                    if issue.dedup_label in existing:
+                        issue.key, issue.status = existing[issue.dedup_label]['key'], "created"
+                    else:
+                        issue.status, issue.error = "failed", result['error']
+                continue
+            errors = {error.get('failedElementNumber'): error for error in result.get('errors') or []}
+            created = iter(result.get('issues') or [])
+            for index, issue in enumerate(batch):
+                if index in errors:
+                    issue.status, issue.error = "failed", _element_error(errors[index])
+                    continue
+                entry = next(created, None)
+                if entry is None:
+                    issue.status, issue.error = "failed", "missing from Jira's response"
+                else:
+                    issue.key, issue.status = entry['key'], "created"
+        return requests_sent
+
+    def run(self, draft: Dict, epic_key: Optional[str] = None, project_key: Optional[str] = None,
+            dry_run: bool = False) -> Dict:
+        """
+        Create every issue and link of a draft that does not exist yet
+
+        Args:
+            draft: Parsed draft (see load_draft)
+            epic_key: Epic the stories go under (default: the draft's ``epic``)
+            project_key: Project to create in (default: from the epic key or the draft)
+            dry_run: Only report what would be created
+
+        Returns:
+            Dictionary with counts, per-item results (ref, summary, type, key,
+            status created / existing / failed / planned, error) and link results
+        """
+        if not epic_key:
+            epic = draft.get('epic') or draft.get('epic_key')
+            epic_key = epic.get('key') if isinstance(epic, dict) else epic
+        epic_key = str(epic_key).strip() if epic_key and ISSUE_KEY.match(str(epic_key).strip()) else None
+        project_key = project_key or draft.get('project') or draft.get('project_key') or (
+            epic_key.rsplit('-', 1)[0] if epic_key else None)
+        if not project_key:
+            return {'error': 'No project key: pass project_key or an epic key'}
+
+        planned = plan_issues(draft, epic_key or project_key, subtask_type=self.subtask_type)
+        by_ref = {issue.ref: issue for issue in planned}
+        pending = [issue for issue in planned if issue.status == "pending"]
+        existing = self.find_existing([issue.dedup_label for issue in pending])
+        for issue in pending:
+            if issue.dedup_label in existing:
+                issue.key, issue.status = existing[issue.dedup_label]['key'], "existing"
+
+        requests_sent = 0
+        stories = [issue for issue in planned if issue.status == "pending" and issue.parent_ref is None]
+        subtasks = [issue for issue in planned if issue.status == "pending" and issue.parent_ref is not None]
+        if dry_run:
+            for issue in stories + subtasks:
+                issue.status = "planned"
+        else:
+            requests_sent += self._create(project_key, stories, {"": epic_key} if epic_key else {})
+            parent_keys = {issue.ref: issue.key for issue in planned if issue.key}
+            for issue in subtasks:
+                if issue.parent_ref not in parent_keys:
+                    issue.status, issue.error = "failed", f"parent {issue.parent_ref} was not created"
+            requests_sent += self._create(project_key, [issue for issue in subtasks if issue.status == "pending"],
+                                          parent_keys)
+
+        links = []
+        for issue in planned:
+            for ref in issue.depends_on:
+                blocker = by_ref[ref].key if ref in by_ref else (ref if ISSUE_KEY.match(ref) else None)
+                link = {'from': blocker or ref, 'to': issue.key or issue.ref, 'type': 'Blocks'}
+                if not blocker or not issue.key:
+                    link.update(status="planned" if dry_run else "failed", error="issue not created")
+                elif any(item.get('type', {}).get('name') == 'Blocks' and item.get('inwardIssue', {}).get('key') == blocker
+                         for item in (existing.get(issue.dedup_label, {}).get('fields') or {}).get('issuelinks') or []):
+                    link['status'] = "existing"
+                elif dry_run:
+                    link['status'] = "planned"
+                else:
+                    result = self.client.create_issue_link('Blocks', blocker, issue.key)
+                    link['status'] = "failed" if 'error' in result else "created"
+                    if 'error' in result:
+                        link['error'] = result['error']
+                links.append(link)
+
+        counts = {}
+        for issue in planned:
+            counts[issue.status] = counts.get(issue.status, 0) + 1
+        return {
+            'project': project_key,
+            'epic': epic_key,
+            'counts': counts,
+            'bulk_requests': requests_sent,
+            'items': [issue.result() for issue in planned],
+            'links': links,
+        }
+
+
+async def create_issues_from_draft(draft: str, epic_key: str = "", project_key: str = "") -> Dict:
+    """
+    Create every story, sub-task, estimate and dependency link of an APPROVED
+    epic breakdown in Jira with a few bulk requests. Only call this after the
+    user has explicitly approved the draft. Safe to retry: items already
+    created from the same draft are found and reported as existing, not
+    created twice.
+
+    Args:
+        draft: The approved breakdown, as JSON or YAML.
+        epic_key: Key of the epic the stories belong to (e.g. 'PROJ-7').
+        project_key: Project key, if there is no epic key.
+
+    Returns:
+        Dictionary with counts, per-item results (key, status created /
+        existing / failed, error) and link results.
+    """
+    try:
+        parsed = load_draft(draft)
+    except ValueError as e:
+        return {'error': str(e)}
+    try:
+        creator = BulkIssueCreator(tenant_jira())
+        return await asyncio.to_thread(creator.run, parsed, epic_key or None, project_key or None)
+    except Exception as e:
+        print(f"Error creating issues from draft: {e}")
+        return {'error': str(e)}
+
+
+__getattr__ = lazy_globals(
+    globals(), create_issues_from_draft_tool=function_tool(tenant_scoped(create_issues_from_draft)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create an approved epic breakdown (JSON or YAML) in Jira")
+    parser.add_argument("draft", help="draft file")
+    parser.add_argument("--epic", help="epic key, if the draft does not name it")
+    parser.add_argument("--project", help="project key, if there is no epic")
+    parser.add_argument("--dry-run", action="store_true", help="only show what would be created")
+    args = parser.parse_args()
+    with open(args.draft) as f:
+        report = BulkIssueCreator(tenant_jira()).run(load_draft(f.read()), args.epic, args.project, args.dry_run)
+    print(json.dumps(report, indent=2))
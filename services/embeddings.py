@@ -0,0 +1,65 @@
+import threading
+from typing import List, Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from utils.config import KB_EMBEDDING_MODEL
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """
+    Return the process-wide sentence embedding model.
+    
+    The HuggingFace model is loaded on first use (importing
+    langchain_huggingface pulls in torch, which is slow) and shared by every
+    caller.
+    """
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                from langchain_huggingface import HuggingFaceEmbeddings
+                _embedder = HuggingFaceEmbeddings(model_name=KB_EMBEDDING_MODEL,
+                                                  encode_kwargs={'normalize_embeddings': True})
+    return _embedder
+
+
+def set_embedder(embedder) -> None:
+    """Replace the shared embedder (any object with embed_documents/embed_query)."""
+    global _embedder
+    _embedder = embedder
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def embed_texts(texts: List[str], batch_size: int = 64, embedder=None) -> np.ndarray:
+    """
+    Embed documents in batches
+    
+    Args:
+        texts: Documents to embed
+        batch_size: Documents per model call
+        embedder: Override for the shared embedder
+        
+    Returns:
+        float32 array of shape (len(texts), dim) with unit-length rows
+    """
+    embedder = embedder or get_embedder()
+    batches = [embedder.embed_documents(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+    if not batches:
+        return np.zeros((0, 0), dtype=np.float32)
+    return _normalize(np.asarray([v for batch in batches for v in batch], dtype=np.float32))
+
+
+def embed_query(text: str, embedder: Optional[object] = None) -> np.ndarray:
+    """Embed a search query as a unit-length float32 vector."""
+    embedder = embedder or get_embedder()
+    return _normalize(np.asarray(embedder.embed_query(text), dtype=np.float32))
@@ -0,0 +1,236 @@
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from services.embeddings import embed_query, embed_texts
+
+ORCHESTRATOR = "central_orchestrator_agent"
+
+# Phrasings that only one agent handles. A message matching rules of more
+# than one agent is a multi-agent ask and goes to the orchestrator.
+INTENT_RULES = {
+    "sprint_manager_agent": [
+        r"\bstand[- ]?ups?\b",
+        r"\bsprint (health|status|progress|summary|report|risks?)\b",
+        r"\bburn[- ]?(down|up)\b",
+        r"\bvelocity\b",
+        r"\bscope creep\b",
+        r"\bblock(ed|ers?)\b",
+        r"\boverdue\b",
+        r"\bworkload\b",
+    ],
+    "epic_decomposer_agent": [
+        r"\b(break|split|decompose|slice)\w*(\s+(down|up))?(\s+[\w'-]+){0,3}?\s+epic\b",
+        r"\bepic\b.*\binto (small |smaller )?(user )?(stories|tasks|subtasks)\b",
+        r"\bepic (break ?down|decomposition)\b",
+        r"\b(user stories|stories|tasks|subtasks) (for|from|out of) ((the|this|that|an?|our)\s+)?epic\b",
+    ],
+    "kb_extractor_agent": [
+        r"\bhave we (ever )?(seen|hit|had|run into|encountered)\b",
+        r"\b(seen|encountered) (this|that|the|an?) (error|exception|bug|crash|issue) before\b",
+        r"\bhow did we (fix|solve|resolve|handle|work around)\b",
+        r"\b(similar|past|previous|earlier|old) (tickets?|bugs?|incidents?)\b",
+        r"\b(?-i:[A-Za-z]+(Error|Exception))\b",
+        r"\btraceback\b",
+    ],
+}
+
+# Wording that makes one part of a compound request depend on another's
+# answer; those need the orchestrator to chain the agents
+DEPENDENCY_PATTERN = re.compile(r"\b(then|based on|using|according to|after that|from (that|those|it|them))\b",
+                                re.IGNORECASE)
+
+# Labelled requests for the embedding classifier, one list per agent. The
+# orchestrator's examples stand for asks no single agent should take.
+INTENT_EXAMPLES = {
+    "sprint_manager_agent": [
+        "give me today's standup",
+        "what did the team finish yesterday and what is in progress",
+        "how is the current sprint going",
+        "are we on track to hit the sprint goal",
+        "who has too many tickets assigned this sprint",
+        "which tasks are late or due soon",
+        "what is blocking the team right now",
+        "summarize the active sprint for the channel",
+        "how many story points are done versus committed",
+        "any risks in this sprint",
+    ],
+    "epic_decomposer_agent": [
+        "turn this epic into user stories",
+        "draft stories and subtasks for the checkout redesign epic",
+        "what small tickets should we create for the onboarding epic",
+        "give me acceptance criteria and estimates for the items of this epic",
+        "plan the work for the payments integration epic",
+        "decompose the feature into INVEST stories",
+        "create a breakdown of the search epic with dependencies",
+        "split the reporting initiative into sprint-sized pieces",
+    ],
+    "kb_extractor_agent": [
+        "did anyone fix a timeout in the payment service before",
+        "what was the workaround for the login redirect loop",
+        "find old tickets about the flaky integration tests",
+        "is there a known fix for this database deadlock",
+        "search the knowledge base for SSO configuration problems",
+        "what did we learn from the last outage",
+        "look up how the team resolved the memory leak in the worker",
+        "which ticket explained the cache invalidation bug",
+        "the build fails with connection refused, any history on that",
+    ],
+    ORCHESTRATOR: [
+        "hello",
+        "what can you do",
+        "help",
+        "write release notes for the sprint",
+        "summarize the sprint and break the next epic into stories",
+        "compare this sprint with the previous one and plan the next",
+        "prepare the sprint review deck with risks and lessons learned",
+        "thanks",
+    ],
+}
+
+
+class IntentRouter:
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None,
+                 examples: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = 0.55, margin: float = 0.08, embedder=None, fan_out: bool = True):
+        """
+        Pick the agent for a request without asking an LLM
+
+        Keyword/regex rules are tried first; a request no rule claims is
+        embedded and compared with labelled example requests. A request
+        matching the rules of several agents, with no wording that chains
+        them, is split across those agents. Anything that is ambiguous,
+        low-confidence or closest to the orchestrator's examples goes to
+        the orchestrator.
+
+        Args:
+            rules: Regexes per agent name (default INTENT_RULES)
+            examples: Example requests per agent name (default INTENT_EXAMPLES)
+            threshold: Minimum cosine similarity to route by embedding
+            margin: Minimum lead over the runner-up agent
+            embedder: Override for the shared embedder
+            fan_out: Whether compound requests may run several agents at once
+        """
+        rules = INTENT_RULES if rules is None else rules
+        self.rules = {agent: [re.compile(p, re.IGNORECASE) for p in patterns] for agent, patterns in rules.items()}
+        self.examples = INTENT_EXAMPLES if examples is None else examples
+        self.threshold = threshold
+        self.margin = margin
+        self.embedder = embedder
+        self.fan_out = fan_out
+        self._groups: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'rule': 0,
+            'embedding': 0,
+            'fanout': 0,
+            'fallback': 0,
+            'routing_seconds': 0.0,
+            'max_routing_seconds': 0.0,
+            'agents': {},
+        }
+
+    def _example_matrix(self) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Embed the examples once; return the row numbers per agent and the matrix."""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    labels = np.array([agent for agent, texts in self.examples.items() for _ in texts])
+                    texts = [text for agent_texts in self.examples.values() for text in agent_texts]
+                    self._groups = {agent: np.flatnonzero(labels == agent) for agent in self.examples}
+                    self._matrix = embed_texts(texts, embedder=self.embedder)
+        return self._groups, self._matrix
+
+    def match_rules(self, text: str) -> List[str]:
+        """Return the agents whose rules match ``text``."""
+        return [agent for agent, patterns in self.rules.items() if any(p.search(text) for p in patterns)]
+
+    def score(self, text: str) -> Dict[str, float]:
+        """
+        Similarity of ``text`` to each agent's examples
+
+        Returns:
+            Mean cosine similarity of the two closest examples, per agent
+        """
+        groups, matrix = self._example_matrix()
+        similarities = matrix @ embed_query(text, embedder=self.embedder)
+        scores = {}
+        for agent, rows in groups.items():
+            closest = np.sort(similarities[rows])[-2:]
+            scores[agent] = float(closest.mean()) if len(closest) else 0.0
+        return scores
+
+    def classify(self, text: str) -> Tuple[List[str], float, str]:
+        """
+        Choose the agent(s) for ``text``
+
+        Returns:
+            (agent names, confidence, method), method being 'rule',
+            'embedding', 'fanout' (several independent agents) or 'fallback'
+        """
+        text = (text or "").strip()
+        if not text:
+            return [ORCHESTRATOR], 0.0, 'fallback'
+        matched = self.match_rules(text)
+        if len(matched) == 1:
+            return matched, 1.0, 'rule'
+        if matched:
+            if self.fan_out and not DEPENDENCY_PATTERN.search(text):
+                return matched, 1.0, 'fanout'
+            return [ORCHESTRATOR], 0.0, 'fallback'
+        try:
+            scores = self.score(text)
+        except Exception as e:
+            print(f"Error scoring intent: {e}")
+            return [ORCHESTRATOR], 0.0, 'fallback'
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return [ORCHESTRATOR], 0.0, 'fallback'
+        (best, best_score), runner_up = ranked[0], ranked[1][1] if len(ranked) > 1 else 0.0
+        if best == ORCHESTRATOR or best_score < self.threshold or best_score - runner_up < self.margin:
+            return [ORCHESTRATOR], best_score, 'fallback'
+        return [best], best_score, 'embedding'
+
+    def route(self, text: str) -> Dict:
+        """
+        Classify ``text`` and record the decision
+
+        Returns:
+            Dictionary with the agent names, confidence, method and routing time
+        """
+        start = time.perf_counter()
+        agents, confidence, method = self.classify(text)
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats[method] += 1
+            self._stats['routing_seconds'] += seconds
+            self._stats['max_routing_seconds'] = max(self._stats['max_routing_seconds'], seconds)
+            for agent in agents:
+                self._stats['agents'][agent] = self._stats['agents'].get(agent, 0) + 1
+        return {'agents': agents, 'confidence': round(confidence, 3), 'method': method, 'seconds': seconds}
+
+    def snapshot(self) -> Dict:
+        """
+        Get routing counters
+
+        Returns:
+            Dictionary with requests per method and agent, average and max
+            routing time, and orchestrator LLM calls saved (a direct route
+            skips the orchestrator's tool-choice call and its call to
+            restate the sub-agent's answer; a fan-out replaces at least the
+            orchestrator's second tool-choice call)
+        """
+        with self._lock:
+            stats = dict(self._stats, agents=dict(self._stats['agents']))
+        direct = stats['rule'] + stats['embedding']
+        stats['llm_calls_saved'] = 2 * direct + stats['fanout']
+        stats['avg_routing_ms'] = round(1000 * stats.pop('routing_seconds') / stats['requests'], 3) if stats['requests'] else 0.0
+        stats['max_routing_ms'] = round(1000 * stats.pop('max_routing_seconds'), 3)
+        return stats
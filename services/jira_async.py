@@ -0,0 +1,557 @@
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import httpx
+from utils.config import JIRA_POOL_MAXSIZE, JIRA_TIMEOUT, JIRA_MAX_CONCURRENCY
+from services.jira_cache import CacheEntry, ResponseCache, DEFAULT_TTLS, WRITE_INVALIDATED_ENDPOINTS, cache_key
+from services.jira_models import IssueRecord, ISSUE_FIELDS, ISSUE_DETAIL_FIELDS, issue_create_payload
+from services.rate_limit import (
+    RETRYABLE_STATUSES, THROTTLED_STATUSES, RateLimitExceeded, RequestScheduler, parse_retry_after,
+)
+from services.telemetry import add_event, span, url_template
+
+# Above this many keys, get_issues_details uses one JQL search per chunk
+# instead of one GET per issue.
+BATCH_SEARCH_THRESHOLD = 4
+# Jira caps `key in (...)` searches at 100 results per page
+BATCH_SEARCH_CHUNK = 100
+
+
+class AsyncConnectionPool:
+    """
+    Keep-alive httpx client shared by the AsyncJiraAPI instances of several
+    tenants on one Jira site; each passes its own credentials per request.
+
+    Pooled connections belong to one event loop, so the client is created on
+    first use and rebuilt if it is used from a different loop.
+    """
+
+    def __init__(self, pool_maxsize: int = JIRA_POOL_MAXSIZE, timeout: float = JIRA_TIMEOUT):
+        """
+        Args:
+            pool_maxsize: Maximum number of keep-alive connections
+            timeout: Request timeout in seconds
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+
+
+class AsyncJiraAPI:
+    def __init__(self, base_url: str, email: str, api_token: str,
+                 max_concurrency: int = JIRA_MAX_CONCURRENCY,
+                 pool_maxsize: int = JIRA_POOL_MAXSIZE,
+                 timeout: float = JIRA_TIMEOUT,
+                 cache: Optional[ResponseCache] = None,
+                 cache_ttls: Optional[Dict[str, float]] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 pool: Optional[AsyncConnectionPool] = None):
+        """
+        Initialize the asyncio Jira API client
+        
+        Mirrors JiraAPI, but every method is a coroutine so ADK tool calls do
+        not block the event loop. At most ``max_concurrency`` requests are in
+        flight at once; the rest wait on a semaphore. With a scheduler, its
+        rate limit, concurrency cap and retry policy apply instead.
+        
+        Args:
+            base_url: Your Jira instance URL (e.g., 'https://yourcompany.atlassian.net')
+            email: Your Jira account email
+            api_token: Your Jira API token
+            max_concurrency: Maximum number of concurrent requests
+            pool_maxsize: Maximum number of keep-alive connections
+            timeout: Request timeout in seconds
+            cache: Response cache for read-only endpoints; may be shared with a JiraAPI
+            cache_ttls: Per-endpoint TTL overrides in seconds (see DEFAULT_TTLS)
+            scheduler: Shared rate limiter / retry scheduler, usually the one
+                       the sync JiraAPI uses
+            pool: Connections shared with other tenants' clients on the same site
+                  (default: a client of this instance's own)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.account = email
+        self.auth = httpx.BasicAuth(email, api_token)
+        self.headers = {
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Content-Type': 'application/json'
+        }
+        self.timeout = timeout
+        self.limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        self.cache = cache
+        self.cache_ttls = dict(DEFAULT_TTLS, **(cache_ttls or {}))
+        self.scheduler = scheduler
+        self.pool = pool
+        self.mirror = None
+        self.mirror_max_age = 0.0
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to one event loop, so the client (and the
+        # local semaphore) are created on first use and rebuilt if the caller
+        # runs on a different loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._client = None
+        if self.pool is not None:
+            return self.pool.client()
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(auth=self.auth, headers=self.headers, timeout=self.timeout,
+                                             limits=self.limits)
+        return self._client
+
+    def attach_mirror(self, mirror, max_age: float) -> None:
+        """Serve reads from a local JiraMirror while it is fresh (see JiraAPI.attach_mirror)."""
+        self.mirror = mirror
+        self.mirror_max_age = max_age
+
+    def _mirror_ready(self) -> bool:
+        return self.mirror is not None and self.mirror.is_fresh(self.mirror_max_age)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _request(self, method: str, url: str, idempotent: bool = True, **kwargs) -> httpx.Response:
+        """
+        Send one request through the scheduler (or the local semaphore).
+        Non-``idempotent`` requests are only retried on a 429.
+        
+        Raises:
+            RateLimitExceeded: if Jira still answers 429 after every retry
+        """
+        if self.pool is not None:
+            # The shared client carries no credentials of its own
+            kwargs['auth'] = self.auth
+            kwargs['headers'] = dict(self.headers, **(kwargs.get('headers') or {}))
+        with span(f"jira {method}") as current:
+            if self.scheduler is None:
+                client = self.client
+                async with self._semaphore:
+                    response = await client.request(method, url, **kwargs)
+            else:
+                retry_exceptions = (httpx.TransportError,) if idempotent else ()
+                response = await self.scheduler.send_async(
+                    lambda: self.client.request(method, url, **kwargs), retry_exceptions,
+                    retry_statuses=RETRYABLE_STATUSES if idempotent else THROTTLED_STATUSES)
+            if current.is_recording():
+                current.set_attributes({
+                    'http.request.method': method,
+                    'url.template': url_template(url),
+                    'http.response.status_code': response.status_code,
+                    'http.request.body.size': len(kwargs.get('content') or ''),
+                    'http.response.body.size': response.num_bytes_downloaded,
+                })
+            if response.status_code == 429:
+                raise RateLimitExceeded(
+                    f"Jira rate limit exceeded for {method} {url}; try again shortly",
+                    parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    async def _get_json(self, endpoint: str, url: str, params: Optional[Dict] = None,
+                        payload: Optional[Dict] = None):
+        """
+        Fetch a read-only endpoint through the response cache (see JiraAPI._get_json).
+        
+        Raises:
+            httpx.HTTPError: on transport or HTTP errors
+        """
+        method = 'POST' if payload is not None else 'GET'
+        content = json.dumps(payload) if payload is not None else None
+        if self.cache is None:
+            response = await self._request(method, url, params=params, content=content)
+            response.raise_for_status()
+            return response.json()
+
+        key = cache_key(endpoint, url, params, payload, self.account)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            add_event('jira.cache_hit', {'endpoint': endpoint})
+            return entry.value
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        response = await self._request(method, url, params=params, content=content, headers=headers)
+        expires_at = time.time() + self.cache_ttls.get(endpoint, 0)
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats.incr('revalidations')
+            entry.expires_at = expires_at
+            self.cache.set(key, entry)
+            return entry.value
+
+        response.raise_for_status()
+        value = response.json()
+        self.cache.set(key, CacheEntry(value, expires_at, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified')))
+        return value
+
+    async def get_board_data(self, board_id: str) -> Dict:
+        """
+        Get board information
+        
+        Args:
+            board_id: The ID of the board
+            
+        Returns:
+            Dictionary containing board data
+        """
+        url = f"{self.base_url}/rest/agile/1.0/board/{board_id}"
+        try:
+            return await self._get_json('board', url)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching board data: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error fetching board data: {e}")
+            return {}
+
+    async def get_board_issues(self, board_id: str, max_results: int = 50,
+                               start_at: int = 0, jql: str = "", fields: Optional[List[str]] = None) -> Dict:
+        """
+        Get issues from a specific board
+        
+        Args:
+            board_id: The ID of the board
+            max_results: Maximum number of results to return (default: 50)
+            start_at: Starting index for pagination (default: 0)
+            jql: JQL query to filter results (optional)
+            fields: List of fields to include in response (optional)
+            
+        Returns:
+            Dictionary containing issues data
+        """
+        url = f"{self.base_url}/rest/agile/1.0/board/{board_id}/issue"
+        params = {'maxResults': max_results, 'startAt': start_at}
+        if jql:
+            params['jql'] = jql
+        if fields:
+            params['fields'] = ','.join(fields)
+        try:
+            return await self._get_json('board_issues', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching board issues: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error fetching board issues: {e}")
+            return {}
+
+    async def get_all_boards(self, max_results: int = 50) -> List[Dict]:
+        """
+        Get all boards accessible to the user
+        
+        Args:
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of board dictionaries
+        """
+        url = f"{self.base_url}/rest/agile/1.0/board"
+        try:
+            data = await self._get_json('boards', url, {'maxResults': max_results})
+            return data.get('values', [])
+        except (RateLimitExceeded, httpx.HTTPError) as e:
+            print(f"Error fetching boards: {e}")
+            return []
+
+    async def get_sprints(self, board_id: str, state: Optional[str] = None) -> List[Dict]:
+        """
+        Get sprints for a specific board, optionally filtering by state.
+        
+        Args:
+            board_id: The ID of the board.
+            state: The state to filter sprints by (e.g., 'active', 'closed', 'future').
+            
+        Returns:
+            List of sprint dictionaries.
+        """
+        try:
+            return await self._fetch_sprints(board_id, state)
+        except (RateLimitExceeded, httpx.HTTPError) as e:
+            print(f"Error fetching sprints: {e}")
+            return []
+
+    async def _fetch_sprints(self, board_id: str, state: Optional[str] = None) -> List[Dict]:
+        url = f"{self.base_url}/rest/agile/1.0/board/{board_id}/sprint"
+        params = {'state': state} if state else {}
+        return (await self._get_json('sprints', url, params)).get('values', [])
+
+    async def get_active_sprint(self, board_id: str) -> Optional[Dict]:
+        """
+        Get the active sprint for a specific board.
+        
+        Args:
+            board_id: The ID of the board.
+            
+        Returns:
+            Dictionary containing active sprint data, None if not found, or
+            an ``error`` entry if Jira is rate limiting us.
+        """
+        if self._mirror_ready():
+            sprint = self.mirror.get_active_sprint(board_id)
+            if sprint:
+                return sprint
+        try:
+            sprints = await self._fetch_sprints(board_id, state='active')
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching sprints: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error fetching sprints: {e}")
+            return None
+        return sprints[0] if sprints else None
+
+    async def get_sprint_issues(self, sprint_id: str, max_results: int = 50, start_at: int = 0,
+                                fields: Optional[List[str]] = None) -> Dict:
+        """
+        Get issues from a specific sprint.
+        
+        Args:
+            sprint_id: The ID of the sprint.
+            max_results: Maximum number of results to return.
+            start_at: Starting index for pagination.
+            fields: List of fields to include in response (optional).
+            
+        Returns:
+            Dictionary containing sprint issues data.
+        """
+        url = f"{self.base_url}/rest/agile/1.0/sprint/{sprint_id}/issue"
+        params = {'maxResults': max_results, 'startAt': start_at}
+        if fields:
+            params['fields'] = ','.join(fields)
+        try:
+            return await self._get_json('sprint_issues', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching sprint issues: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error fetching sprint issues: {e}")
+            return {}
+
+    async def get_issue_details(self, issue_key: str, fields: Optional[List[str]] = None) -> Dict:
+        """
+        Get detailed information about a specific issue
+        
+        Args:
+            issue_key: The key of the issue (e.g., 'PROJ-123')
+            fields: List of fields to include in response (optional)
+            
+        Returns:
+            Dictionary containing issue details
+        """
+        if self._mirror_ready():
+            issue = self.mirror.get_issue(issue_key)
+            if issue:
+                return issue
+
+        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+        params = {'fields': ','.join(fields)} if fields else {}
+        try:
+            return await self._get_json('issue', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching issue details: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error fetching issue details: {e}")
+            return {}
+
+    async def search_issues(self, jql: str, max_results: int = 50, fields: Optional[List[str]] = None,
+                            start_at: int = 0) -> Dict:
+        """
+        Search for issues using JQL
+        
+        Args:
+            jql: JQL query string
+            max_results: Maximum number of results to return
+            fields: List of fields to include in response
+            start_at: Starting index for pagination (default: 0)
+            
+        Returns:
+            Dictionary containing search results
+        """
+        url = f"{self.base_url}/rest/api/3/search"
+        payload = {'jql': jql, 'maxResults': max_results, 'startAt': start_at}
+        if fields:
+            payload['fields'] = fields
+        try:
+            return await self._get_json('search', url, payload=payload)
+        except RateLimitExceeded as e:
+            print(f"Rate limited searching issues: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error searching issues: {e}")
+            return {}
+
+    async def create_issue(self, project_key: str, summary: str, description: str, issuetype_name: str) -> Dict:
+        """
+        Create a new issue in Jira.
+
+        Args:
+            project_key: The key of the project (e.g., 'PROJ').
+            summary: The summary/title of the issue.
+            description: The description of the issue.
+            issuetype_name: The name of the issue type (e.g., 'Task', 'Story').
+
+        Returns:
+            Dictionary containing the created issue data, or {} on failure.
+        """
+        url = f"{self.base_url}/rest/api/3/issue"
+        payload = issue_create_payload(project_key, summary, description, issuetype_name)
+        try:
+            response = await self._request('POST', url, idempotent=False, content=json.dumps(payload))
+            response.raise_for_status()
+            if self.cache is not None:
+                for endpoint in WRITE_INVALIDATED_ENDPOINTS:
+                    self.cache.invalidate(f"{endpoint}:")
+            return response.json()
+        except RateLimitExceeded as e:
+            print(f"Rate limited creating issue: {e}")
+            return {'error': str(e)}
+        except httpx.HTTPError as e:
+            print(f"Error creating issue: {e}")
+            return {}
+
+    async def list_sprint_issues(self, sprint_id: str, raw: bool = False) -> Dict:
+        """
+        List every issue in a sprint in compact form.
+        
+        The first page reveals the total; the remaining pages are fetched
+        concurrently. A fresh local mirror answers without calling Jira.
+        
+        Args:
+            sprint_id: The ID of the sprint.
+            raw: Return the unprojected Jira issue JSON instead (much larger).
+            
+        Returns:
+            Dictionary with the sprint ID, total issue count and the issues,
+            or with an ``error`` if any page could not be fetched.
+        """
+        mirrored = self.mirror.get_sprint_issues(sprint_id) if self._mirror_ready() else []
+        if mirrored:
+            issues = mirrored if raw else [IssueRecord.from_jira(issue).to_dict() for issue in mirrored]
+            return {'sprint_id': sprint_id, 'total': len(issues), 'issues': issues}
+
+        fields = None if raw else ISSUE_FIELDS
+        first = await self.get_sprint_issues(sprint_id, fields=fields)
+        pages = [first]
+        # A copy: the pages are the response cache's objects, shared with every other caller
+        issues = list(first.get('issues', []))
+        total = first.get('total', len(issues))
+        if issues:
+            step = len(issues)
+            pages += await asyncio.gather(*(
+                self.get_sprint_issues(sprint_id, step, start_at, fields)
+                for start_at in range(step, total, step)
+            ))
+            for page in pages[1:]:
+                issues.extend(page.get('issues', []))
+        errors = [page['error'] for page in pages if 'error' in page]
+        if errors:
+            return {'sprint_id': sprint_id, 'error': errors[0]}
+        # A failed page comes back as {}; never pass a partial sprint off as the whole one
+        failed = sum(not isinstance(page.get('issues'), list) for page in pages)
+        if failed or len(issues) < total:
+            return {'sprint_id': sprint_id,
+                    'error': f"Incomplete results: got {len(issues)} of {total} issues ({failed} pages failed)"}
+        if not raw:
+            issues = [IssueRecord.from_jira(issue).to_dict() for issue in issues]
+        return {'sprint_id': sprint_id, 'total': len(issues), 'issues': issues}
+
+    async def get_issue_summary(self, issue_key: str, raw: bool = False) -> Dict:
+        """
+        Get a compact view of a single issue, including its description text.
+        
+        Args:
+            issue_key: The key of the issue (e.g., 'PROJ-123').
+            raw: Return the unprojected Jira issue JSON instead (much larger).
+            
+        Returns:
+            Dictionary containing the issue, or {} if it could not be fetched.
+        """
+        if raw:
+            return await self.get_issue_details(issue_key)
+        issue = await self.get_issue_details(issue_key, fields=ISSUE_DETAIL_FIELDS)
+        if not issue or 'error' in issue:
+            return issue
+        return IssueRecord.from_jira(issue).to_dict()
+
+    async def get_issues_details(self, issue_keys: List[str], raw: bool = False) -> Dict:
+        """
+        Get several issues at once, in compact form.
+        
+        Small batches are fetched as parallel single-issue requests; larger
+        ones as JQL ``key in (...)`` searches of up to 100 keys each.
+        
+        Args:
+            issue_keys: Issue keys to fetch (e.g., ['PROJ-1', 'PROJ-2']).
+            raw: Return the unprojected Jira issue JSON instead (much larger).
+            
+        Returns:
+            Dictionary with the found ``issues`` (in request order) and the
+            ``missing`` keys that could not be fetched.
+        """
+        keys = list(dict.fromkeys(key.strip().upper() for key in issue_keys if key.strip()))
+        fields = None if raw else ISSUE_DETAIL_FIELDS
+        found = []
+        if self._mirror_ready():
+            found = [issue for issue in map(self.mirror.get_issue, keys) if issue]
+        remaining = [key for key in keys if key not in {issue['key'] for issue in found}]
+        if len(remaining) < BATCH_SEARCH_THRESHOLD:
+            found += await asyncio.gather(*(self.get_issue_details(key, fields) for key in remaining))
+        else:
+            chunks = [remaining[i:i + BATCH_SEARCH_CHUNK] for i in range(0, len(remaining), BATCH_SEARCH_CHUNK)]
+            pages = await asyncio.gather(*(self._search_keys(chunk, fields) for chunk in chunks))
+            found += [issue for page in pages for issue in page]
+
+        by_key = {issue['key']: issue for issue in found if issue and 'key' in issue}
+        issues = [by_key[key] for key in keys if key in by_key]
+        if not raw:
+            issues = [IssueRecord.from_jira(issue).to_dict() for issue in issues]
+        result = {'issues': issues, 'missing': [key for key in keys if key not in by_key]}
+        errors = [issue['error'] for issue in found if issue and 'error' in issue]
+        if errors:
+            result['error'] = errors[0]
+        return result
+
+    async def _search_keys(self, keys: List[str], fields: Optional[List[str]]) -> List[Dict]:
+        url = f"{self.base_url}/rest/api/3/search"
+        # validateQuery=warn keeps one unknown key from failing the whole search
+        payload = {'jql': f"key in ({', '.join(keys)})", 'maxResults': len(keys),
+                   'startAt': 0, 'validateQuery': 'warn'}
+        if fields:
+            payload['fields'] = fields
+        try:
+            data = await self._get_json('search', url, payload=payload)
+            return data.get('issues', [])
+        except RateLimitExceeded as e:
+            print(f"Rate limited searching issues by key: {e}")
+            return [{'error': str(e)}]
+        except httpx.HTTPError as e:
+            print(f"Error searching issues by key: {e}")
+            return []
@@ -0,0 +1,218 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Default time-to-live (seconds) per cached JiraAPI endpoint
+DEFAULT_TTLS = {
+    'board': 3600,
+    'boards': 3600,
+    'sprints': 60,
+    'sprint': 60,
+    'sprint_issues': 30,
+    'board_issues': 30,
+    'issue': 30,
+    'search': 30,
+}
+
+# Endpoints whose cached results a newly created issue can change; boards
+# and sprint metadata are unaffected.
+WRITE_INVALIDATED_ENDPOINTS = ('board_issues', 'sprint_issues', 'search')
+
+
+def cache_key(endpoint: str, url: str, params: Optional[Dict] = None, payload: Optional[Dict] = None,
+              account: str = "") -> str:
+    """
+    Build the cache key for a request; keys are prefixed with the endpoint name.
+
+    ``account`` keeps apart what different Jira accounts see through one
+    shared cache (tenants on the same account share entries).
+    """
+    key = f"{endpoint}:{url}?{json.dumps(params or {}, sort_keys=True)}"
+    if payload is not None:
+        key += json.dumps(payload, sort_keys=True)
+    if account:
+        key += f"#{account}"
+    return key
+
+
+class CacheEntry:
+    """A cached Jira response plus the validators needed to revalidate it."""
+
+    __slots__ = ('value', 'expires_at', 'etag', 'last_modified')
+
+    def __init__(self, value, expires_at: float, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {'hits': 0, 'misses': 0, 'evictions': 0,
+                       'revalidations': 0, 'invalidations': 0}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counts)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+class ResponseCache:
+    """
+    Interface for JiraAPI response caches.
+    
+    Keys are strings prefixed with the endpoint name (e.g. ``sprint_issues:``)
+    so whole endpoints can be dropped with ``invalidate``. ``get`` returns
+    stale entries too, so the caller can revalidate them with their ETag or
+    Last-Modified validator; only fresh entries count as hits. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, prefix: str = "") -> int:
+        """Drop every entry whose key starts with ``prefix``; returns the count."""
+        raise NotImplementedError
+
+    def _count_lookup(self, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        self.stats.incr('hits' if entry is not None and entry.fresh else 'misses')
+        return entry
+
+
+class LRUCache(ResponseCache):
+    """In-process LRU cache bounded by entry count."""
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return self._count_lookup(entry)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.incr('evictions', evicted)
+
+    def invalidate(self, prefix: str = "") -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        self.stats.incr('invalidations', len(keys))
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk cache backed by SQLite, so cached responses survive restarts.
+    
+    Least-recently-used entries are evicted once ``maxsize`` is exceeded.
+    """
+
+    def __init__(self, path: str, maxsize: int = 10000):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jira_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL,"
+            " etag TEXT, last_modified TEXT, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jira_cache_accessed ON jira_cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, etag, last_modified FROM jira_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE jira_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        entry = CacheEntry(json.loads(row[0]), row[1], row[2], row[3]) if row else None
+        return self._count_lookup(entry)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jira_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(entry.value), entry.expires_at, entry.etag, entry.last_modified, time.time()),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM jira_cache").fetchone()[0] - self.maxsize
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM jira_cache WHERE key IN "
+                    "(SELECT key FROM jira_cache ORDER BY accessed_at LIMIT ?)", (overflow,)
+                )
+        if overflow > 0:
+            self.stats.incr('evictions', overflow)
+
+    def invalidate(self, prefix: str = "") -> int:
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self._lock:
+            count = self._conn.execute(
+                "DELETE FROM jira_cache WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',)
+            ).rowcount
+        self.stats.incr('invalidations', count)
+        return count
+
+
+def build_cache(backend: str, path: str = "jira_cache.sqlite3", maxsize: int = 1024) -> Optional[ResponseCache]:
+    """
+    Create a response cache from configuration
+    
+    Args:
+        backend: 'memory', 'sqlite' or 'none'
+        path: Database file for the sqlite backend
+        maxsize: Maximum number of cached responses
+        
+    Returns:
+        ResponseCache instance, or None when caching is disabled
+    """
+    backend = (backend or 'none').lower()
+    if backend == 'memory':
+        return LRUCache(maxsize)
+    if backend == 'sqlite':
+        return SQLiteCache(path, maxsize)
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown Jira cache backend: {backend!r}")
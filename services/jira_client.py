@@ -1,31 +1,329 @@
 import requests
 import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from utils.config import JIRA_BASE_URL, EMAIL, API_TOKEN
-from google.adk.tools import FunctionTool
+from utils.config import (
+    JIRA_BASE_URL, EMAIL, API_TOKEN, JIRA_BOARD_ID,
+    JIRA_POOL_CONNECTIONS, JIRA_POOL_MAXSIZE, JIRA_TIMEOUT,
+    JIRA_CACHE_BACKEND, JIRA_CACHE_PATH, JIRA_CACHE_MAXSIZE,
+    JIRA_RATE_LIMIT, JIRA_RATE_BURST, JIRA_MAX_CONCURRENCY,
+    JIRA_MAX_RETRIES, JIRA_BACKOFF_BASE, JIRA_BACKOFF_MAX,
+    JIRA_MIRROR_PATH, JIRA_MIRROR_JQL, JIRA_MIRROR_BOARDS, JIRA_MIRROR_MAX_AGE, JIRA_MIRROR_SYNC_INTERVAL,
+)
+from services.jira_cache import (
+    CacheEntry, ResponseCache, DEFAULT_TTLS, WRITE_INVALIDATED_ENDPOINTS, build_cache, cache_key,
+)
+from services.jira_async import AsyncJiraAPI
+from services.rate_limit import (
+    RETRYABLE_STATUSES, THROTTLED_STATUSES, RateLimitExceeded, RequestScheduler, RetryPolicy, parse_retry_after,
+)
+from services.jira_mirror import JiraMirror
+from services.jira_models import IssueRecord, ISSUE_FIELDS, ISSUE_DETAIL_FIELDS, issue_create_payload
+from services.telemetry import add_event, metrics, span, url_template
+from services.tool_budget import budgeted
+from services.tenants import JiraSite, tenant_method, tenant_registry
+from services.lazy import function_tool, lazy_globals
+
+BOARD_ID = JIRA_BOARD_ID  # Board of the default tenant; other teams' boards come from TENANTS_FILE
+
+
+class IncompleteResultsError(Exception):
+    """Raised when a page of a paginated Jira listing is missing or cut short."""
+
+
+def _page_issues(page: Dict, start_at: int, step: int, total: int) -> List[Dict]:
+    """
+    The issues of one page of a listing, checked for completeness
+
+    A failed request comes back as ``{}`` (or with an ``error``), which must
+    not pass for the end of the data: callers such as the mirror's full sync
+    treat every issue they were not given as deleted.
+
+    Raises:
+        RateLimitExceeded: if Jira kept throttling the page
+        IncompleteResultsError: if the page has no issue list, or fewer
+            issues than requested while ``total`` says more remain
+    """
+    if 'error' in page:
+        raise RateLimitExceeded(page['error'])
+    issues = page.get('issues')
+    if not isinstance(issues, list):
+        raise IncompleteResultsError(f"Jira returned no page of issues at {start_at}")
+    if len(issues) < step and start_at + len(issues) < total:
+        raise IncompleteResultsError(
+            f"Jira returned {len(issues)} issues at {start_at}, short of {min(step, total - start_at)} (of {total})")
+    return issues
+
+
+class JiraRequestStats:
+    """
+    Thread-safe request counters for a JiraAPI session.
+
+    Latency is taken from ``response.elapsed`` (time to response headers), so
+    it is comparable between a cold connection and a reused keep-alive one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+
+    def record(self, response: requests.Response, *args, **kwargs) -> None:
+        """Response hook registered on the session."""
+        elapsed = response.elapsed.total_seconds()
+        with self._lock:
+            self.requests += 1
+            if response.status_code >= 400:
+                self.errors += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'avg_latency_ms': round(1000 * self.total_seconds / self.requests, 3) if self.requests else 0.0,
+                'max_latency_ms': round(1000 * self.max_seconds, 3),
+            }
 
-BOARD_ID = "1"  # Your board ID
 
 class JiraAPI:
-    def __init__(self, base_url: str, email: str, api_token: str):
+    def __init__(self, base_url: str, email: str, api_token: str,
+                 pool_connections: int = JIRA_POOL_CONNECTIONS,
+                 pool_maxsize: int = JIRA_POOL_MAXSIZE,
+                 timeout: float = JIRA_TIMEOUT,
+                 cache: Optional[ResponseCache] = None,
+                 cache_ttls: Optional[Dict[str, float]] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 adapter: Optional[HTTPAdapter] = None):
         """
         Initialize Jira API client
         
+        All requests go through one ``requests.Session`` so TCP/TLS connections
+        are kept alive and reused across calls (and across every FunctionTool
+        built from the same client). Clients of several tenants on one site
+        can share a connection pool by passing the same ``adapter``.
+        
         Args:
             base_url: Your Jira instance URL (e.g., 'https://yourcompany.atlassian.net')
             email: Your Jira account email
             api_token: Your Jira API token (generate from Account Settings > Security > API tokens)
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of keep-alive connections per host
+            timeout: Request timeout in seconds (connect and read)
+            cache: Response cache for read-only endpoints (None disables caching)
+            cache_ttls: Per-endpoint TTL overrides in seconds (see DEFAULT_TTLS)
+            scheduler: Shared rate limiter / retry scheduler (None sends directly)
+            adapter: Connection pool shared with other clients (default: a new one
+                     sized by ``pool_connections`` / ``pool_maxsize``)
         """
         self.base_url = base_url.rstrip('/')
+        self.account = email
         self.auth = HTTPBasicAuth(email, api_token)
         self.headers = {
             'Accept': 'application/json',
-            'Content-Type': 'application/json'
+            'Accept-Encoding': 'gzip, deflate',
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
         }
+        self.timeout = timeout
+        self.stats = JiraRequestStats()
+
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        self._adapter = adapter or HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        self.session.hooks['response'].append(self.stats.record)
+
+        self.cache = cache
+        self.cache_ttls = dict(DEFAULT_TTLS, **(cache_ttls or {}))
+        self.scheduler = scheduler
+        self.mirror: Optional[JiraMirror] = None
+        self.mirror_max_age = 0.0
+
+    def get_request_stats(self) -> Dict:
+        """
+        Get latency and connection-reuse counters for this client
+        
+        Returns:
+            Dictionary with request count, latency figures, the number of
+            TCP connections opened and how many requests reused one
+        """
+        stats = self.stats.snapshot()
+        connections = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pooled_requests += pool.num_requests
+        stats['connections_opened'] = connections
+        stats['connections_reused'] = max(pooled_requests - connections, 0)
+        return stats
+
+    def attach_mirror(self, mirror: JiraMirror, max_age: float) -> None:
+        """
+        Serve issue, sprint-issue and active-sprint reads from a local mirror
+        
+        Args:
+            mirror: JiraMirror kept current by incremental syncs
+            max_age: Freshness bound in seconds; older mirrors are bypassed
+        """
+        self.mirror = mirror
+        self.mirror_max_age = max_age
+
+    def _mirror_ready(self) -> bool:
+        return self.mirror is not None and self.mirror.is_fresh(self.mirror_max_age)
+
+    def get_throttle_stats(self) -> Dict:
+        """
+        Get rate-limiter and retry counters
+        
+        Returns:
+            Dictionary with attempts, throttled responses, retries, give-ups,
+            time spent waiting and peak concurrency
+        """
+        return self.scheduler.snapshot() if self.scheduler else {}
+
+    def get_cache_stats(self) -> Dict:
+        """
+        Get response cache counters
+        
+        Returns:
+            Dictionary with hits, misses, evictions, revalidations and invalidations
+        """
+        return self.cache.stats.snapshot() if self.cache else {}
+
+    def invalidate_cache(self, prefix: str = "") -> int:
+        """
+        Drop cached responses whose key starts with ``prefix``
+        
+        Args:
+            prefix: Cache key prefix, e.g. 'sprint_issues:' (default: everything)
+            
+        Returns:
+            Number of entries dropped
+        """
+        return self.cache.invalidate(prefix) if self.cache else 0
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def _send(self, method: str, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        """
+        Send one request through the scheduler (rate limit, concurrency cap, retries).
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            idempotent: Whether connection errors and gateway errors (502/503/504)
+                        may be retried; a 429 always is
+            **kwargs: Passed to ``requests.Session.request``
+            
+        Returns:
+            The final response
+            
+        Raises:
+            RateLimitExceeded: if Jira still answers 429 after every retry
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        with span(f"jira {method}") as current:
+            if self.scheduler is None:
+                response = self.session.request(method, url, **kwargs)
+            else:
+                retry_exceptions = (requests.exceptions.ConnectionError, requests.exceptions.Timeout) if idempotent else ()
+                response = self.scheduler.send(lambda: self.session.request(method, url, **kwargs), retry_exceptions,
+                                               retry_statuses=RETRYABLE_STATUSES if idempotent else THROTTLED_STATUSES)
+            if current.is_recording():
+                current.set_attributes({
+                    'http.request.method': method,
+                    'url.template': url_template(url),
+                    'http.response.status_code': response.status_code,
+                    'http.request.body.size': len(kwargs.get('data') or ''),
+                    'http.response.body.size': int(response.headers.get('Content-Length') or len(response.content)),
+                })
+            if response.status_code == 429:
+                raise RateLimitExceeded(
+                    f"Jira rate limit exceeded for {method} {url}; try again shortly",
+                    parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    def _get_json(self, endpoint: str, url: str, params: Optional[Dict] = None,
+                  payload: Optional[Dict] = None, use_cache: bool = True):
+        """
+        Fetch a read-only endpoint through the response cache.
+        
+        Fresh entries are served without a request. Stale entries that carry
+        an ETag or Last-Modified validator are revalidated with a conditional
+        request, and a 304 refreshes them in place. Without a cache this is a
+        plain GET (or POST when ``payload`` is given).
+        
+        Args:
+            endpoint: Endpoint name, used as cache key prefix and TTL lookup
+            url: Request URL
+            params: Query parameters
+            payload: JSON body; switches the request to POST (used by search)
+            use_cache: Set False to bypass the cache for this request
+            
+        Returns:
+            Decoded JSON response
+            
+        Raises:
+            RateLimitExceeded: if Jira keeps throttling the request
+            requests.exceptions.RequestException: on transport or HTTP errors
+        """
+        method = 'POST' if payload is not None else 'GET'
+        data = json.dumps(payload) if payload is not None else None
+        if self.cache is None or not use_cache:
+            response = self._send(method, url, params=params, data=data)
+            response.raise_for_status()
+            return response.json()
+
+        key = cache_key(endpoint, url, params, payload, self.account)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            add_event('jira.cache_hit', {'endpoint': endpoint})
+            return entry.value
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        response = self._send(method, url, params=params, data=data, headers=headers)
+        expires_at = time.time() + self.cache_ttls.get(endpoint, 0)
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats.incr('revalidations')
+            entry.expires_at = expires_at
+            self.cache.set(key, entry)
+            return entry.value
+
+        response.raise_for_status()
+        value = response.json()
+        self.cache.set(key, CacheEntry(value, expires_at, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified')))
+        return value
     
     def get_board_data(self, board_id: str) -> Dict:
         """
@@ -40,15 +338,16 @@ class JiraAPI:
         url = f"{self.base_url}/rest/agile/1.0/board/{board_id}"
         
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('board', url)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching board data: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error fetching board data: {e}")
             return {}
     
     def get_board_issues(self, board_id: str, max_results: int = 50, 
-                        start_at: int = 0, jql: str = "") -> Dict:
+                        start_at: int = 0, jql: str = "", fields: Optional[List[str]] = None) -> Dict:
         """
         Get issues from a specific board
         
@@ -57,6 +356,7 @@ class JiraAPI:
             max_results: Maximum number of results to return (default: 50)
             start_at: Starting index for pagination (default: 0)
             jql: JQL query to filter results (optional)
+            fields: List of fields to include in response (optional)
             
         Returns:
             Dictionary containing issues data
@@ -70,11 +370,14 @@ class JiraAPI:
         
         if jql:
             params['jql'] = jql
+        if fields:
+            params['fields'] = ','.join(fields)
             
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('board_issues', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching board issues: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error fetching board issues: {e}")
             return {}
@@ -93,11 +396,9 @@ class JiraAPI:
         params = {'maxResults': max_results}
         
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('boards', url, params)
             return data.get('values', [])
-        except requests.exceptions.RequestException as e:
+        except (RateLimitExceeded, requests.exceptions.RequestException) as e:
             print(f"Error fetching boards: {e}")
             return []
     
@@ -112,19 +413,18 @@ class JiraAPI:
         Returns:
             List of sprint dictionaries.
         """
+        try:
+            return self._fetch_sprints(board_id, state)
+        except (RateLimitExceeded, requests.exceptions.RequestException) as e:
+            print(f"Error fetching sprints: {e}")
+            return []
+
+    def _fetch_sprints(self, board_id: str, state: Optional[str] = None) -> List[Dict]:
         url = f"{self.base_url}/rest/agile/1.0/board/{board_id}/sprint"
         params = {}
         if state:
             params['state'] = state
-            
-        try:
-            response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('values', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching sprints: {e}")
-            return []
+        return self._get_json('sprints', url, params).get('values', [])
     
     def get_active_sprint(self, board_id: str) -> Optional[Dict]:
         """
@@ -134,12 +434,49 @@ class JiraAPI:
             board_id: The ID of the board.
             
         Returns:
-            Dictionary containing active sprint data, or None if not found.
+            Dictionary containing active sprint data, None if not found, or
+            an ``error`` entry if Jira is rate limiting us.
         """
-        sprints = self.get_sprints(board_id, state='active')
+        if self._mirror_ready():
+            sprint = self.mirror.get_active_sprint(board_id)
+            if sprint:
+                return sprint
+        try:
+            sprints = self._fetch_sprints(board_id, state='active')
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching sprints: {e}")
+            return {'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching sprints: {e}")
+            return None
         return sprints[0] if sprints else None
     
-    def get_sprint_issues(self, sprint_id: str, max_results: int = 50, start_at: int = 0) -> Dict:
+    def get_sprint(self, sprint_id: str) -> Dict:
+        """
+        Get a single sprint (name, state, goal, start and end dates).
+        
+        Args:
+            sprint_id: The ID of the sprint.
+            
+        Returns:
+            Dictionary containing sprint data.
+        """
+        if self._mirror_ready():
+            sprint = self.mirror.get_sprint(sprint_id)
+            if sprint:
+                return sprint
+        url = f"{self.base_url}/rest/agile/1.0/sprint/{sprint_id}"
+        try:
+            return self._get_json('sprint', url)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching sprint: {e}")
+            return {'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching sprint: {e}")
+            return {}
+    
+    def get_sprint_issues(self, sprint_id: str, max_results: int = 50, start_at: int = 0,
+                          fields: Optional[List[str]] = None) -> Dict:
         """
         Get issues from a specific sprint.
         
@@ -147,6 +484,7 @@ class JiraAPI:
             sprint_id: The ID of the sprint.
             max_results: Maximum number of results to return.
             start_at: Starting index for pagination.
+            fields: List of fields to include in response (optional).
             
         Returns:
             Dictionary containing sprint issues data.
@@ -156,36 +494,50 @@ class JiraAPI:
             'maxResults': max_results,
             'startAt': start_at
         }
+        if fields:
+            params['fields'] = ','.join(fields)
         
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('sprint_issues', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching sprint issues: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error fetching sprint issues: {e}")
             return {}
     
-    def get_issue_details(self, issue_key: str) -> Dict:
+    def get_issue_details(self, issue_key: str, fields: Optional[List[str]] = None) -> Dict:
         """
         Get detailed information about a specific issue
         
         Args:
             issue_key: The key of the issue (e.g., 'PROJ-123')
+            fields: List of fields to include in response (optional)
             
         Returns:
             Dictionary containing issue details
         """
+        if self._mirror_ready():
+            issue = self.mirror.get_issue(issue_key)
+            if issue:
+                return issue
+
         url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+        params = {}
+        if fields:
+            params['fields'] = ','.join(fields)
         
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('issue', url, params)
+        except RateLimitExceeded as e:
+            print(f"Rate limited fetching issue details: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error fetching issue details: {e}")
             return {}
     
-    def search_issues(self, jql: str, max_results: int = 50, fields: Optional[List[str]] = None) -> Dict:
+    def search_issues(self, jql: str, max_results: int = 50, fields: Optional[List[str]] = None,
+                      start_at: int = 0, expand: Optional[str] = None, use_cache: bool = True) -> Dict:
         """
         Search for issues using JQL
         
@@ -193,6 +545,9 @@ class JiraAPI:
             jql: JQL query string
             max_results: Maximum number of results to return
             fields: List of fields to include in response
+            start_at: Starting index for pagination (default: 0)
+            expand: Comma-separated expansions, e.g. 'changelog' (optional)
+            use_cache: Set False for bulk reads that should not fill the cache
             
         Returns:
             Dictionary containing search results
@@ -202,17 +557,19 @@ class JiraAPI:
         payload = {
             'jql': jql,
             'maxResults': max_results,
-            'startAt': 0
+            'startAt': start_at
         }
         
         if fields:
             payload['fields'] = fields
+        if expand:
+            payload['expand'] = expand
         
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers, 
-                                   data=json.dumps(payload))
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('search', url, payload=payload, use_cache=use_cache)
+        except RateLimitExceeded as e:
+            print(f"Rate limited searching issues: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error searching issues: {e}")
             return {}
@@ -232,42 +589,235 @@ class JiraAPI:
         """
         url = f"{self.base_url}/rest/api/3/issue"
 
-        payload = {
-            "fields": {
-                "project": {
-                    "key": project_key
-                },
-                "summary": summary,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": description
-                                }
-                            ]
-                        }
-                    ]
-                },
-                "issuetype": {
-                    "name": issuetype_name
-                }
-            }
-        }
+        payload = issue_create_payload(project_key, summary, description, issuetype_name)
 
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers,
-                                   data=json.dumps(payload))
+            response = self._send('POST', url, idempotent=False, data=json.dumps(payload))
             response.raise_for_status()
+            for endpoint in WRITE_INVALIDATED_ENDPOINTS:
+                self.invalidate_cache(f"{endpoint}:")
             return response.json()
+        except RateLimitExceeded as e:
+            print(f"Rate limited creating issue: {e}")
+            return {'error': str(e)}
         except requests.exceptions.RequestException as e:
             print(f"Error creating issue: {e}")
             return {}
 
+    def bulk_create_issues(self, issue_updates: List[Dict]) -> Dict:
+        """
+        Create up to 50 issues in one request.
+
+        Args:
+            issue_updates: ``{'fields': {...}}`` objects (see issue_create_payload).
+
+        Returns:
+            Dictionary with ``issues`` (id and key of each created issue, in
+            request order) and ``errors`` (``failedElementNumber`` is the index
+            of the failed element), or an ``error`` entry if the request failed.
+        """
+        url = f"{self.base_url}/rest/api/3/issue/bulk"
+        try:
+            response = self._send('POST', url, idempotent=False, data=json.dumps({'issueUpdates': issue_updates}))
+            # Jira answers 400 when every element failed, with the same body
+            if response.status_code != 400:
+                response.raise_for_status()
+            for endpoint in WRITE_INVALIDATED_ENDPOINTS:
+                self.invalidate_cache(f"{endpoint}:")
+            return response.json()
+        except RateLimitExceeded as e:
+            print(f"Rate limited creating issues: {e}")
+            return {'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            print(f"Error creating issues: {e}")
+            return {'error': str(e)}
+
+    def create_issue_link(self, link_type: str, inward_key: str, outward_key: str) -> Dict:
+        """
+        Link two issues; ('Blocks', 'PROJ-1', 'PROJ-2') records "PROJ-1 blocks PROJ-2".
+
+        Args:
+            link_type: Link type name (e.g., 'Blocks', 'Relates').
+            inward_key: Issue the link reads from (Jira's ``inwardIssue``).
+            outward_key: Issue the link reads to (Jira's ``outwardIssue``).
+
+        Returns:
+            {} on success, or an ``error`` entry.
+        """
+        url = f"{self.base_url}/rest/api/3/issueLink"
+        payload = {'type': {'name': link_type}, 'inwardIssue': {'key': inward_key},
+                   'outwardIssue': {'key': outward_key}}
+        try:
+            response = self._send('POST', url, idempotent=False, data=json.dumps(payload))
+            response.raise_for_status()
+            return {}
+        except RateLimitExceeded as e:
+            print(f"Rate limited linking issues: {e}")
+            return {'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            print(f"Error linking issues: {e}")
+            return {'error': str(e)}
+
+    def _iter_pages(self, fetch_page: Callable[[int, int], Dict], page_size: int,
+                    prefetch: int) -> Iterator[Dict]:
+        """
+        Yield issues from every page of a paginated Jira endpoint.
+        
+        Raises RateLimitExceeded if Jira keeps throttling a page, and
+        IncompleteResultsError if a page failed or came back short, rather
+        than silently ending early.
+        
+        The first page is fetched synchronously to learn ``total`` and the
+        page size Jira actually honoured; the remaining pages are fetched on a
+        thread pool, at most ``prefetch`` pages ahead of the consumer. Memory
+        is therefore bounded by ``prefetch + 1`` pages regardless of how many
+        issues the board holds. ``prefetch=0`` fetches strictly one page at a
+        time on the calling thread.
+        
+        Args:
+            fetch_page: Callable taking ``(start_at, max_results)`` and returning
+                        a Jira page dictionary with ``issues`` and ``total``
+            page_size: Requested page size
+            prefetch: Number of pages to fetch ahead of the consumer
+        """
+        first = fetch_page(0, page_size)
+        issues = _page_issues(first, 0, 0, 0)
+        total = first.get('total', len(issues))
+        if not issues:
+            if total:
+                raise IncompleteResultsError(f"Jira returned no issues at 0 (of {total})")
+            return
+        step = len(issues)
+        del first
+        yield from issues
+        del issues
+
+        offsets = iter(range(step, total, step))
+        if prefetch <= 0:
+            for start_at in offsets:
+                yield from _page_issues(fetch_page(start_at, step), start_at, step, total)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix='jira-page')
+        try:
+            pending = deque((start_at, pool.submit(fetch_page, start_at, step))
+                            for start_at in islice(offsets, prefetch))
+            while pending:
+                start_at, future = pending.popleft()
+                page = future.result()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append((next_offset, pool.submit(fetch_page, next_offset, step)))
+                yield from _page_issues(page, start_at, step, total)
+                del page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_board_issues(self, board_id: str, jql: str = "", page_size: int = 50,
+                          fields: Optional[List[str]] = None, prefetch: int = 4) -> Iterator[Dict]:
+        """
+        Stream every issue on a board, following pagination transparently.
+        
+        Args:
+            board_id: The ID of the board
+            jql: JQL query to filter results (optional)
+            page_size: Issues requested per page
+            fields: List of fields to include in response (optional)
+            prefetch: Pages fetched concurrently ahead of the consumer (0 = sequential)
+            
+        Yields:
+            Issue dictionaries, in board order
+        """
+        return self._iter_pages(
+            lambda start_at, max_results: self.get_board_issues(board_id, max_results, start_at, jql, fields),
+            page_size, prefetch)
+
+    def iter_sprint_issues(self, sprint_id: str, page_size: int = 50,
+                           fields: Optional[List[str]] = None, prefetch: int = 4) -> Iterator[Dict]:
+        """
+        Stream every issue in a sprint, following pagination transparently.
+        
+        Args:
+            sprint_id: The ID of the sprint
+            page_size: Issues requested per page
+            fields: List of fields to include in response (optional)
+            prefetch: Pages fetched concurrently ahead of the consumer (0 = sequential)
+            
+        Yields:
+            Issue dictionaries, in sprint order
+        """
+        return self._iter_pages(
+            lambda start_at, max_results: self.get_sprint_issues(sprint_id, max_results, start_at, fields),
+            page_size, prefetch)
+
+    def iter_search_issues(self, jql: str, page_size: int = 50, fields: Optional[List[str]] = None,
+                           prefetch: int = 4, expand: Optional[str] = None,
+                           use_cache: bool = True) -> Iterator[Dict]:
+        """
+        Stream every issue matching a JQL query, following pagination transparently.
+        
+        Args:
+            jql: JQL query string
+            page_size: Issues requested per page
+            fields: List of fields to include in response
+            prefetch: Pages fetched concurrently ahead of the consumer (0 = sequential)
+            expand: Comma-separated expansions, e.g. 'changelog' (optional)
+            use_cache: Set False for bulk reads that should not fill the cache
+            
+        Yields:
+            Issue dictionaries, in search order
+        """
+        return self._iter_pages(
+            lambda start_at, max_results: self.search_issues(jql, max_results, fields, start_at,
+                                                             expand, use_cache),
+            page_size, prefetch)
+
+    def list_sprint_issues(self, sprint_id: str, raw: bool = False) -> Dict:
+        """
+        List every issue in a sprint in compact form.
+        
+        Only the fields in ISSUE_FIELDS are requested from Jira and each issue
+        is reduced to key, summary, status, assignee, story points, due date,
+        links and sprint. A fresh local mirror answers without calling Jira.
+        
+        Args:
+            sprint_id: The ID of the sprint.
+            raw: Return the unprojected Jira issue JSON instead (much larger).
+            
+        Returns:
+            Dictionary with the sprint ID, total issue count and the issues.
+        """
+        mirrored = self.mirror.get_sprint_issues(sprint_id) if self._mirror_ready() else []
+        try:
+            if mirrored:
+                issues = mirrored if raw else [IssueRecord.from_jira(issue).to_dict() for issue in mirrored]
+            elif raw:
+                issues = list(self.iter_sprint_issues(sprint_id))
+            else:
+                issues = [IssueRecord.from_jira(issue).to_dict()
+                          for issue in self.iter_sprint_issues(sprint_id, fields=ISSUE_FIELDS)]
+        except (RateLimitExceeded, IncompleteResultsError) as e:
+            return {'sprint_id': sprint_id, 'error': str(e)}
+        return {'sprint_id': sprint_id, 'total': len(issues), 'issues': issues}
+
+    def get_issue_summary(self, issue_key: str, raw: bool = False) -> Dict:
+        """
+        Get a compact view of a single issue, including its description text.
+        
+        Args:
+            issue_key: The key of the issue (e.g., 'PROJ-123').
+            raw: Return the unprojected Jira issue JSON instead (much larger).
+            
+        Returns:
+            Dictionary containing the issue, or {} if it could not be fetched.
+        """
+        if raw:
+            return self.get_issue_details(issue_key)
+        issue = self.get_issue_details(issue_key, fields=ISSUE_DETAIL_FIELDS)
+        if not issue or 'error' in issue:
+            return issue
+        return IssueRecord.from_jira(issue).to_dict()
+
 def format_issue_data(issues_data: Dict) -> None:
     """
     Pretty print issue data
@@ -296,19 +846,76 @@ def format_issue_data(issues_data: Dict) -> None:
         print(f"Assignee: {assignee_name}")
         print("-" * 40)
 
-# Initialize Jira API client for tool creation
-jira_client = JiraAPI(JIRA_BASE_URL, EMAIL, API_TOKEN)
-
-# Define FunctionTools for JiraAPI methods
-get_board_data_tool = FunctionTool(jira_client.get_board_data)
-get_board_issues_tool = FunctionTool(jira_client.get_board_issues)
-get_all_boards_tool = FunctionTool(jira_client.get_all_boards)
-get_sprints_tool = FunctionTool(jira_client.get_sprints)
-get_active_sprint_tool = FunctionTool(jira_client.get_active_sprint)
-get_sprint_issues_tool = FunctionTool(jira_client.get_sprint_issues)
-get_issue_details_tool = FunctionTool(jira_client.get_issue_details)
-search_issues_tool = FunctionTool(jira_client.search_issues)
-create_issue_tool = FunctionTool(jira_client.create_issue)
+# Clients of the configured site (the default tenant's) are built on first use rather than
+# at import, so starting a process needs neither Jira settings nor a reachable Jira
+def _build_default_clients():
+    """The configured site and its clients; called once by the tenant registry."""
+    # One scheduler for every Jira call to the site, sync or async
+    scheduler = RequestScheduler(
+        rate=JIRA_RATE_LIMIT, burst=JIRA_RATE_BURST, max_concurrency=JIRA_MAX_CONCURRENCY,
+        policy=RetryPolicy(JIRA_MAX_RETRIES, JIRA_BACKOFF_BASE, JIRA_BACKOFF_MAX),
+    )
+    # Connections, cache and budget of the configured site, shared with every tenant on it
+    site = JiraSite(JIRA_BASE_URL or "", scheduler,
+                    cache=build_cache(JIRA_CACHE_BACKEND, JIRA_CACHE_PATH, JIRA_CACHE_MAXSIZE))
+    jira = JiraAPI(JIRA_BASE_URL or "", EMAIL, API_TOKEN, cache=site.cache, scheduler=scheduler,
+                   adapter=site.adapter)
+
+    # Async client for the read tools the agents call on every turn, so they do
+    # not block the ADK event loop; shares the response cache with the sync one.
+    async_jira = AsyncJiraAPI(JIRA_BASE_URL or "", EMAIL, API_TOKEN, cache=site.cache,
+                              scheduler=scheduler, pool=site.async_pool)
+
+    # Optional local mirror that takes Jira off the hot path of reads
+    if JIRA_MIRROR_PATH:
+        mirror = JiraMirror(jira, JIRA_MIRROR_PATH, JIRA_MIRROR_JQL, JIRA_MIRROR_BOARDS)
+        jira.attach_mirror(mirror, JIRA_MIRROR_MAX_AGE)
+        async_jira.attach_mirror(mirror, JIRA_MIRROR_MAX_AGE)
+        mirror.start(JIRA_MIRROR_SYNC_INTERVAL)
+    return site, jira, async_jira
+
+
+tenant_registry.register_default(_build_default_clients)
+
+
+def _jira_metrics():
+    """Cache and retry counters the shared clients keep anyway, exported on each metrics scrape."""
+    clients = tenant_registry.built(tenant_registry.default)
+    if clients is None:
+        return
+    jira = clients.jira
+    for name, value in jira.get_cache_stats().items():
+        if name != 'hit_rate':
+            yield f'sprintmind_jira_cache_{name}_total', 'counter', {}, value
+    for name, value in jira.get_throttle_stats().items():
+        if name in ('in_flight', 'max_in_flight'):
+            yield f'sprintmind_jira_{name}', 'gauge', {}, value
+        else:
+            yield f'sprintmind_jira_{name}_total', 'counter', {}, value
+
+
+metrics.register_collector(_jira_metrics)
+
+
+# The default tenant's clients and mirror, and FunctionTools for JiraAPI methods, are built on
+# first access. Each tool call runs on the client of the session's tenant, and issue lists over
+# their token budget reach the model summarized.
+__getattr__ = lazy_globals(
+    globals(),
+    jira_client=lambda: tenant_registry.clients(tenant_registry.default).jira,
+    async_jira_client=lambda: tenant_registry.clients(tenant_registry.default).async_jira,
+    jira_mirror=lambda: tenant_registry.clients(tenant_registry.default).jira.mirror,
+    get_board_data_tool=function_tool(tenant_method(JiraAPI.get_board_data)),
+    get_board_issues_tool=function_tool(budgeted(tenant_method(JiraAPI.get_board_issues))),
+    get_all_boards_tool=function_tool(tenant_method(JiraAPI.get_all_boards)),
+    get_sprints_tool=function_tool(tenant_method(JiraAPI.get_sprints)),
+    get_active_sprint_tool=function_tool(tenant_method(AsyncJiraAPI.get_active_sprint)),
+    get_sprint_issues_tool=function_tool(budgeted(tenant_method(AsyncJiraAPI.list_sprint_issues))),
+    get_issue_details_tool=function_tool(tenant_method(AsyncJiraAPI.get_issue_summary)),
+    get_issues_details_tool=function_tool(budgeted(tenant_method(AsyncJiraAPI.get_issues_details))),
+    search_issues_tool=function_tool(budgeted(tenant_method(AsyncJiraAPI.search_issues))),
+    create_issue_tool=function_tool(tenant_method(JiraAPI.create_issue)),
+)
 
 # Example usage
 # if __name__ == "__main__":
@@ -0,0 +1,374 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import JIRA_SPRINT_FIELD
+from services.jira_models import adf_to_text
+
+# Fields pulled into the mirror; comments are requested explicitly
+MIRROR_FIELDS = ["*navigable", "comment"]
+
+
+class JiraMirror:
+    """
+    Local SQLite copy of Jira issues, comments, changelogs and sprints.
+    
+    A full sync pulls every issue matching ``jql``; afterwards incremental
+    syncs only pull issues changed since the previous sync, using a relative
+    ``updated >= -Nm`` clause (relative JQL dates avoid timezone mismatches
+    between this host and the Jira user profile) with a small overlap.
+    Deleted issues are only dropped by the next full sync or by
+    ``delete_issue``. The Jira webhook receiver (services/jira_webhooks.py)
+    writes changes in as they happen, leaving the syncs to catch up on
+    missed deliveries.
+    """
+
+    def __init__(self, client, path: str, jql: str, board_ids: Optional[List[str]] = None,
+                 overlap_minutes: int = 5):
+        """
+        Args:
+            client: JiraAPI used to pull data
+            path: SQLite database file
+            jql: Base JQL selecting the mirrored issues (without ORDER BY)
+            board_ids: Boards whose sprints are mirrored
+            overlap_minutes: Extra look-back for incremental syncs, covering
+                             clock skew and updates made during a sync
+        """
+        self.client = client
+        self.jql = jql
+        self.board_ids = list(board_ids or [])
+        self.overlap_minutes = overlap_minutes
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                key TEXT PRIMARY KEY, id TEXT, project TEXT, updated TEXT, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS issue_sprints (
+                issue_key TEXT NOT NULL, sprint_id TEXT NOT NULL, PRIMARY KEY (sprint_id, issue_key));
+            CREATE TABLE IF NOT EXISTS comments (
+                id TEXT PRIMARY KEY, issue_key TEXT NOT NULL, author TEXT, created TEXT, updated TEXT,
+                body TEXT);
+            CREATE INDEX IF NOT EXISTS comments_issue ON comments (issue_key);
+            CREATE TABLE IF NOT EXISTS changelogs (
+                id TEXT PRIMARY KEY, issue_key TEXT NOT NULL, created TEXT, data TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS changelogs_issue ON changelogs (issue_key);
+            CREATE TABLE IF NOT EXISTS sprints (
+                id TEXT PRIMARY KEY, board_id TEXT, state TEXT, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    # -- sync state -------------------------------------------------------
+
+    def _get_state(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, str(value)))
+            self._conn.commit()
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """Start time (epoch seconds) of the last successful sync."""
+        value = self._get_state('last_sync')
+        return float(value) if value else None
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful sync, or None if never synced."""
+        last_sync = self.last_sync
+        return time.time() - last_sync if last_sync else None
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Whether the mirror was synced within ``max_age`` seconds."""
+        age = self.age()
+        return age is not None and age <= max_age
+
+    # -- writes -----------------------------------------------------------
+
+    def upsert_issue(self, issue: Dict, commit: bool = True) -> None:
+        """
+        Insert or replace one issue (as returned by search or a webhook).
+        
+        Args:
+            issue: Issue dictionary; a ``changelog`` expansion is stored too
+            commit: Commit immediately (sync batches commits per page)
+        """
+        key = issue['key']
+        fields = issue.get('fields') or {}
+        changelog = issue.get('changelog') or {}
+        stored = {k: v for k, v in issue.items() if k != 'changelog'}
+        sprint_ids = [str(s['id']) for s in fields.get(JIRA_SPRINT_FIELD) or [] if isinstance(s, dict) and 'id' in s]
+        comments = (fields.get('comment') or {}).get('comments', [])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)",
+                (key, issue.get('id'), (fields.get('project') or {}).get('key'), fields.get('updated'),
+                 json.dumps(stored)))
+            self._conn.execute("DELETE FROM issue_sprints WHERE issue_key = ?", (key,))
+            self._conn.executemany("INSERT OR IGNORE INTO issue_sprints VALUES (?, ?)",
+                                   [(key, sprint_id) for sprint_id in sprint_ids])
+            for comment in comments:
+                self.upsert_comment(key, comment, commit=False)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO changelogs VALUES (?, ?, ?, ?)",
+                [(history['id'], key, history.get('created'), json.dumps(history))
+                 for history in changelog.get('histories', [])])
+            if commit:
+                self._conn.commit()
+
+    def upsert_comment(self, issue_key: str, comment: Dict, commit: bool = True) -> None:
+        """Insert or replace one comment of ``issue_key``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?, ?)",
+                (str(comment['id']), issue_key, (comment.get('author') or {}).get('displayName'),
+                 comment.get('created'), comment.get('updated'), adf_to_text(comment.get('body'))))
+            if commit:
+                self._conn.commit()
+
+    def delete_comment(self, comment_id: str, commit: bool = True) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM comments WHERE id = ?", (str(comment_id),))
+            if commit:
+                self._conn.commit()
+
+    def delete_issue(self, issue_key: str, commit: bool = True) -> None:
+        """Remove an issue and everything attached to it."""
+        with self._lock:
+            for table, column in (('issues', 'key'), ('issue_sprints', 'issue_key'),
+                                  ('comments', 'issue_key'), ('changelogs', 'issue_key')):
+                self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (issue_key,))
+            if commit:
+                self._conn.commit()
+
+    def upsert_sprint(self, sprint: Dict, board_id: Optional[str] = None, commit: bool = True) -> None:
+        """Insert or replace one sprint."""
+        board_id = board_id or sprint.get('originBoardId')
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sprints VALUES (?, ?, ?, ?)",
+                               (str(sprint['id']), str(board_id), sprint.get('state'), json.dumps(sprint)))
+            if commit:
+                self._conn.commit()
+
+    def delete_sprint(self, sprint_id: str, commit: bool = True) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sprints WHERE id = ?", (str(sprint_id),))
+            if commit:
+                self._conn.commit()
+
+    def commit(self) -> None:
+        """Commit writes made with ``commit=False``."""
+        with self._lock:
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        """Discard writes made with ``commit=False`` since the last commit."""
+        with self._lock:
+            self._conn.rollback()
+
+    # -- sync -------------------------------------------------------------
+
+    def _pull(self, jql: str) -> int:
+        """Upsert every issue ``jql`` returns; raises (keeping what was written) if the pull is cut short."""
+        count = 0
+        try:
+            for issue in self.client.iter_search_issues(jql, page_size=100, fields=MIRROR_FIELDS,
+                                                        expand='changelog', use_cache=False):
+                self.upsert_issue(issue, commit=False)
+                count += 1
+                if count % 100 == 0:
+                    with self._lock:
+                        self._conn.commit()
+        finally:
+            with self._lock:
+                self._conn.commit()
+        return count
+
+    def _sync_sprints(self) -> int:
+        count = 0
+        for board_id in self.board_ids:
+            for sprint in self.client.get_sprints(board_id):
+                self.upsert_sprint(sprint, board_id)
+                count += 1
+        return count
+
+    def full_sync(self) -> Dict:
+        """
+        Pull every mirrored issue and sprint, dropping issues no longer returned.
+        
+        Issues are only dropped, and the sync watermarks only advanced, once
+        every page came back; a pull cut short by a failed or short page is
+        rolled back and the error raised, so the mirror goes stale (and
+        readers fall back to Jira) instead of losing issues.
+        
+        Returns:
+            Dictionary with issue and sprint counts and elapsed seconds
+        """
+        started = time.time()
+        sprints = self._sync_sprints()
+        with self._lock:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM seen")
+        count = 0
+        try:
+            for issue in self.client.iter_search_issues(f"{self.jql} ORDER BY key ASC", page_size=100,
+                                                        fields=MIRROR_FIELDS, expand='changelog',
+                                                        use_cache=False):
+                self.upsert_issue(issue, commit=False)
+                with self._lock:
+                    self._conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (issue['key'],))
+                count += 1
+        except Exception:
+            with self._lock:
+                self._conn.rollback()
+            raise
+        with self._lock:
+            stale = [row[0] for row in self._conn.execute(
+                "SELECT key FROM issues WHERE key NOT IN (SELECT key FROM seen)")]
+            self._conn.commit()
+        for key in stale:
+            self.delete_issue(key)
+        self._set_state('last_sync', started)
+        self._set_state('last_full_sync', started)
+        return {'issues': count, 'deleted': len(stale), 'sprints': sprints,
+                'seconds': round(time.time() - started, 3)}
+
+    def incremental_sync(self) -> Dict:
+        """
+        Pull issues updated since the previous sync. ``last_sync`` only
+        advances when the pull completed, so a failed one is retried over
+        the same window.
+        
+        Returns:
+            Dictionary with issue and sprint counts and elapsed seconds
+        """
+        last_sync = self.last_sync
+        if last_sync is None:
+            return self.full_sync()
+        started = time.time()
+        minutes = math.ceil((started - last_sync) / 60) + self.overlap_minutes
+        sprints = self._sync_sprints()
+        count = self._pull(f'({self.jql}) AND updated >= "-{minutes}m" ORDER BY updated ASC')
+        self._set_state('last_sync', started)
+        return {'issues': count, 'sprints': sprints, 'seconds': round(time.time() - started, 3)}
+
+    def start(self, interval: float) -> None:
+        """Keep the mirror current from a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.incremental_sync()
+                except Exception as e:
+                    print(f"Error syncing Jira mirror: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name='jira-mirror-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # -- reads ------------------------------------------------------------
+
+    def get_issue(self, issue_key: str) -> Optional[Dict]:
+        """Return the stored issue JSON, or None if it is not mirrored."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM issues WHERE key = ?", (issue_key.upper(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_updated(self, issue_key: str) -> Optional[str]:
+        """Return the mirrored issue's ``updated`` timestamp, or None if it is not mirrored."""
+        with self._lock:
+            row = self._conn.execute("SELECT updated FROM issues WHERE key = ?", (issue_key,)).fetchone()
+        return row[0] if row else None
+
+    def get_sprint_issues(self, sprint_id: str) -> List[Dict]:
+        """Return every mirrored issue in a sprint."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT i.data FROM issues i JOIN issue_sprints s ON s.issue_key = i.key "
+                "WHERE s.sprint_id = ? ORDER BY i.id", (str(sprint_id),)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_active_sprint(self, board_id: str) -> Optional[Dict]:
+        """Return the board's active sprint, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sprints WHERE board_id = ? AND state = 'active'",
+                                     (str(board_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_sprint(self, sprint_id: str) -> Optional[Dict]:
+        """Return a mirrored sprint, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sprints WHERE id = ?", (str(sprint_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_sprint_changelogs(self, sprint_id: str) -> Dict[str, List[Dict]]:
+        """Return the changelog histories of every issue in a sprint, keyed by issue."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.issue_key, c.data FROM changelogs c JOIN issue_sprints s ON s.issue_key = c.issue_key "
+                "WHERE s.sprint_id = ? ORDER BY c.created", (str(sprint_id),)).fetchall()
+        changelogs: Dict[str, List[Dict]] = {}
+        for key, data in rows:
+            changelogs.setdefault(key, []).append(json.loads(data))
+        return changelogs
+
+    def get_comments(self, issue_key: str) -> List[Dict]:
+        """Return an issue's comments as plain text, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, author, created, body FROM comments WHERE issue_key = ? ORDER BY created",
+                (issue_key,)).fetchall()
+        return [{'id': r[0], 'author': r[1], 'created': r[2], 'body': r[3]} for r in rows]
+
+    def get_changelog(self, issue_key: str) -> List[Dict]:
+        """Return an issue's changelog histories, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM changelogs WHERE issue_key = ? ORDER BY created",
+                                      (issue_key,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_issues(self, batch_size: int = 500) -> Iterator[Dict]:
+        """Stream every mirrored issue without loading the table into memory."""
+        last_key = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute("SELECT key, data FROM issues WHERE key > ? ORDER BY key LIMIT ?",
+                                          (last_key, batch_size)).fetchall()
+            if not rows:
+                return
+            for key, data in rows:
+                yield json.loads(data)
+            last_key = rows[-1][0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+
+
+if __name__ == "__main__":
+    import argparse
+    from services.jira_client import jira_mirror
+
+    parser = argparse.ArgumentParser(description="Sync the local Jira mirror (JIRA_MIRROR_PATH)")
+    parser.add_argument("--full", action="store_true", help="run a full sync instead of an incremental one")
+    args = parser.parse_args()
+    if jira_mirror is None:
+        sys.exit("JIRA_MIRROR_PATH is not set")
+    print(jira_mirror.full_sync() if args.full else jira_mirror.incremental_sync())
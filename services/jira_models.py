@@ -0,0 +1,209 @@
+import re
+from typing import Dict, List, Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import JIRA_STORY_POINTS_FIELD, JIRA_SPRINT_FIELD
+
+# Fields requested from Jira when building compact issue records
+ISSUE_FIELDS = [
+    "summary",
+    "status",
+    "assignee",
+    "duedate",
+    "issuelinks",
+    JIRA_STORY_POINTS_FIELD,
+    JIRA_SPRINT_FIELD,
+]
+
+# Extra fields requested for a single-issue lookup
+ISSUE_DETAIL_FIELDS = ISSUE_FIELDS + ["issuetype", "priority", "description"]
+
+
+def adf_to_text(node) -> str:
+    """
+    Flatten an Atlassian Document Format node into plain text
+    
+    Args:
+        node: ADF document/node, or a plain string (Jira Server / API v2)
+        
+    Returns:
+        Plain text with block nodes separated by newlines
+    """
+    if not node:
+        return ""
+    if isinstance(node, str):
+        return node
+    if node.get("type") == "text":
+        return node.get("text", "")
+    if node.get("type") == "hardBreak":
+        return "\n"
+    parts = [adf_to_text(child) for child in node.get("content", [])]
+    separator = "\n" if node.get("type") in ("doc", "bulletList", "orderedList", "table", "tableRow") else ""
+    return separator.join(part for part in parts if part)
+
+
+def text_to_adf(text: str) -> Dict:
+    """
+    Wrap plain text in an Atlassian Document Format document
+    
+    Blank lines separate paragraphs; a block whose lines all start with
+    "- " or "* " becomes a bullet list.
+    
+    Args:
+        text: Plain text
+        
+    Returns:
+        ADF ``doc`` node
+    """
+    content = []
+    for block in re.split(r"\n\s*\n", text or ""):
+        lines = [line.strip() for line in block.strip().splitlines() if line.strip()]
+        if not lines:
+            continue
+        if all(line[:2] in ("- ", "* ") for line in lines):
+            content.append({
+                "type": "bulletList",
+                "content": [
+                    {"type": "listItem",
+                     "content": [{"type": "paragraph", "content": [{"type": "text", "text": line[2:].strip()}]}]}
+                    for line in lines
+                ],
+            })
+            continue
+        paragraph = []
+        for line in lines:
+            if paragraph:
+                paragraph.append({"type": "hardBreak"})
+            paragraph.append({"type": "text", "text": line})
+        content.append({"type": "paragraph", "content": paragraph})
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def issue_create_payload(project_key: str, summary: str, description: str, issuetype_name: str,
+                         parent_key: Optional[str] = None, story_points: Optional[float] = None,
+                         labels: Optional[List[str]] = None) -> Dict:
+    """
+    Build the request body for POST /rest/api/3/issue (and one element of /issue/bulk)
+    
+    Args:
+        project_key: The key of the project (e.g., 'PROJ')
+        summary: The summary/title of the issue
+        description: Plain-text description (see text_to_adf)
+        issuetype_name: The name of the issue type (e.g., 'Task', 'Story')
+        parent_key: Epic of a story, or story of a sub-task (optional)
+        story_points: Estimate, set on JIRA_STORY_POINTS_FIELD (optional)
+        labels: Labels to set (optional)
+        
+    Returns:
+        Dictionary with the ``fields`` object Jira expects
+    """
+    fields = {
+        "project": {
+            "key": project_key
+        },
+        "summary": summary,
+        "description": text_to_adf(description),
+        "issuetype": {
+            "name": issuetype_name
+        }
+    }
+    if parent_key:
+        fields["parent"] = {"key": parent_key}
+    if story_points is not None:
+        fields[JIRA_STORY_POINTS_FIELD] = story_points
+    if labels:
+        fields["labels"] = list(labels)
+    return {"fields": fields}
+
+
+class IssueRecord:
+    """
+    Compact, LLM-friendly view of a Jira issue.
+    
+    Only the fields in ISSUE_FIELDS (plus ISSUE_DETAIL_FIELDS for single
+    lookups) are kept; avatars, ``self`` URLs and unused custom fields are
+    dropped. ``__slots__`` keeps per-instance memory small when a whole
+    board is materialised.
+    """
+
+    __slots__ = ("key", "summary", "status", "assignee", "story_points", "due_date",
+                 "links", "sprint", "issue_type", "priority", "description")
+
+    def __init__(self, key: str, summary: str = "", status: Optional[str] = None,
+                 assignee: Optional[str] = None, story_points: Optional[float] = None,
+                 due_date: Optional[str] = None, links: Optional[List[str]] = None,
+                 sprint: Optional[str] = None, issue_type: Optional[str] = None,
+                 priority: Optional[str] = None, description: Optional[str] = None):
+        self.key = key
+        self.summary = summary
+        self.status = status
+        self.assignee = assignee
+        self.story_points = story_points
+        self.due_date = due_date
+        self.links = links or []
+        self.sprint = sprint
+        self.issue_type = issue_type
+        self.priority = priority
+        self.description = description
+
+    @classmethod
+    def from_jira(cls, issue: Dict) -> "IssueRecord":
+        """
+        Build a record from a Jira issue payload (projected or full)
+        
+        Args:
+            issue: Issue dictionary as returned by the Jira REST API
+            
+        Returns:
+            IssueRecord instance
+        """
+        fields = issue.get("fields") or {}
+        status = fields.get("status") or {}
+        assignee = fields.get("assignee") or {}
+        issue_type = fields.get("issuetype") or {}
+        priority = fields.get("priority") or {}
+
+        links = []
+        for link in fields.get("issuelinks") or []:
+            link_type = link.get("type") or {}
+            if "outwardIssue" in link:
+                links.append(f"{link_type.get('outward', 'relates to')} {link['outwardIssue'].get('key')}")
+            elif "inwardIssue" in link:
+                links.append(f"{link_type.get('inward', 'relates to')} {link['inwardIssue'].get('key')}")
+
+        # The sprint field holds every sprint the issue has been in; the
+        # active (or latest) one is the interesting one.
+        sprints = fields.get(JIRA_SPRINT_FIELD) or []
+        sprint = None
+        if sprints:
+            active = [s for s in sprints if isinstance(s, dict) and s.get("state") == "active"]
+            latest = (active or sprints)[-1]
+            sprint = latest.get("name") if isinstance(latest, dict) else str(latest)
+
+        description = fields.get("description")
+        return cls(
+            key=issue.get("key", ""),
+            summary=fields.get("summary", ""),
+            status=status.get("name"),
+            assignee=assignee.get("displayName"),
+            story_points=fields.get(JIRA_STORY_POINTS_FIELD),
+            due_date=fields.get("duedate"),
+            links=links,
+            sprint=sprint,
+            issue_type=issue_type.get("name"),
+            priority=priority.get("name"),
+            description=adf_to_text(description) if description else None,
+        )
+
+    def to_dict(self) -> Dict:
+        """Return the record as a dictionary, omitting empty fields."""
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None and value != [] and value != "":
+                data[name] = value
+        return data
+
+    def __repr__(self) -> str:
+        return f"IssueRecord({self.to_dict()!r})"
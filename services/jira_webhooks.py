@@ -0,0 +1,394 @@
+# jira_webhooks.py
+from flask import Flask, request, make_response
+import hashlib
+import hmac
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional, Set
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import (
+    JIRA_WEBHOOK_PORT, JIRA_WEBHOOK_SECRET, JIRA_WEBHOOK_QUEUE_SIZE, JIRA_WEBHOOK_BATCH_SIZE, JIRA_WEBHOOK_KB,
+    JIRA_WEBHOOK_RECORD, JIRA_WEBHOOK_ALLOW_UNSIGNED,
+)
+from services.jira_cache import WRITE_INVALIDATED_ENDPOINTS
+from services.sprint_metrics import parse_time
+from services.telemetry import metrics, setup_telemetry, span
+
+ISSUE_EVENTS = ('jira:issue_created', 'jira:issue_updated', 'jira:issue_deleted')
+COMMENT_EVENTS = ('comment_created', 'comment_updated', 'comment_deleted')
+SPRINT_EVENTS = ('sprint_created', 'sprint_updated', 'sprint_started', 'sprint_closed', 'sprint_deleted')
+SUPPORTED_EVENTS = ISSUE_EVENTS + COMMENT_EVENTS + SPRINT_EVENTS
+
+# Cached endpoints a sprint change can affect (issue changes affect WRITE_INVALIDATED_ENDPOINTS)
+SPRINT_INVALIDATED_ENDPOINTS = ('sprint', 'sprints', 'sprint_issues')
+
+
+def verify_signature(body: bytes, header: Optional[str], secret: str, allow_unsigned: bool = False) -> bool:
+    """
+    Check the ``X-Hub-Signature`` header Jira sends for webhooks with a secret
+
+    Args:
+        body: Raw request body
+        header: Header value, ``sha256=<hex HMAC of the body>``
+        secret: Shared secret
+        allow_unsigned: Accept every request when there is no secret
+                        (otherwise none is accepted)
+
+    Returns:
+        Whether the request may be processed
+    """
+    if not secret:
+        return allow_unsigned
+    method, _, signature = (header or '').partition('=')
+    if method != 'sha256' or not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def validate_event(payload) -> Optional[str]:
+    """Return why a webhook payload cannot be applied, or None if it can."""
+    if not isinstance(payload, dict):
+        return 'payload is not a JSON object'
+    event = payload.get('webhookEvent')
+    if event not in SUPPORTED_EVENTS:
+        return f'unsupported event {event!r}'
+    if event in SPRINT_EVENTS:
+        sprint = payload.get('sprint')
+        if not isinstance(sprint, dict) or sprint.get('id') is None:
+            return f'{event} without a sprint id'
+        return None
+    issue = payload.get('issue')
+    if not isinstance(issue, dict) or not issue.get('key'):
+        return f'{event} without an issue key'
+    if event in COMMENT_EVENTS:
+        comment = payload.get('comment')
+        if not isinstance(comment, dict) or not comment.get('id'):
+            return f'{event} without a comment id'
+    elif event != 'jira:issue_deleted' and not isinstance(issue.get('fields'), dict):
+        return f'{event} without issue fields'
+    return None
+
+
+def _jira_time(timestamp_ms) -> Optional[str]:
+    if not timestamp_ms:
+        return None
+    return datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+class JiraEventIngestor:
+    """
+    Applies Jira webhook events to local state as deltas: the mirror (issues,
+    comments, changelogs, sprints), the response cache and the knowledge base
+    indexes. Sprint reads, sprint metrics and standup digests built from a
+    fresh mirror then reflect a change as soon as Jira reports it.
+
+    Each batch is one mirror transaction, one invalidation per affected cache
+    prefix and one knowledge base update. Redelivered events are harmless
+    (every write is an upsert), and an issue update older than the mirrored
+    copy is skipped, since Jira does not deliver webhooks in order.
+    """
+
+    def __init__(self, mirror, client=None, knowledge_base=None):
+        """
+        Args:
+            mirror: JiraMirror to write to
+            client: JiraAPI whose response cache is invalidated (a SQLiteCache
+                    backend carries the invalidation to other processes)
+            knowledge_base: KnowledgeBase to re-index changed issues in;
+                            skipped until it has been built
+        """
+        self.mirror = mirror
+        self.client = client
+        self.knowledge_base = knowledge_base
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _apply_issue(self, payload: Dict) -> bool:
+        issue = payload['issue']
+        key = issue['key']
+        fields = issue['fields']
+        stored_updated = self.mirror.get_updated(key)
+        if stored_updated and parse_time(fields.get('updated')) < parse_time(stored_updated):
+            return False
+        if 'comment' not in fields and stored_updated:
+            stored = self.mirror.get_issue(key) or {}
+            issue = dict(issue, fields=dict(fields, comment=(stored.get('fields') or {}).get('comment')))
+        # The webhook carries only this change's items; store them as one changelog history
+        changelog = payload.get('changelog') or {}
+        if changelog.get('items'):
+            issue = dict(issue, changelog={'histories': [{
+                'id': str(changelog.get('id') or f"{key}:{payload.get('timestamp')}"),
+                'author': payload.get('user'),
+                'created': fields.get('updated') or _jira_time(payload.get('timestamp')),
+                'items': changelog['items'],
+            }]})
+        self.mirror.upsert_issue(issue, commit=False)
+        return True
+
+    def _apply_comment(self, event: str, key: str, comment: Dict) -> None:
+        if event == 'comment_deleted':
+            self.mirror.delete_comment(comment['id'], commit=False)
+        else:
+            self.mirror.upsert_comment(key, comment, commit=False)
+        # Keep the comment list of the stored issue (served by get_issue) in step
+        issue = self.mirror.get_issue(key)
+        if issue is None:
+            return
+        fields = issue.setdefault('fields', {})
+        thread = fields.get('comment') or {}
+        comments = [c for c in thread.get('comments', []) if str(c.get('id')) != str(comment['id'])]
+        if event != 'comment_deleted':
+            comments.append(comment)
+            comments.sort(key=lambda c: c.get('created') or '')
+        fields['comment'] = dict(thread, comments=comments, total=len(comments))
+        self.mirror.upsert_issue(issue, commit=False)
+
+    def _apply_sprint(self, event: str, sprint: Dict) -> None:
+        if event == 'sprint_deleted':
+            self.mirror.delete_sprint(sprint['id'], commit=False)
+        else:
+            self.mirror.upsert_sprint(sprint, commit=False)
+
+    def apply(self, payloads: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Apply a batch of validated webhook payloads, in delivery order
+
+        The batch is one mirror transaction: if an event cannot be applied,
+        the writes of the whole batch are rolled back and the error raised.
+
+        Args:
+            payloads: Payloads that passed ``validate_event``
+
+        Returns:
+            Dictionary with the number of events applied and skipped as stale
+        """
+        counts = Counter()
+        prefixes: Set[str] = set()
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        base_url = self.client.base_url if self.client is not None else ''
+        with self._lock, span("jira_webhooks.apply"):
+            try:
+                self._apply_events(payloads, counts, prefixes, changed, removed, base_url)
+            except Exception:
+                self.mirror.rollback()
+                raise
+            self.mirror.commit()
+            if self.client is not None:
+                for prefix in prefixes:
+                    self.client.invalidate_cache(prefix)
+            self._update_knowledge_base(changed, removed)
+            self.stats.update(counts)
+        return dict(counts)
+
+    def _apply_events(self, payloads: Iterable[Dict], counts: Counter, prefixes: Set[str], changed: Set[str],
+                      removed: Set[str], base_url: str) -> None:
+        """Write the events to the mirror (uncommitted), collecting what they invalidate."""
+        for payload in payloads:
+            event = payload['webhookEvent']
+            if event in SPRINT_EVENTS:
+                self._apply_sprint(event, payload['sprint'])
+                prefixes.update(f"{endpoint}:" for endpoint in SPRINT_INVALIDATED_ENDPOINTS)
+                counts['applied'] += 1
+                continue
+            key = payload['issue']['key']
+            if event in COMMENT_EVENTS:
+                self._apply_comment(event, key, payload['comment'])
+            elif event == 'jira:issue_deleted':
+                self.mirror.delete_issue(key, commit=False)
+            elif not self._apply_issue(payload):
+                counts['stale'] += 1
+                continue
+            if event == 'jira:issue_deleted':
+                removed.add(key)
+                changed.discard(key)
+            else:
+                changed.add(key)
+                removed.discard(key)
+            prefixes.add(f"issue:{base_url}/rest/api/3/issue/{key}?")
+            prefixes.update(f"{endpoint}:" for endpoint in WRITE_INVALIDATED_ENDPOINTS)
+            counts['applied'] += 1
+
+    def _update_knowledge_base(self, changed: Set[str], removed: Set[str]) -> None:
+        kb = self.knowledge_base
+        if kb is None or not (changed or removed) or not len(kb.bm25):
+            return
+        try:
+            if removed:
+                kb.remove(sorted(removed))
+            issues = [issue for issue in map(self.mirror.get_issue, sorted(changed)) if issue]
+            if issues:
+                kb.index_issues(issues)
+        except Exception as e:
+            print(f"Error updating the knowledge base from Jira webhooks: {e}")
+
+
+def load_payloads(path: str) -> Iterator[Dict]:
+    """Read recorded webhook payloads, one JSON object per line."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(ingestor: JiraEventIngestor, payloads: Iterable[Dict], batch_size: int = JIRA_WEBHOOK_BATCH_SIZE) -> Dict:
+    """
+    Feed recorded webhook payloads through validation and the ingestor
+
+    Args:
+        ingestor: Where the events are applied
+        payloads: Payloads in delivery order
+        batch_size: Events applied per batch, as the receiver's worker does
+
+    Returns:
+        Dictionary with applied / stale / invalid counts, elapsed seconds and
+        events per second
+    """
+    counts = Counter()
+    batch = []
+    start = time.perf_counter()
+    for payload in payloads:
+        if validate_event(payload):
+            counts['invalid'] += 1
+            continue
+        batch.append(payload)
+        if len(batch) >= batch_size:
+            counts.update(ingestor.apply(batch))
+            batch = []
+    if batch:
+        counts.update(ingestor.apply(batch))
+    seconds = time.perf_counter() - start
+    events = counts['applied'] + counts['stale']
+    return dict(counts, seconds=round(seconds, 3), events_per_second=round(events / seconds, 1) if seconds else None)
+
+
+app = Flask(__name__)
+ingestor: Optional[JiraEventIngestor] = None
+# Bounded, so a burst beyond what the worker can absorb is pushed back to Jira (it retries 5xx)
+event_queue = queue.Queue(maxsize=JIRA_WEBHOOK_QUEUE_SIZE)
+_worker_thread: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_record_lock = threading.Lock()
+
+
+def _worker():
+    # One worker, so events are applied in the order they arrived
+    while True:
+        batch = [event_queue.get()]
+        while len(batch) < JIRA_WEBHOOK_BATCH_SIZE:
+            try:
+                batch.append(event_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            try:
+                ingestor.apply(batch)
+            except Exception as e:
+                # The batch was rolled back; apply its events one by one so only the bad one is lost
+                print(f"Error applying a batch of {len(batch)} Jira webhook events, retrying them one at a time: {e}")
+                if len(batch) > 1:
+                    for payload in batch:
+                        try:
+                            ingestor.apply([payload])
+                        except Exception as e:
+                            print(f"Error applying Jira webhook event {payload['webhookEvent']}: {e}")
+        finally:
+            for _ in batch:
+                event_queue.task_done()
+
+
+def start_worker():
+    """Start the background worker (once)."""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None:
+            _worker_thread = threading.Thread(target=_worker, name="jira-webhook-worker", daemon=True)
+            _worker_thread.start()
+
+
+@app.route("/jira/webhooks", methods=["POST"])
+def jira_webhooks():
+    body = request.get_data()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature"), JIRA_WEBHOOK_SECRET,
+                            JIRA_WEBHOOK_ALLOW_UNSIGNED):
+        return make_response("", 401)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return make_response("Invalid JSON", 400)
+    if not isinstance(payload, dict) or payload.get("webhookEvent") not in SUPPORTED_EVENTS:
+        # Not an error: acknowledge so Jira does not retry events we do not use
+        return make_response("", 204)
+    error = validate_event(payload)
+    if error:
+        print(f"Rejecting Jira webhook: {error}")
+        return make_response(error, 400)
+
+    if JIRA_WEBHOOK_RECORD:
+        with _record_lock, open(JIRA_WEBHOOK_RECORD, "a") as f:
+            f.write(json.dumps(payload) + "\n")
+
+    # Ack now; the worker applies events in batches
+    start_worker()
+    try:
+        event_queue.put_nowait(payload)
+    except queue.Full:
+        print(f"Jira webhook queue full, asking Jira to redeliver {payload['webhookEvent']}")
+        return make_response("", 503)
+    return make_response("", 202)
+
+
+@app.route("/jira/webhooks/stats", methods=["GET"])
+def jira_webhook_stats():
+    return {"queued": event_queue.qsize(), **ingestor.stats}
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return make_response(metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+
+def _webhook_metrics():
+    yield 'sprintmind_webhook_queue_depth', 'gauge', {}, event_queue.qsize()
+    if ingestor is not None:
+        for name, value in ingestor.stats.items():
+            yield 'sprintmind_webhook_events_total', 'counter', {'result': name}, value
+
+
+metrics.register_collector(_webhook_metrics)
+
+
+if __name__ == "__main__":
+    import argparse
+    from services.jira_client import jira_client, jira_mirror
+    from services.kb_search import get_knowledge_base
+
+    parser = argparse.ArgumentParser(description="Receive Jira webhooks, or replay recorded ones")
+    parser.add_argument("command", nargs="?", choices=["serve", "replay"], default="serve")
+    parser.add_argument("path", nargs="?", help="JSON-lines file of recorded payloads (replay)")
+    parser.add_argument("--batch-size", type=int, default=JIRA_WEBHOOK_BATCH_SIZE)
+    args = parser.parse_args()
+    if jira_mirror is None:
+        sys.exit("JIRA_MIRROR_PATH is not set")
+
+    setup_telemetry("sprintmind-jira-webhooks")
+    ingestor = JiraEventIngestor(jira_mirror, jira_client, get_knowledge_base() if JIRA_WEBHOOK_KB else None)
+    if args.command == "replay":
+        if not args.path:
+            sys.exit("replay needs the path of a recorded payload file")
+        print(replay(ingestor, load_payloads(args.path), args.batch_size))
+    else:
+        if not JIRA_WEBHOOK_SECRET:
+            if not JIRA_WEBHOOK_ALLOW_UNSIGNED:
+                sys.exit("JIRA_WEBHOOK_SECRET is not set; set it on the Jira webhook too, or set "
+                         "JIRA_WEBHOOK_ALLOW_UNSIGNED=1 to accept unsigned requests from anyone who can reach the port")
+            print("Warning: JIRA_WEBHOOK_SECRET is not set; accepting unsigned Jira webhooks")
+        start_worker()
+        app.run(port=JIRA_WEBHOOK_PORT, threaded=True)
@@ -0,0 +1,354 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from utils.config import KB_INDEX_PATH, KB_INDEX_ANN, KB_EMBEDDING_MODEL
+from services.embeddings import embed_query, embed_texts
+from services.jira_models import adf_to_text
+from services.lazy import function_tool, lazy_globals
+
+# Fields needed to index an issue
+INDEX_FIELDS = ["summary", "description", "comment", "updated"]
+# Longest passage sent to the embedding model (characters)
+MAX_PASSAGE_CHARS = 2000
+
+
+def issue_passages(issue: Dict) -> List[Tuple[str, str]]:
+    """
+    Split an issue into embeddable passages
+    
+    Args:
+        issue: Jira issue with summary, description and comment fields
+        
+    Returns:
+        List of ``(kind, text)``: one 'issue' passage (summary + description)
+        and one 'comment:<id>' passage per comment, prefixed with the summary
+        for context
+    """
+    fields = issue.get('fields') or {}
+    summary = fields.get('summary') or ''
+    passages = [('issue', f"{summary}\n{adf_to_text(fields.get('description'))}"[:MAX_PASSAGE_CHARS])]
+    for comment in (fields.get('comment') or {}).get('comments', []):
+        body = adf_to_text(comment.get('body'))
+        if body:
+            passages.append((f"comment:{comment['id']}", f"{summary}\n{body}"[:MAX_PASSAGE_CHARS]))
+    return passages
+
+
+def _load_hnswlib(mode: str):
+    if mode == 'off':
+        return None
+    try:
+        import hnswlib
+        return hnswlib
+    except ImportError:
+        if mode == 'on':
+            raise
+        return None
+
+
+class SemanticIndex:
+    """
+    On-disk embedding index over issue passages.
+    
+    Vectors live in an append-only float32 file that is memory-mapped for
+    search, so the index never has to fit in RAM. Re-indexing an issue
+    tombstones its old rows and appends new ones; ``compact`` rewrites the
+    file once tombstones pile up. With hnswlib installed an HNSW graph is
+    kept alongside for approximate search; otherwise search is an exact
+    matrix-vector product over the memory map.
+    """
+
+    def __init__(self, path: str, ann: str = KB_INDEX_ANN, embedder=None, ef_search: int = 200):
+        """
+        Args:
+            path: Index directory
+            ann: 'auto' (HNSW if hnswlib is installed), 'on' or 'off'
+            embedder: Override for the shared embedding model
+            ef_search: HNSW candidate list size; higher trades latency for recall
+        """
+        self.path = path
+        self.embedder = embedder
+        self.ef_search = ef_search
+        self._hnswlib = _load_hnswlib(ann)
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, 'vectors.f32')
+        self._meta_path = os.path.join(path, 'meta.json')
+        self._ann_path = os.path.join(path, 'ann.bin')
+
+        meta = {}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+        self.dim: Optional[int] = meta.get('dim')
+        self.model = meta.get('model', KB_EMBEDDING_MODEL)
+        self.last_update: Optional[float] = meta.get('last_update')
+        self._rows: List[Tuple[str, str]] = [tuple(row) for row in meta.get('rows', [])]
+        self._alive = np.ones(len(self._rows), dtype=bool)
+        self._alive[meta.get('dead', [])] = False
+        self.summaries: Dict[str, str] = meta.get('summaries', {})
+        self._by_key: Dict[str, List[int]] = {}
+        for row, (key, _) in enumerate(self._rows):
+            if self._alive[row]:
+                self._by_key.setdefault(key, []).append(row)
+        self._vectors: Optional[np.memmap] = None
+        self._remap()
+        self._ann = None
+        if self._hnswlib is not None and self.dim:
+            self._load_ann()
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    @property
+    def issue_count(self) -> int:
+        return len(self._by_key)
+
+    # -- storage ----------------------------------------------------------
+
+    def _remap(self) -> None:
+        rows = len(self._rows)
+        if rows and self.dim:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        else:
+            self._vectors = None
+
+    def _load_ann(self) -> None:
+        self._ann = self._hnswlib.Index(space='ip', dim=self.dim)
+        capacity = max(1024, len(self._rows))
+        if os.path.exists(self._ann_path):
+            self._ann.load_index(self._ann_path, max_elements=capacity)
+        else:
+            self._ann.init_index(max_elements=capacity, ef_construction=200, M=16)
+            if len(self._rows):
+                rows = np.flatnonzero(self._alive)
+                self._ann.add_items(np.asarray(self._vectors[rows]), rows)
+
+    def save(self) -> None:
+        """Persist metadata (and the HNSW graph) to disk."""
+        with self._lock:
+            meta = {
+                'dim': self.dim,
+                'model': self.model,
+                'last_update': self.last_update,
+                'rows': self._rows,
+                'dead': np.flatnonzero(~self._alive).tolist(),
+                'summaries': self.summaries,
+            }
+            tmp_path = self._meta_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self._meta_path)
+            if self._ann is not None:
+                self._ann.save_index(self._ann_path)
+
+    def add(self, entries: List[Tuple[str, str]], vectors: np.ndarray) -> None:
+        """
+        Append pre-computed passage vectors
+        
+        Args:
+            entries: ``(issue_key, kind)`` per row
+            vectors: Unit-length float32 array of shape (len(entries), dim)
+        """
+        if not entries:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                if self._hnswlib is not None:
+                    self._load_ann()
+            first = len(self._rows)
+            with open(self._vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            self._rows.extend(entries)
+            self._alive = np.concatenate([self._alive, np.ones(len(entries), dtype=bool)])
+            for offset, (key, _) in enumerate(entries):
+                self._by_key.setdefault(key, []).append(first + offset)
+            self._remap()
+            if self._ann is not None:
+                needed = len(self._rows)
+                if needed > self._ann.get_max_elements():
+                    self._ann.resize_index(max(needed, 2 * self._ann.get_max_elements()))
+                self._ann.add_items(vectors, np.arange(first, needed))
+
+    def remove(self, issue_keys: Iterable[str]) -> int:
+        """Tombstone every passage of the given issues; returns rows removed."""
+        removed = 0
+        with self._lock:
+            for key in issue_keys:
+                for row in self._by_key.pop(key, []):
+                    self._alive[row] = False
+                    if self._ann is not None:
+                        self._ann.mark_deleted(row)
+                    removed += 1
+                self.summaries.pop(key, None)
+        return removed
+
+    def compact(self) -> int:
+        """Rewrite the vector file without tombstoned rows; returns rows dropped."""
+        with self._lock:
+            dead = len(self._rows) - len(self)
+            if not dead:
+                return 0
+            keep = np.flatnonzero(self._alive)
+            vectors = np.array(self._vectors[keep]) if self._vectors is not None else None
+            self._vectors = None
+            tmp_path = self._vectors_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                if vectors is not None:
+                    f.write(vectors.tobytes())
+            os.replace(tmp_path, self._vectors_path)
+            self._rows = [self._rows[row] for row in keep]
+            self._alive = np.ones(len(self._rows), dtype=bool)
+            self._by_key = {}
+            for row, (key, _) in enumerate(self._rows):
+                self._by_key.setdefault(key, []).append(row)
+            self._remap()
+            if self._hnswlib is not None:
+                if os.path.exists(self._ann_path):
+                    os.remove(self._ann_path)
+                self._load_ann()
+            self.save()
+            return dead
+
+    # -- indexing ---------------------------------------------------------
+
+    def index_issues(self, issues: Iterable[Dict], batch_size: int = 256) -> int:
+        """
+        Embed and (re-)index issues in batches
+        
+        Existing passages of an issue are replaced, so this serves both the
+        initial build and incremental updates.
+        
+        Args:
+            issues: Issues with INDEX_FIELDS (e.g. from JiraMirror.iter_issues)
+            batch_size: Passages embedded per model call
+            
+        Returns:
+            Number of issues indexed
+        """
+        count = 0
+        entries: List[Tuple[str, str]] = []
+        texts: List[str] = []
+
+        def flush():
+            if texts:
+                self.add(entries, embed_texts(texts, batch_size, self.embedder))
+                entries.clear()
+                texts.clear()
+
+        for issue in issues:
+            key = issue['key']
+            self.remove([key])
+            self.summaries[key] = (issue.get('fields') or {}).get('summary') or ''
+            for kind, text in issue_passages(issue):
+                entries.append((key, kind))
+                texts.append(text)
+            count += 1
+            if len(texts) >= batch_size:
+                flush()
+        flush()
+        self.last_update = time.time()
+        if len(self._rows) > 1.3 * max(len(self), 1):
+            self.compact()
+        else:
+            self.save()
+        return count
+
+    # -- search -----------------------------------------------------------
+
+    def entry(self, row: int) -> Tuple[str, str]:
+        """``(issue_key, kind)`` of a passage row."""
+        return self._rows[row]
+
+    def search_vector(self, query: np.ndarray, k: int = 10, exact: bool = False) -> List[Tuple[int, float]]:
+        """
+        Nearest passages to a query vector
+        
+        Args:
+            query: Unit-length query vector
+            k: Number of passages to return
+            exact: Skip the HNSW graph and scan every vector
+            
+        Returns:
+            ``(row, cosine similarity)`` pairs, best first
+        """
+        vectors = self._vectors
+        if vectors is None or not len(self):
+            return []
+        k = min(k, len(self))
+        if self._ann is not None and not exact:
+            self._ann.set_ef(max(self.ef_search, k))
+            labels, distances = self._ann.knn_query(query.reshape(1, -1), k=k)
+            return [(int(row), float(1 - dist)) for row, dist in zip(labels[0], distances[0])]
+        scores = vectors @ query
+        scores[~self._alive[:len(scores)]] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def search(self, query: str, k: int = 10) -> List[Dict]:
+        """
+        Find the issues most similar to a natural-language query
+        
+        Args:
+            query: Free-text query
+            k: Number of issues to return
+            
+        Returns:
+            Issues as ``{key, summary, score, matched}``, best first; ``matched``
+            is the passage that scored best ('issue' or 'comment:<id>')
+        """
+        rows = self.search_vector(embed_query(query, self.embedder), k * 4)
+        results: Dict[str, Dict] = {}
+        for row, score in rows:
+            key, kind = self._rows[row]
+            if key not in results:
+                results[key] = {'key': key, 'summary': self.summaries.get(key, ''),
+                                'score': round(score, 4), 'matched': kind}
+            if len(results) == k:
+                break
+        return list(results.values())
+
+
+_kb_index: Optional[SemanticIndex] = None
+
+
+def get_kb_index() -> SemanticIndex:
+    """Open the shared knowledge base index (KB_INDEX_PATH) on first use."""
+    global _kb_index
+    if _kb_index is None:
+        _kb_index = SemanticIndex(KB_INDEX_PATH)
+    return _kb_index
+
+
+async def semantic_search_issues(query: str, k: int = 10) -> Dict:
+    """
+    Find historical Jira tickets semantically similar to a query, matching
+    on summaries, descriptions and comments (paraphrases included).
+    
+    Args:
+        query: Natural-language description of the problem or topic.
+        k: Number of tickets to return (default: 10).
+        
+    Returns:
+        Dictionary with the matching tickets (key, summary, similarity score
+        and which passage matched), best first.
+    """
+    index = get_kb_index()
+    if not len(index):
+        return {'error': 'The knowledge base index is empty; build it with `python -m services.kb_search build`.'}
+    # Embedding the query is CPU-bound; keep it off the event loop
+    results = await asyncio.to_thread(index.search, query, k)
+    return {'query': query, 'results': results}
+
+
+__getattr__ = lazy_globals(globals(), semantic_search_issues_tool=function_tool(semantic_search_issues))
+
@@ -0,0 +1,398 @@
+import asyncio
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from utils.config import KB_INDEX_PATH, KB_INDEX_JQL, KB_RERANK_MODEL
+from services.embeddings import embed_query
+from services.kb_index import SemanticIndex, get_kb_index, issue_passages, INDEX_FIELDS
+from services.lazy import function_tool, lazy_globals
+
+# Tokens keep dotted/dashed/underscored runs whole, so error strings
+# (ERR_CONN_RESET, java.lang.NullPointerException) and ticket keys (PROJ-123)
+# match exactly; the parts are indexed as well for partial matches.
+_TOKEN_RE = re.compile(r"[a-z0-9_]+(?:[-.:/][a-z0-9_]+)*")
+_SPLIT_RE = re.compile(r"[-.:/]")
+_ISSUE_KEY_RE = re.compile(r"\b[A-Z][A-Z0-9_]+-\d+\b")
+# Reciprocal-rank fusion constant (Cormack et al.)
+RRF_K = 60
+# Candidates taken from each retriever before fusion
+CANDIDATES = 50
+SNIPPET_CHARS = 240
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens, plus the parts of compound tokens."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        if _SPLIT_RE.search(token):
+            tokens.extend(part for part in _SPLIT_RE.split(token) if part)
+    return tokens
+
+
+def make_snippet(text: str, terms: Iterable[str], width: int = SNIPPET_CHARS) -> str:
+    """Window of ``text`` around the first query term it contains."""
+    text = " ".join(text.split())
+    lowered = text.lower()
+    positions = [pos for pos in (lowered.find(term) for term in terms) if pos >= 0]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    snippet = text[start:start + width]
+    if start > 0:
+        snippet = "…" + snippet
+    if start + width < len(text):
+        snippet += "…"
+    return snippet
+
+
+class BM25Index:
+    """
+    Passage-level BM25 over issue text.
+    
+    Passage text lives in SQLite (for snippets and rebuilds); postings are
+    kept in memory as per-term row/term-frequency arrays, scored with NumPy
+    and snapshotted to ``postings.npz`` on save. Passages written after the
+    last snapshot are replayed from SQLite on load. Re-indexing an issue
+    tombstones its old passages; ``compact`` drops them and rebuilds.
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            path: Index directory (shared with SemanticIndex)
+            k1: Term-frequency saturation
+            b: Length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._snapshot_path = os.path.join(path, 'postings.npz')
+        self._conn = sqlite3.connect(os.path.join(path, 'passages.sqlite3'), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS passages (
+                row INTEGER PRIMARY KEY, key TEXT NOT NULL, kind TEXT NOT NULL, text TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS passages_key ON passages(key);
+        """)
+        self._load()
+
+    def _load(self, use_snapshot: bool = True) -> None:
+        """Restore postings from the snapshot and replay passages written after it."""
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._entries: Dict[int, Tuple[str, str]] = {}
+        self._by_key: Dict[str, List[int]] = {}
+        self._lengths = array('f')
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._np_lengths: Optional[np.ndarray] = None
+        snapshot_max = -1
+        if use_snapshot and os.path.exists(self._snapshot_path):
+            with np.load(self._snapshot_path) as snapshot:
+                offsets, rows, tfs = snapshot['offsets'], snapshot['rows'], snapshot['tfs']
+                for i, term in enumerate(snapshot['terms'].tolist()):
+                    term_rows, term_tfs = array('i'), array('f')
+                    term_rows.frombytes(rows[offsets[i]:offsets[i + 1]].tobytes())
+                    term_tfs.frombytes(tfs[offsets[i]:offsets[i + 1]].tobytes())
+                    self._postings[term] = (term_rows, term_tfs)
+                self._lengths.frombytes(snapshot['lengths'].tobytes())
+                snapshot_max = int(snapshot['max_row'])
+        for row, key, kind in self._conn.execute("SELECT row, key, kind FROM passages WHERE row <= ?", (snapshot_max,)):
+            self._entries[row] = (key, kind)
+            self._by_key.setdefault(key, []).append(row)
+        # Passages deleted since the snapshot
+        for row in range(len(self._lengths)):
+            if row not in self._entries:
+                self._lengths[row] = 0.0
+        self._total_length = float(sum(self._lengths))
+        for row, key, kind, text in self._conn.execute(
+                "SELECT row, key, kind, text FROM passages WHERE row > ? ORDER BY row", (snapshot_max,)):
+            self._add_postings(row, key, kind, text)
+
+    def save(self) -> None:
+        """Snapshot the postings so the next start does not re-tokenize every passage."""
+        with self._lock:
+            self._conn.commit()
+            terms = list(self._postings)
+            lengths = [len(self._postings[term][0]) for term in terms]
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            rows = np.concatenate([np.frombuffer(self._postings[t][0], dtype=np.int32) for t in terms] or
+                                  [np.zeros(0, dtype=np.int32)])
+            tfs = np.concatenate([np.frombuffer(self._postings[t][1], dtype=np.float32) for t in terms] or
+                                 [np.zeros(0, dtype=np.float32)])
+            tmp_path = self._snapshot_path + '.tmp.npz'
+            np.savez(tmp_path, terms=np.array(terms, dtype=str), offsets=offsets, rows=rows, tfs=tfs,
+                     lengths=np.frombuffer(self._lengths, dtype=np.float32), max_row=len(self._lengths) - 1)
+            os.replace(tmp_path, self._snapshot_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add_postings(self, row: int, key: str, kind: str, text: str) -> None:
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            rows, tfs = self._postings.setdefault(token, (array('i'), array('f')))
+            rows.append(row)
+            tfs.append(tf)
+            self._arrays.pop(token, None)
+        if len(self._lengths) <= row:
+            self._lengths.extend([0.0] * (row + 1 - len(self._lengths)))
+        length = float(sum(counts.values()))
+        self._lengths[row] = length
+        self._total_length += length
+        self._np_lengths = None
+        self._entries[row] = (key, kind)
+        self._by_key.setdefault(key, []).append(row)
+
+    def index_issue(self, issue: Dict, commit: bool = True) -> None:
+        """Replace the passages of one issue."""
+        key = issue['key']
+        with self._lock:
+            self.remove([key], commit=False)
+            next_row = len(self._lengths)
+            for offset, (kind, text) in enumerate(issue_passages(issue)):
+                if kind == 'issue':
+                    text = f"{key} {text}"
+                self._conn.execute("INSERT INTO passages (row, key, kind, text) VALUES (?, ?, ?, ?)",
+                                   (next_row + offset, key, kind, text))
+                self._add_postings(next_row + offset, key, kind, text)
+            if commit:
+                self._conn.commit()
+
+    def remove(self, issue_keys: Iterable[str], commit: bool = True) -> None:
+        """Drop every passage of the given issues (postings keep tombstones until compact)."""
+        with self._lock:
+            for key in issue_keys:
+                for row in self._by_key.pop(key, []):
+                    self._entries.pop(row, None)
+                    self._total_length -= self._lengths[row]
+                    self._lengths[row] = 0.0
+                self._conn.execute("DELETE FROM passages WHERE key = ?", (key,))
+            self._np_lengths = None
+            if commit:
+                self._conn.commit()
+
+    def compact(self) -> None:
+        """Rebuild postings without tombstoned rows."""
+        with self._lock:
+            self._load(use_snapshot=False)
+            self.save()
+
+    def search(self, query: str, k: int = CANDIDATES) -> List[Tuple[int, float]]:
+        """
+        Top passages for a query by BM25
+        
+        Returns:
+            ``(row, score)`` pairs, best first
+        """
+        with self._lock:
+            if not self._entries:
+                return []
+            if self._np_lengths is None:
+                self._np_lengths = np.frombuffer(self._lengths, dtype=np.float32).copy()
+            lengths = self._np_lengths
+            passages = len(self._entries)
+            norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / passages))
+            scores = np.zeros(len(lengths), dtype=np.float32)
+            for term in set(tokenize(query)):
+                posting = self._arrays.get(term)
+                if posting is None:
+                    if term not in self._postings:
+                        continue
+                    rows, tfs = self._postings[term]
+                    posting = self._arrays[term] = (np.frombuffer(rows, dtype=np.int32).copy(),
+                                                    np.frombuffer(tfs, dtype=np.float32).copy())
+                rows, tfs = posting
+                idf = math.log(1 + (passages - len(rows) + 0.5) / (len(rows) + 0.5))
+                scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm[rows])
+            # Tombstoned rows have zero length; mask them out
+            scores[lengths == 0] = 0
+            hits = np.flatnonzero(scores)
+            if not len(hits):
+                return []
+            if len(hits) > k:
+                hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            hits = hits[np.argsort(-scores[hits])]
+            return [(int(row), float(scores[row])) for row in hits]
+
+    def entry(self, row: int) -> Optional[Tuple[str, str]]:
+        """``(issue_key, kind)`` of a passage row."""
+        return self._entries.get(row)
+
+    def passage_text(self, key: str, kind: str) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM passages WHERE key = ? AND kind = ?", (key, kind)).fetchone()
+        return row[0] if row else ''
+
+
+class KnowledgeBase:
+    """
+    Hybrid retrieval over historical tickets: BM25 for exact strings and
+    ticket keys, embeddings for paraphrases, fused with reciprocal-rank
+    fusion and optionally re-ranked by a cross-encoder.
+    """
+
+    def __init__(self, semantic: SemanticIndex, bm25: BM25Index, rerank_model: str = KB_RERANK_MODEL):
+        """
+        Args:
+            semantic: Vector index
+            bm25: Keyword index over the same passages
+            rerank_model: Cross-encoder model name; empty disables re-ranking
+        """
+        self.semantic = semantic
+        self.bm25 = bm25
+        self.rerank_model = rerank_model
+        self._reranker = None
+
+    def _get_reranker(self):
+        if self._reranker is None:
+            from sentence_transformers import CrossEncoder
+            self._reranker = CrossEncoder(self.rerank_model)
+        return self._reranker
+
+    def index_issues(self, issues: Iterable[Dict], batch_size: int = 256) -> int:
+        """Index issues into both the keyword and the vector index."""
+        def tee():
+            for issue in issues:
+                self.bm25.index_issue(issue, commit=False)
+                yield issue
+        count = self.semantic.index_issues(tee(), batch_size)
+        self.bm25.save()
+        return count
+
+    def remove(self, issue_keys: List[str]) -> None:
+        self.bm25.remove(issue_keys)
+        self.semantic.remove(issue_keys)
+        self.semantic.save()
+
+    def compact(self) -> int:
+        self.bm25.compact()
+        return self.semantic.compact()
+
+    def search(self, query: str, k: int = 10, rerank: Optional[bool] = None) -> List[Dict]:
+        """
+        Find the issues most relevant to a query
+        
+        Args:
+            query: Free text: a question, an error string or a ticket key
+            k: Number of issues to return
+            rerank: Re-rank fused candidates with the cross-encoder
+                (default: when a rerank model is configured)
+            
+        Returns:
+            Issues as ``{key, summary, score, matched, snippet, sources}``,
+            best first; ``snippet`` is the best-matching passage excerpt and
+            ``sources`` says which retrievers found it
+        """
+        fused: Dict[Tuple[str, str], float] = {}
+        sources: Dict[Tuple[str, str], List[str]] = {}
+
+        def fuse(entries, source):
+            for rank, entry in enumerate(entries):
+                if entry is None:
+                    continue
+                fused[entry] = fused.get(entry, 0.0) + 1.0 / (RRF_K + rank + 1)
+                sources.setdefault(entry, []).append(source)
+
+        fuse([self.bm25.entry(row) for row, _ in self.bm25.search(query, CANDIDATES)], 'keyword')
+        if len(self.semantic):
+            vector_rows = self.semantic.search_vector(embed_query(query, self.semantic.embedder), CANDIDATES)
+            fuse([self.semantic.entry(row) for row, _ in vector_rows], 'semantic')
+
+        # A ticket key in the query is an exact lookup: pin that ticket first
+        for key in _ISSUE_KEY_RE.findall(query):
+            if (key, 'issue') in fused:
+                fused[(key, 'issue')] += 1.0
+
+        ranked = sorted(fused, key=fused.get, reverse=True)
+        if rerank is None:
+            rerank = bool(self.rerank_model)
+        if rerank and ranked:
+            candidates = ranked[:max(2 * k, 20)]
+            texts = [self.bm25.passage_text(key, kind) for key, kind in candidates]
+            scores = self._get_reranker().predict([(query, text) for text in texts])
+            order = np.argsort(-np.asarray(scores))
+            ranked = [candidates[i] for i in order]
+            fused = {candidates[i]: float(scores[i]) for i in order}
+
+        terms = [t for t in tokenize(query) if len(t) > 2]
+        results: Dict[str, Dict] = {}
+        for key, kind in ranked:
+            if key in results:
+                continue
+            results[key] = {
+                'key': key,
+                'summary': self.semantic.summaries.get(key, ''),
+                'score': round(fused[(key, kind)], 4),
+                'matched': kind,
+                'snippet': make_snippet(self.bm25.passage_text(key, kind), terms),
+                'sources': sources[(key, kind)],
+            }
+            if len(results) == k:
+                break
+        return list(results.values())
+
+
+_knowledge_base: Optional[KnowledgeBase] = None
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Open the shared hybrid knowledge base (KB_INDEX_PATH) on first use."""
+    global _knowledge_base
+    if _knowledge_base is None:
+        _knowledge_base = KnowledgeBase(get_kb_index(), BM25Index(KB_INDEX_PATH))
+    return _knowledge_base
+
+
+async def search_knowledge_base(query: str, k: int = 10) -> Dict:
+    """
+    Search historical Jira tickets and comments. Matches exact error strings
+    and ticket keys as well as paraphrases, and returns the relevant passage
+    excerpt for each ticket so no follow-up detail lookup is needed.
+    
+    Args:
+        query: Question, error message, ticket key or topic.
+        k: Number of tickets to return (default: 10).
+        
+    Returns:
+        Dictionary with the matching tickets (key, summary, score, matching
+        passage and snippet), best first.
+    """
+    kb = get_knowledge_base()
+    if not len(kb.bm25):
+        return {'error': 'The knowledge base index is empty; build it with `python -m services.kb_search build`.'}
+    results = await asyncio.to_thread(kb.search, query, k)
+    return {'query': query, 'results': results}
+
+
+__getattr__ = lazy_globals(globals(), search_knowledge_base_tool=function_tool(search_knowledge_base))
+
+
+if __name__ == "__main__":
+    import argparse
+    from services.jira_client import jira_client, jira_mirror
+
+    parser = argparse.ArgumentParser(description="Build or update the knowledge base indexes (KB_INDEX_PATH)")
+    parser.add_argument("command", choices=["build", "update", "compact"])
+    args = parser.parse_args()
+
+    kb = get_knowledge_base()
+    if args.command == "compact":
+        print(f"Dropped {kb.compact()} tombstoned rows")
+    elif args.command == "build" and jira_mirror is not None and jira_mirror.count():
+        print(f"Indexed {kb.index_issues(jira_mirror.iter_issues())} issues from the mirror")
+    else:
+        jql = KB_INDEX_JQL
+        if args.command == "update" and kb.semantic.last_update:
+            minutes = math.ceil((time.time() - kb.semantic.last_update) / 60) + 5
+            jql = f'({jql}) AND updated >= "-{minutes}m"'
+        issues = jira_client.iter_search_issues(jql, page_size=100, fields=INDEX_FIELDS, use_cache=False)
+        print(f"Indexed {kb.index_issues(issues)} issues from Jira")
@@ -0,0 +1,40 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+def lazy_globals(namespace: Dict[str, Any], **factories: Callable[[], Any]) -> Callable[[str], Any]:
+    """
+    Module ``__getattr__`` that builds each of ``factories`` on first access
+
+    Assign the result to ``__getattr__`` in the module. ``from module import
+    name`` and ``module.name`` then call the factory once and keep its value
+    as an ordinary module global. Code inside the module itself cannot
+    refer to these names directly, as bare-name lookups skip ``__getattr__``.
+
+    Args:
+        namespace: The module's ``globals()``
+        **factories: Name -> callable returning its value
+
+    Returns:
+        The module ``__getattr__``
+    """
+    lock = threading.RLock()
+
+    def __getattr__(name: str) -> Any:
+        factory = factories.get(name)
+        if factory is None:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}")
+        with lock:
+            if name not in namespace:
+                namespace[name] = factory()
+        return namespace[name]
+
+    return __getattr__
+
+
+def function_tool(func: Callable) -> Callable[[], Any]:
+    """Factory of ``FunctionTool(func)``; google.adk is imported when the tool is first built."""
+    def build():
+        from google.adk.tools import FunctionTool
+        return FunctionTool(func)
+    return build
@@ -0,0 +1,384 @@
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple, Type
+from services.telemetry import add_event
+
+# Status codes worth retrying: throttling and transient gateway errors
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+# The only ones a non-idempotent request may be retried on: a 429 means the
+# request was not processed, while a gateway error may arrive after it was
+THROTTLED_STATUSES = frozenset({429})
+
+
+class RateLimitExceeded(Exception):
+    """Raised when Jira keeps throttling a request after every retry."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+    
+    Args:
+        value: Delay in seconds or an HTTP date
+        
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    ``reserve`` never blocks: it takes a token (possibly borrowing against
+    future refills) and returns how long the caller must wait before using
+    it, so the same bucket can pace threads and coroutines alike.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def try_acquire(self, tokens: float = 1.0, keep: float = 0.0) -> bool:
+        """Take tokens only if available right now, leaving at least ``keep`` for other callers."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens - tokens < keep:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so every caller backs off for ``seconds`` (server-imposed pause)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class ConcurrencyLimit:
+    """
+    Counting semaphore shared by threads and by coroutines of any event loop.
+
+    Waiters are served in arrival order: a thread waits on an Event, a
+    coroutine on a future of its own loop, and ``release`` hands the freed
+    slot straight to the first of them.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._free = size
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            future = loop.create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_over = future not in self._waiters
+                if not handed_over:
+                    self._waiters.remove(future)
+            if handed_over:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                    return
+                except RuntimeError:  # its event loop is closed
+                    continue
+            self._free += 1
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 4, base_delay: float = 0.5, max_delay: float = 30.0):
+        """
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Initial backoff in seconds, doubled per attempt
+            max_delay: Upper bound for a single backoff
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Backoff before retry number ``attempt`` (0-based).
+        
+        A server-provided Retry-After wins (plus a little jitter so waiting
+        clients do not return in lockstep); otherwise "full jitter"
+        exponential backoff is used.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class RequestScheduler:
+    """
+    Process-wide pacing, concurrency limit and retry loop for Jira requests.
+    
+    Every attempt takes a token from the shared bucket and a concurrency
+    slot. Throttled (429) and transient (502/503/504) responses are retried
+    per the RetryPolicy, honouring Retry-After; a 429 also pauses the whole
+    bucket so other tools stop hammering the tenant. Non-idempotent requests
+    pass ``retry_statuses=THROTTLED_STATUSES``, as a gateway error may come
+    after the server acted. Threads and coroutines (of any event loop)
+    draw from one ConcurrencyLimit.
+    
+    With a ``parent`` (the scheduler of a whole Jira site), every attempt
+    also takes a token and a concurrency slot from it, so each team sharing
+    the site stays within its own budget and all of them together within
+    the site's. Counters roll up into the parent.
+    """
+
+    def __init__(self, rate: float, burst: float, max_concurrency: int,
+                 policy: Optional[RetryPolicy] = None, parent: Optional["RequestScheduler"] = None):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Requests allowed in a burst above the sustained rate
+            max_concurrency: Maximum requests in flight
+            policy: Retry policy (default: the parent's, else RetryPolicy())
+            parent: Scheduler whose budget this one's requests also count against
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.policy = policy or (parent.policy if parent else RetryPolicy())
+        self.parent = parent
+        self.max_concurrency = max_concurrency
+        self._limit = ConcurrencyLimit(max_concurrency)
+        self._lock = threading.Lock()
+        self._metrics = {
+            'attempts': 0,
+            'throttled': 0,
+            'retries': 0,
+            'give_ups': 0,
+            'limiter_wait_seconds': 0.0,
+            'backoff_seconds': 0.0,
+            'in_flight': 0,
+            'max_in_flight': 0,
+        }
+
+    def _incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._metrics[name] += amount
+            if name == 'in_flight':
+                self._metrics['max_in_flight'] = max(self._metrics['max_in_flight'], self._metrics['in_flight'])
+        if self.parent is not None:
+            self.parent._incr(name, amount)
+
+    def _pace(self, paid: bool = False) -> None:
+        """
+        Wait for a token of this bucket (unless ``paid``), then for one of the
+        parent's. In that order, so a caller over its own budget does not
+        book the site's tokens ahead of callers within theirs.
+        """
+        wait = 0.0 if paid else self.bucket.reserve()
+        if wait:
+            self._incr('limiter_wait_seconds', wait)
+            time.sleep(wait)
+        if self.parent is not None:
+            self.parent._pace()
+
+    async def _pace_async(self) -> None:
+        """Coroutine counterpart of ``_pace``."""
+        wait = self.bucket.reserve()
+        if wait:
+            self._incr('limiter_wait_seconds', wait)
+            await asyncio.sleep(wait)
+        if self.parent is not None:
+            await self.parent._pace_async()
+
+    def _penalize(self, seconds: float) -> None:
+        self.bucket.penalize(seconds)
+        if self.parent is not None:
+            self.parent._penalize(seconds)
+
+    @contextlib.contextmanager
+    def _slot(self):
+        """Hold a concurrency slot of this scheduler and of every parent (thread callers)."""
+        self._limit.acquire()
+        try:
+            if self.parent is None:
+                yield
+            else:
+                with self.parent._slot():
+                    yield
+        finally:
+            self._limit.release()
+
+    @contextlib.asynccontextmanager
+    async def _async_slot(self):
+        """Hold a concurrency slot of this scheduler and of every parent (coroutines)."""
+        await self._limit.acquire_async()
+        try:
+            if self.parent is None:
+                yield
+            else:
+                async with self.parent._async_slot():
+                    yield
+        finally:
+            self._limit.release()
+
+    def snapshot(self) -> Dict:
+        """Return throttle/retry counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['limiter_wait_seconds'] = round(metrics['limiter_wait_seconds'], 3)
+        metrics['backoff_seconds'] = round(metrics['backoff_seconds'], 3)
+        return metrics
+
+    def _next_delay(self, attempt: int, status: Optional[int], headers) -> Optional[float]:
+        """Backoff before the next attempt, or None when the result should be returned."""
+        if attempt >= self.policy.max_retries:
+            if status is not None:
+                self._incr('give_ups')
+            return None
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+        if status == 429:
+            self._incr('throttled')
+            if retry_after is not None:
+                self._penalize(retry_after)
+        delay = self.policy.delay(attempt, retry_after)
+        self._incr('retries')
+        self._incr('backoff_seconds', delay)
+        add_event('retry', {'attempt': attempt + 1, 'status': status or 0, 'delay_seconds': delay})
+        return delay
+
+    def send(self, request: Callable[[], Any], retry_exceptions: Tuple[Type[BaseException], ...] = (),
+             paid: bool = False, retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES):
+        """
+        Run a blocking request with pacing, concurrency limit and retries.
+        
+        Args:
+            request: Zero-argument callable performing one attempt and
+                     returning a response with ``status_code`` and ``headers``
+            retry_exceptions: Exception types worth retrying (e.g. connection
+                              errors for idempotent requests)
+            paid: The caller already took the first attempt's token from
+                  ``bucket`` (e.g. with ``try_acquire``)
+            retry_statuses: Response statuses worth retrying
+                            (THROTTLED_STATUSES for non-idempotent requests)
+                              
+        Returns:
+            The last response; it may still carry a retryable status once
+            retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self._pace(paid and attempt == 0)
+            with self._slot():
+                self._incr('attempts')
+                self._incr('in_flight')
+                try:
+                    response = request()
+                except retry_exceptions:
+                    delay = self._next_delay(attempt, None, None)
+                    if delay is None:
+                        self._incr('give_ups')
+                        raise
+                    response = None
+                finally:
+                    self._incr('in_flight', -1)
+            if response is not None:
+                if response.status_code not in retry_statuses:
+                    return response
+                delay = self._next_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def send_async(self, request: Callable[[], Awaitable[Any]],
+                         retry_exceptions: Tuple[Type[BaseException], ...] = (),
+                         retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES):
+        """Coroutine counterpart of ``send``; ``request`` returns an awaitable."""
+        attempt = 0
+        while True:
+            await self._pace_async()
+            async with self._async_slot():
+                self._incr('attempts')
+                self._incr('in_flight')
+                try:
+                    response = await request()
+                except retry_exceptions:
+                    delay = self._next_delay(attempt, None, None)
+                    if delay is None:
+                        self._incr('give_ups')
+                        raise
+                    response = None
+                finally:
+                    self._incr('in_flight', -1)
+            if response is not None:
+                if response.status_code not in retry_statuses:
+                    return response
+                delay = self._next_delay(attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
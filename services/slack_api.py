@@ -0,0 +1,149 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from services.rate_limit import RETRYABLE_STATUSES, THROTTLED_STATUSES, RequestScheduler, RetryPolicy
+from services.telemetry import span
+
+# Sustained calls per second for Slack's Web API rate-limit tiers (per method, per workspace)
+SLACK_TIERS = {1: 1 / 60, 2: 20 / 60, 3: 50 / 60, 4: 100 / 60}
+
+# Tier of each method the bridge calls; anything else is treated as Tier 3
+METHOD_TIERS = {
+    "auth.test": 4,
+    "chat.update": 3,
+    "chat.delete": 3,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "users.info": 4,
+}
+
+# Methods safe to repeat after a gateway error (502/503/504); anything else
+# (e.g. chat.postMessage) may already have taken effect and is only retried on a 429
+IDEMPOTENT_METHODS = {"auth.test", "chat.update", "conversations.history", "conversations.replies", "users.info"}
+
+# chat.postMessage has its own limit: about one message per second per channel
+# (paced a little under it so back-to-back queued replies do not trip it)
+PER_CHANNEL_METHODS = {"chat.postMessage": 0.9}
+
+
+class SlackAPI:
+    def __init__(self, base_url: str, token: str,
+                 timeout: Tuple[float, float] = (3.05, 10.0),
+                 pool_maxsize: int = 10,
+                 rates: Optional[Dict[str, float]] = None,
+                 burst: float = 5,
+                 policy: Optional[RetryPolicy] = None):
+        """
+        Initialize Slack Web API client
+
+        Calls share one keep-alive ``requests.Session`` and are paced by a
+        RequestScheduler per method (per channel for chat.postMessage) sized
+        from Slack's rate-limit tier. Callers over the budget wait their turn
+        instead of being rejected, and a 429 pauses that method for the
+        Retry-After Slack sends before the call is retried.
+
+        Args:
+            base_url: Web API URL (e.g. 'https://slack.com/api')
+            token: Bot token (xoxb-...)
+            timeout: (connect, read) timeout in seconds
+            pool_maxsize: Maximum number of keep-alive connections
+            rates: Per-method calls per second overriding the tier defaults
+            burst: Calls allowed in a burst above the sustained rate
+            policy: Retry policy for throttled and transient responses
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.rates = rates or {}
+        self.burst = burst
+        self.pool_maxsize = pool_maxsize
+        self.policy = policy or RetryPolicy(max_retries=3, base_delay=0.5, max_delay=60.0)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json; charset=utf-8',
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._schedulers: Dict[str, RequestScheduler] = {}
+        self._lock = threading.Lock()
+
+    def rate(self, method: str) -> float:
+        """Sustained calls per second allowed for ``method``."""
+        if method in self.rates:
+            return self.rates[method]
+        if method in PER_CHANNEL_METHODS:
+            return PER_CHANNEL_METHODS[method]
+        return SLACK_TIERS[METHOD_TIERS.get(method, 3)]
+
+    def scheduler(self, method: str, channel: Optional[str] = None) -> RequestScheduler:
+        """
+        Get the send queue for ``method`` (and ``channel`` for per-channel methods)
+
+        Args:
+            method: Web API method, e.g. 'chat.update'
+            channel: Channel ID, only used by per-channel methods
+
+        Returns:
+            The RequestScheduler pacing those calls
+        """
+        key = f"{method}:{channel}" if method in PER_CHANNEL_METHODS else method
+        with self._lock:
+            if key not in self._schedulers:
+                if method in PER_CHANNEL_METHODS:
+                    burst, concurrency = 1, 1
+                else:
+                    burst, concurrency = self.burst, self.pool_maxsize
+                self._schedulers[key] = RequestScheduler(self.rate(method), burst, concurrency, policy=self.policy)
+            return self._schedulers[key]
+
+    def call(self, method: str, payload: Optional[Dict] = None, paid: bool = False) -> requests.Response:
+        """
+        Call a Web API method, waiting for its rate-limit budget
+
+        Args:
+            method: Web API method, e.g. 'chat.postMessage'
+            payload: JSON body
+            paid: The caller already took this call's token from the
+                  method's bucket (see ``scheduler``)
+
+        Returns:
+            The final response; it may still be a 429 once retries are exhausted
+        """
+        payload = payload or {}
+        scheduler = self.scheduler(method, payload.get("channel"))
+        url = f"{self.base_url}/{method}"
+        with span(f"slack {method}") as current:
+            # Only a failed connect is safe to retry; the message may have been posted otherwise
+            response = scheduler.send(lambda: self.session.post(url, json=payload, timeout=self.timeout),
+                                      retry_exceptions=(requests.exceptions.ConnectTimeout,), paid=paid,
+                                      retry_statuses=RETRYABLE_STATUSES if method in IDEMPOTENT_METHODS
+                                      else THROTTLED_STATUSES)
+            if current.is_recording():
+                current.set_attributes({
+                    'http.response.status_code': response.status_code,
+                    'http.request.body.size': len(response.request.body or b''),
+                    'http.response.body.size': len(response.content),
+                })
+        return response
+
+    def get_throttle_stats(self) -> Dict:
+        """
+        Get rate-limiter and retry counters
+
+        Returns:
+            Dictionary of per-queue attempts, throttled responses, retries and wait time
+        """
+        with self._lock:
+            schedulers = dict(self._schedulers)
+        return {key: scheduler.snapshot() for key, scheduler in schedulers.items()}
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
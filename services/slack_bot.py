@@ -1,42 +1,101 @@
 # slack_adk_bot_sessions.py
 from flask import Flask, request, make_response
+import json
 import os
+import queue
+import threading
+import time
 import requests
 import uuid
+from collections import OrderedDict
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import project_path
+from services.slack_api import SlackAPI
+from services.slack_sessions import SessionRegistry
+from services.telemetry import metrics, set_attribute, setup_telemetry, span
+from services.tenants import tenant_registry
 
 load_dotenv()
 
 app = Flask(__name__)
+# Spans for each Slack event, ADK run and Slack API call (TELEMETRY=1); /metrics serves them
+setup_telemetry("sprintmind-slack-bot")
 
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
-ADK_BASE_URL = "http://127.0.0.1:8000"
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api")
+ADK_BASE_URL = os.environ.get("ADK_BASE_URL", "http://127.0.0.1:8000")
 ADK_AGENT_NAME = "agents"
 
-# store user sessions in memory
-user_sessions = {}
+# Timeouts in seconds; the ADK read timeout bounds the wait for the next event of a run
+SLACK_CONNECT_TIMEOUT = float(os.environ.get("SLACK_CONNECT_TIMEOUT", "3.05"))
+SLACK_TIMEOUT = float(os.environ.get("SLACK_TIMEOUT", "10"))
+ADK_CONNECT_TIMEOUT = float(os.environ.get("ADK_CONNECT_TIMEOUT", "3.05"))
+ADK_TIMEOUT = float(os.environ.get("ADK_TIMEOUT", "300"))
 
-# fetch bot user id
-SLACK_BOT_USER_ID = None
-def get_bot_user_id():
-    global SLACK_BOT_USER_ID
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-    resp = requests.get("https://slack.com/api/auth.test", headers=headers)
-    data = resp.json()
-    if data.get("ok"):
-        SLACK_BOT_USER_ID = data["user_id"]
-    print("Bot user ID:", SLACK_BOT_USER_ID)
+# Background processing of Slack events
+SLACK_WORKERS = int(os.environ.get("SLACK_WORKERS", "4"))
+SLACK_QUEUE_SIZE = int(os.environ.get("SLACK_QUEUE_SIZE", "100"))
+SLACK_DEDUP_TTL = float(os.environ.get("SLACK_DEDUP_TTL", "600"))
+
+# ADK session per Slack conversation (user, channel, thread)
+SLACK_SESSION_TTL = float(os.environ.get("SLACK_SESSION_TTL", "28800"))
+SLACK_SESSION_DB = project_path(os.environ.get("SLACK_SESSION_DB", ""))
+session_registry = SessionRegistry(SLACK_SESSION_TTL, SLACK_SESSION_DB or None)
+
+# Stream replies from /run_sse into a placeholder message (0 = wait for /run)
+SLACK_STREAMING = os.environ.get("SLACK_STREAMING", "1") == "1"
+SLACK_UPDATE_INTERVAL = float(os.environ.get("SLACK_UPDATE_INTERVAL", "1.0"))
+# Workspace-wide chat.update budget (Tier 3 is ~50/minute)
+SLACK_UPDATE_RATE = float(os.environ.get("SLACK_UPDATE_RATE", "0.8"))
+
+# Keep-alive clients for both upstreams; Slack calls wait in per-method
+# (per-channel for chat.postMessage) send queues sized from Slack's rate tiers
+slack_api = SlackAPI(SLACK_API_URL, SLACK_BOT_TOKEN, timeout=(SLACK_CONNECT_TIMEOUT, SLACK_TIMEOUT),
+                     pool_maxsize=SLACK_WORKERS * 2, rates={"chat.update": SLACK_UPDATE_RATE})
+update_bucket = slack_api.scheduler("chat.update").bucket
 
-get_bot_user_id()
+adk_http = requests.Session()
+adk_http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=SLACK_WORKERS))
+adk_http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=SLACK_WORKERS))
+ADK_TIMEOUTS = (ADK_CONNECT_TIMEOUT, ADK_TIMEOUT)
+
+# Bot user id, looked up on first use so startup needs no network round-trip
+SLACK_BOT_USER_ID = os.environ.get("SLACK_BOT_USER_ID") or None
+_bot_user_lock = threading.Lock()
+
+def get_bot_user_id(data=None):
+    """
+    Return the bot's user id, taking it from an event's ``authorizations``
+    when present and calling auth.test (once) otherwise.
+    """
+    global SLACK_BOT_USER_ID
+    if SLACK_BOT_USER_ID:
+        return SLACK_BOT_USER_ID
+    for authorization in (data or {}).get("authorizations") or []:
+        if authorization.get("is_bot") and authorization.get("user_id"):
+            SLACK_BOT_USER_ID = authorization["user_id"]
+            return SLACK_BOT_USER_ID
+    with _bot_user_lock:
+        if SLACK_BOT_USER_ID is None:
+            try:
+                resp = slack_api.call("auth.test")
+                if resp.ok and resp.json().get("ok"):
+                    SLACK_BOT_USER_ID = resp.json()["user_id"]
+                    print("Bot user ID:", SLACK_BOT_USER_ID)
+            except requests.RequestException as e:
+                print(f"Error fetching bot user id: {e}")
+    return SLACK_BOT_USER_ID
 
-def get_or_create_session(user_id):
-    # Generate a consistent session ID (or use a mapping to store per-user)
+def create_session(user_id):
     session_id = str(uuid.uuid4())
 
     url = f"{ADK_BASE_URL}/apps/{ADK_AGENT_NAME}/users/{user_id}/sessions/{session_id}"
     
     # Create session with the ID
-    resp = requests.post(url, json={})
+    resp = adk_http.post(url, json={}, timeout=ADK_TIMEOUTS)
     
     if resp.status_code == 200 or resp.status_code == 201:
         print(f"Created session for {user_id}: {session_id}")
@@ -45,24 +104,59 @@ def get_or_create_session(user_id):
         print(f"Failed to create session: {resp.status_code} {resp.text}")
         return None
 
-def run_adk_agent(user_id, user_text):
-    session_id = get_or_create_session(user_id)
-    if not session_id:
-        return "Error creating session"
+def get_or_create_session(user_id, channel_id=None, thread_ts=None):
+    # Reuse the conversation's session so the agent keeps its context
+    key = SessionRegistry.key(user_id, channel_id, thread_ts)
+    session_id = session_registry.get(key)
+    if session_id:
+        return session_id
+    session_id = create_session(user_id)
+    if session_id:
+        session_registry.put(key, session_id)
+    return session_id
 
-    payload = {
-        "appName": ADK_AGENT_NAME,
-        "userId": user_id,
-        "sessionId": session_id,
-        "newMessage": {
-            "parts": [{"text": user_text}],
-            "role": "user"
-        },
-        "streaming": False,
-        "stateDelta": {}
-    }
+def _start_run(user_id, user_text, channel_id, thread_ts, streaming, team_id=None):
+    """POST the message to /run (or /run_sse), recreating the session once if ADK lost it."""
+    key = SessionRegistry.key(user_id, channel_id, thread_ts)
+    endpoint = "run_sse" if streaming else "run"
+    # The agents' Jira tools run against the site, account and board of the channel's team
+    tenant = tenant_registry.resolve(team_id, channel_id)
+    for attempt in range(2):
+        session_id = get_or_create_session(user_id, channel_id, thread_ts)
+        if not session_id:
+            return None
+        # Same attribute as ADK's agent spans, so the bridge and agent traces can be joined
+        set_attribute("gen_ai.conversation.id", session_id)
+
+        payload = {
+            "appName": ADK_AGENT_NAME,
+            "userId": user_id,
+            "sessionId": session_id,
+            "newMessage": {
+                "parts": [{"text": user_text}],
+                "role": "user"
+            },
+            "streaming": streaming,
+            "stateDelta": {"tenant": tenant.name, "board_id": tenant.board_id}
+        }
+
+        resp = adk_http.post(f"{ADK_BASE_URL}/{endpoint}", json=payload, stream=streaming, timeout=ADK_TIMEOUTS)
+        if resp.status_code == 404 and attempt == 0:
+            # The ADK server lost the session (e.g. restarted); start a new one
+            print(f"Session {session_id} not found, creating a new one")
+            resp.close()
+            session_registry.drop(key)
+            continue
+        return resp
+
+def run_adk_agent(user_id, user_text, channel_id=None, thread_ts=None, team_id=None):
+    key = SessionRegistry.key(user_id, channel_id, thread_ts)
+    # One run at a time per conversation; ADK sessions are not safe to append to concurrently
+    with session_registry.lock(key):
+        resp = _start_run(user_id, user_text, channel_id, thread_ts, streaming=False, team_id=team_id)
+    if resp is None:
+        return "Error creating session"
 
-    resp = requests.post(f"{ADK_BASE_URL}/run", json=payload)
     if resp.status_code != 200:
         return f"Error from ADK agent: {resp.status_code} {resp.text}"
 
@@ -77,6 +171,222 @@ def run_adk_agent(user_id, user_text):
 
     return message_text or "No response from ADK agent"
 
+def stream_adk_agent(user_id, user_text, channel_id=None, thread_ts=None, team_id=None):
+    """
+    Run the agent through ADK's /run_sse endpoint.
+    
+    Yields ``("status", text)`` when an agent or tool starts working and
+    ``("text", text)`` with the reply so far as it streams in. The last
+    ``text`` yielded is the final answer.
+    """
+    key = SessionRegistry.key(user_id, channel_id, thread_ts)
+    with session_registry.lock(key):
+        resp = _start_run(user_id, user_text, channel_id, thread_ts, streaming=True, team_id=team_id)
+        if resp is None:
+            yield "text", "Error creating session"
+            return
+        if resp.status_code != 200:
+            yield "text", f"Error from ADK agent: {resp.status_code} {resp.text}"
+            return
+
+        author = None
+        text = ""
+        with resp:
+            # chunk_size=None hands over each event as it arrives instead of filling a buffer
+            for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                if event.get("error"):
+                    yield "text", f"Error from ADK agent: {event['error']}"
+                    return
+                if event.get("author") not in (None, "user", author):
+                    author = event["author"]
+                    yield "status", f"{author.replace('_', ' ')} is working…"
+                for part in (event.get("content") or {}).get("parts", []):
+                    call = part.get("functionCall")
+                    if call and call.get("name") == "transfer_to_agent":
+                        yield "status", f"Handing over to {call.get('args', {}).get('agent_name', 'an agent')}…"
+                    elif call:
+                        yield "status", f"Running `{call.get('name')}`…"
+                    elif "text" in part and not part.get("thought"):
+                        # Partial events carry the next chunk; the final one the whole text
+                        text = text + part["text"] if event.get("partial") else part["text"]
+                        yield "text", text
+        if not text:
+            yield "text", "No response from ADK agent"
+
+def post_message(channel_id, text, thread_ts=None):
+    payload = {
+        "channel": channel_id,
+        "text": text
+    }
+    if thread_ts:
+        payload["thread_ts"] = thread_ts
+    resp = slack_api.call("chat.postMessage", payload)
+    if not resp.ok or not resp.json().get("ok"):
+        print("Slack API error:", resp.status_code, resp.text)
+    return resp
+
+def update_message(channel_id, ts, text, paid=False):
+    payload = {
+        "channel": channel_id,
+        "ts": ts,
+        "text": text
+    }
+    return slack_api.call("chat.update", payload, paid=paid)
+
+
+class MessageStreamer:
+    """
+    Keeps one Slack message in sync with a streaming reply, editing it with
+    chat.update at most once every ``interval`` seconds per message and
+    within the workspace-wide ``update_bucket`` budget. Intermediate edits
+    that do not fit are skipped (the next one carries the newer text) and
+    leave headroom in the bucket for final edits, which wait for budget
+    instead of being skipped. When the budget is already spoken for (a
+    burst of replies), no placeholder is posted and the reply is posted
+    once it is complete, which costs no chat.update at all.
+    """
+
+    def __init__(self, channel_id, thread_ts=None, interval=None):
+        self.channel_id = channel_id
+        self.thread_ts = thread_ts
+        self.interval = SLACK_UPDATE_INTERVAL if interval is None else interval
+        self.text = ""
+        self.status = None
+        self._shown = None
+        self._last_update = 0.0
+        self.ts = None
+        if update_bucket.try_acquire(0, keep=1):
+            resp = post_message(channel_id, ":hourglass_flowing_sand: Working on it…", thread_ts)
+            self.ts = resp.json().get("ts") if resp.ok else None
+
+    def _render(self, final=False):
+        if final or not self.status:
+            return self.text
+        return f"{self.text}\n\n_{self.status}_" if self.text else f":hourglass_flowing_sand: _{self.status}_"
+
+    def push(self, kind, value):
+        if kind == "status":
+            self.status = value
+        else:
+            self.text = value
+        self._flush()
+
+    def _flush(self, final=False):
+        rendered = self._render(final)
+        if rendered == self._shown or not rendered:
+            return
+        if self.ts is None:
+            if final:
+                post_message(self.channel_id, rendered, self.thread_ts)
+            return
+        if final:
+            # The chat.update queue waits for workspace budget
+            time.sleep(max(0.0, self.interval - (time.monotonic() - self._last_update)))
+        elif time.monotonic() - self._last_update < self.interval or not update_bucket.try_acquire(keep=2):
+            return
+        update_message(self.channel_id, self.ts, rendered, paid=not final)
+        self._shown = rendered
+        self._last_update = time.monotonic()
+
+    def finish(self):
+        """Show the final reply, whatever the throttle says."""
+        self._flush(final=True)
+
+
+class EventDeduper:
+    """
+    Remembers recently seen Slack event ids, so an event that Slack
+    redelivers (X-Slack-Retry-Num) is only processed once.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def first_time(self, event_id):
+        """Record ``event_id``; return False if it was already seen within the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            while self._seen and next(iter(self._seen.values())) < now - self.ttl:
+                self._seen.popitem(last=False)
+            if event_id in self._seen:
+                return False
+            self._seen[event_id] = now
+            return True
+
+    def forget(self, event_id):
+        with self._lock:
+            self._seen.pop(event_id, None)
+
+
+event_deduper = EventDeduper(SLACK_DEDUP_TTL)
+# Bounded, so a burst beyond what the workers can absorb is pushed back to Slack
+event_queue = queue.Queue(maxsize=SLACK_QUEUE_SIZE)
+_workers = []
+_workers_lock = threading.Lock()
+
+def handle_event(event, received_at=None):
+    """
+    Run the agent for one Slack message and post its reply.
+
+    ``received_at`` (time.monotonic() when the event came in) records how
+    long it waited for a worker.
+    """
+    user_id = event.get("user")
+    user_text = event.get("text")
+    channel_id = event.get("channel")
+    thread_ts = event.get("thread_ts")
+    team_id = event.get("team")
+    print(f"Message from {user_id}: {user_text}")
+
+    with span("slack.handle_event", {"enduser.id": user_id or "", "slack.channel": channel_id or ""}) as current:
+        if received_at is not None:
+            current.set_attribute("slack.queue_seconds", time.monotonic() - received_at)
+
+        # Replies in a thread continue that thread's session
+        if not SLACK_STREAMING:
+            with span("slack.adk_run"):
+                response_text = run_adk_agent(user_id, user_text, channel_id, thread_ts, team_id)
+            print(f"ADK response: {response_text}")
+            post_message(channel_id, response_text, thread_ts)
+            return
+
+        # Post a placeholder now and fill it in as the agent streams
+        streamer = MessageStreamer(channel_id, thread_ts)
+        try:
+            with span("slack.adk_run") as run_span:
+                for kind, value in stream_adk_agent(user_id, user_text, channel_id, thread_ts, team_id):
+                    if kind == "text" and not streamer.text:
+                        run_span.add_event("first_text")
+                    streamer.push(kind, value)
+        except Exception as e:
+            streamer.text = streamer.text or f"Error from ADK agent: {e}"
+            raise
+        finally:
+            streamer.finish()
+        print(f"ADK response: {streamer.text}")
+
+def _worker():
+    while True:
+        event, received_at = event_queue.get()
+        try:
+            handle_event(event, received_at)
+        except Exception as e:
+            print(f"Error handling Slack event: {e}")
+        finally:
+            event_queue.task_done()
+
+def start_workers(count=SLACK_WORKERS):
+    """Start the background worker pool (once)."""
+    with _workers_lock:
+        while len(_workers) < count:
+            thread = threading.Thread(target=_worker, name=f"slack-worker-{len(_workers)}", daemon=True)
+            thread.start()
+            _workers.append(thread)
 
 
 # 3️⃣ Slack event endpoint
@@ -89,35 +399,40 @@ def slack_events():
     if data.get("type") == "event_callback":
         event = data.get("event", {})
         user_id = event.get("user")
-        channel_id = event.get("channel")
+        # Not every event type carries its workspace; the envelope always does
+        event.setdefault("team", data.get("team_id"))
 
-        if event.get("subtype") == "bot_message" or user_id is None or user_id == SLACK_BOT_USER_ID:
+        if event.get("subtype") == "bot_message" or user_id is None or user_id == get_bot_user_id(data):
             return make_response("", 200)
 
-        user_text = event.get("text")
-        print(f"Message from {user_id}: {user_text}")
-
-        # Call ADK agent
-        response_text = run_adk_agent(user_id, user_text)
-        print(f"ADK response: {response_text}")
-
-        # Send back to Slack
-        # Send back to Slack (fixed)
-        headers = {
-            "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-            "Content-Type": "application/json; charset=utf-8"
-        }
-        payload = {
-            "channel": channel_id,
-            "text": response_text
-        }
-        resp = requests.post("https://slack.com/api/chat.postMessage", headers=headers, json=payload)
-        print("Slack API response:", resp.status_code, resp.text)
+        # Slack redelivers events it did not see acked within 3 seconds
+        event_id = data.get("event_id")
+        retry_num = request.headers.get("X-Slack-Retry-Num")
+        if event_id and not event_deduper.first_time(event_id):
+            print(f"Skipping duplicate event {event_id} (retry {retry_num})")
+            return make_response("", 200, {"X-Slack-No-Retry": "1"})
 
+        # Ack now; the agent runs on the worker pool and replies when done
+        start_workers()
+        try:
+            event_queue.put_nowait((event, time.monotonic()))
+        except queue.Full:
+            print(f"Event queue full, asking Slack to redeliver {event_id}")
+            if event_id:
+                event_deduper.forget(event_id)
+            return make_response("", 503)
 
         return make_response("", 200)
 
     return make_response("", 200)
 
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return make_response(metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
 if __name__ == "__main__":
-    app.run(port=3000)
+    threading.Thread(target=get_bot_user_id, daemon=True).start()
+    start_workers()
+    from services.standup_digest import start_digest_scheduler
+    start_digest_scheduler()
+    app.run(port=3000, threaded=True)
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+SessionKey = Tuple[str, str, str]
+
+
+class SessionRegistry:
+    """
+    Maps a Slack conversation -- (user, channel, thread_ts) -- to the ADK
+    session that holds its context, so follow-up messages reuse the session
+    (and the sprint/board ids and tool results already in it) instead of
+    starting from scratch.
+    
+    Sessions idle for longer than ``ttl`` seconds are forgotten, and so are
+    the per-conversation locks nobody asked for in that time: ``get`` and
+    ``put`` sweep them out every ``evict_interval`` seconds. With a
+    ``path`` the mapping is also kept in SQLite and survives bot restarts
+    (pair it with a durable ADK session service, e.g.
+    ``adk api_server --session_service_uri sqlite:///sessions.db``).
+    """
+
+    def __init__(self, ttl: float, path: Optional[str] = None, evict_interval: Optional[float] = None):
+        """
+        Args:
+            ttl: Idle time in seconds after which a conversation starts a new session
+            path: Optional SQLite file for a durable registry
+            evict_interval: Seconds between two sweeps of idle entries (default: ``ttl``)
+        """
+        self.ttl = ttl
+        self.evict_interval = ttl if evict_interval is None else evict_interval
+        self._sessions: Dict[SessionKey, Tuple[str, float]] = {}
+        # Lock and when it was last handed out
+        self._locks: Dict[SessionKey, Tuple[threading.Lock, float]] = {}
+        self._lock = threading.Lock()
+        self._next_eviction = time.time() + self.evict_interval
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS slack_sessions (
+                    user TEXT NOT NULL, channel TEXT NOT NULL, thread TEXT NOT NULL,
+                    session_id TEXT NOT NULL, last_used REAL NOT NULL,
+                    PRIMARY KEY (user, channel, thread))
+            """)
+            self._conn.commit()
+            cutoff = time.time() - ttl
+            self._conn.execute("DELETE FROM slack_sessions WHERE last_used < ?", (cutoff,))
+            self._conn.commit()
+            for user, channel, thread, session_id, last_used in self._conn.execute(
+                    "SELECT user, channel, thread, session_id, last_used FROM slack_sessions"):
+                self._sessions[(user, channel, thread)] = (session_id, last_used)
+
+    @staticmethod
+    def key(user_id: str, channel_id: Optional[str], thread_ts: Optional[str]) -> SessionKey:
+        return (user_id, channel_id or '', thread_ts or '')
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def lock(self, key: SessionKey) -> threading.Lock:
+        """Per-conversation lock, so two messages do not run on one session at once."""
+        with self._lock:
+            lock = self._locks[key][0] if key in self._locks else threading.Lock()
+            self._locks[key] = (lock, time.time())
+            return lock
+
+    def get(self, key: SessionKey) -> Optional[str]:
+        """Return the conversation's live session id (and mark it used), or None."""
+        now = time.time()
+        self._maybe_evict(now)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return None
+            session_id, last_used = entry
+            if now - last_used > self.ttl:
+                self._forget(key)
+                return None
+            self._sessions[key] = (session_id, now)
+        self._store(key, session_id, now)
+        return session_id
+
+    def put(self, key: SessionKey, session_id: str) -> None:
+        now = time.time()
+        self._maybe_evict(now)
+        with self._lock:
+            self._sessions[key] = (session_id, now)
+        self._store(key, session_id, now)
+
+    def drop(self, key: SessionKey) -> None:
+        """Forget a conversation's session (e.g. the ADK server no longer has it)."""
+        with self._lock:
+            self._forget(key)
+
+    def evict_idle(self) -> int:
+        """
+        Forget every session idle for longer than the TTL, and the locks of
+        conversations without a session that were not asked for in that time
+        (a lock handed out more recently may be about to be acquired).
+
+        Returns:
+            Number of sessions forgotten
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            idle = [key for key, (_, last_used) in self._sessions.items() if last_used < cutoff]
+            for key in idle:
+                self._forget(key)
+            for key, (lock, handed_out) in list(self._locks.items()):
+                if handed_out < cutoff and key not in self._sessions and not lock.locked():
+                    del self._locks[key]
+        return len(idle)
+
+    def _maybe_evict(self, now: float) -> None:
+        with self._lock:
+            if now < self._next_eviction:
+                return
+            self._next_eviction = now + self.evict_interval
+        self.evict_idle()
+
+    def _forget(self, key: SessionKey) -> None:
+        self._sessions.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM slack_sessions WHERE user = ? AND channel = ? AND thread = ?", key)
+            self._conn.commit()
+
+    def _store(self, key: SessionKey, session_id: str, last_used: float) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO slack_sessions VALUES (?, ?, ?, ?, ?)",
+                               (*key, session_id, last_used))
+            self._conn.commit()
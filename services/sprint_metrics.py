@@ -0,0 +1,308 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import numpy as np
+from utils.config import JIRA_STORY_POINTS_FIELD, JIRA_SPRINT_FIELD
+from services.tenants import tenant_jira, tenant_scoped
+from services.lazy import function_tool, lazy_globals
+
+# Fields needed to compute sprint health
+METRIC_FIELDS = ["status", "assignee", "duedate", "resolutiondate", "created", "updated",
+                 JIRA_STORY_POINTS_FIELD, JIRA_SPRINT_FIELD]
+DAY = 86400.0
+# Open issues due within this many days count as near-due
+NEAR_DUE_DAYS = 2
+# Keys listed per risk bucket in the summary
+MAX_LISTED = 10
+# Open points above this multiple of the team median flag an overloaded assignee
+OVERLOAD_FACTOR = 1.5
+
+
+def parse_time(value: Optional[str]) -> float:
+    """Jira timestamp or date to epoch seconds (NaN when missing); dates mean end of day UTC."""
+    if not value:
+        return np.nan
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return np.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+        if len(value) == 10:
+            return parsed.timestamp() + DAY - 1
+    return parsed.timestamp()
+
+
+def _points(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class SprintColumns:
+    """
+    Columnar view of a sprint's issues: one NumPy array per attribute, so
+    every metric is a handful of vectorized reductions instead of a Python
+    loop (or an LLM pass) over the JSON.
+    """
+
+    def __init__(self, sprint: Dict, issues: List[Dict], changelogs: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Args:
+            sprint: Jira sprint (id, name, state, startDate, endDate, ...)
+            issues: The sprint's issues with METRIC_FIELDS
+            changelogs: Changelog histories per issue key; defaults to each
+                issue's ``changelog`` expansion
+        """
+        self.sprint = sprint
+        self.sprint_id = str(sprint.get('id'))
+        self.start = parse_time(sprint.get('startDate') or sprint.get('activatedDate'))
+        self.end = parse_time(sprint.get('completeDate') or sprint.get('endDate'))
+        n = len(issues)
+        self.keys = [issue['key'] for issue in issues]
+        self.points = np.full(n, np.nan)
+        self.initial_points = np.full(n, np.nan)
+        self.done = np.zeros(n, dtype=bool)
+        self.done_at = np.full(n, np.nan)
+        self.due = np.full(n, np.nan)
+        self.added_at = np.full(n, np.nan)
+        assignee_codes: Dict[str, int] = {}
+        self.assignee = np.zeros(n, dtype=np.int32)
+
+        for i, issue in enumerate(issues):
+            fields = issue.get('fields') or {}
+            status = fields.get('status') or {}
+            self.points[i] = self.initial_points[i] = _points(fields.get(JIRA_STORY_POINTS_FIELD))
+            self.done[i] = (status.get('statusCategory') or {}).get('key') == 'done'
+            self.due[i] = parse_time(fields.get('duedate'))
+            name = (fields.get('assignee') or {}).get('displayName') or 'Unassigned'
+            self.assignee[i] = assignee_codes.setdefault(name, len(assignee_codes))
+            histories = (changelogs or {}).get(issue['key'])
+            if histories is None:
+                histories = (issue.get('changelog') or {}).get('histories', [])
+            self._apply_changelog(i, histories, parse_time(fields.get('created')))
+            if self.done[i] and np.isnan(self.done_at[i]):
+                self.done_at[i] = parse_time(fields.get('resolutiondate') or fields.get('updated'))
+        self.assignees = list(assignee_codes)
+
+    def _apply_changelog(self, i: int, histories: Iterable[Dict], created: float) -> None:
+        """Derive when the issue joined the sprint, its points at sprint start and when it was finished."""
+        added_at = created
+        initial_seen = False
+        for history in sorted(histories, key=lambda h: parse_time(h.get('created'))):
+            at = parse_time(history.get('created'))
+            for item in history.get('items', []):
+                field_id = item.get('fieldId') or item.get('field')
+                if field_id in (JIRA_SPRINT_FIELD, 'Sprint'):
+                    before = {s.strip() for s in (item.get('from') or '').split(',')}
+                    after = {s.strip() for s in (item.get('to') or '').split(',')}
+                    if self.sprint_id in after and self.sprint_id not in before:
+                        added_at = at
+                elif field_id in (JIRA_STORY_POINTS_FIELD, 'Story Points', 'Story point estimate'):
+                    # The first change after the start holds the committed estimate
+                    if at > self.start and not initial_seen:
+                        self.initial_points[i] = _points(item.get('fromString'))
+                        initial_seen = True
+                elif field_id == 'resolution':
+                    # Cleared when the issue is reopened
+                    self.done_at[i] = at if item.get('to') or item.get('toString') else np.nan
+        self.added_at[i] = added_at
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def sprint_health(columns: SprintColumns, now: Optional[float] = None) -> Dict:
+    """
+    Compute a compact sprint health summary
+    
+    Args:
+        columns: Columnar sprint data
+        now: Evaluation time in epoch seconds (default: current time)
+        
+    Returns:
+        Dictionary with progress, scope change, burndown, workload and
+        due-date risk sections
+    """
+    now = time.time() if now is None else now
+    c = columns
+    start, end = c.start, c.end
+    if np.isnan(start):
+        start = np.nanmin(c.added_at) if len(c) and not np.all(np.isnan(c.added_at)) else now
+    if np.isnan(end):
+        end = max(now, start + DAY)
+    points = np.nan_to_num(c.points)
+    initial = np.where(np.isnan(c.initial_points), points, np.nan_to_num(c.initial_points))
+    committed = ~(c.added_at > start)
+    finished_by_now = c.done & ~(c.done_at > now)
+
+    committed_points = float(initial[committed].sum())
+    completed_points = float(points[finished_by_now].sum())
+    total_points = float(points.sum())
+    remaining_points = total_points - completed_points
+    added_points = float(points[~committed].sum())
+    reestimate_delta = float((points - initial)[committed].sum())
+
+    # Burndown: remaining scope at the end of each (UTC) sprint day, the last one cut off at the horizon
+    horizon = max(min(now, end), start)
+    days = np.append(np.arange((np.floor(start / DAY) + 1) * DAY, horizon, DAY), horizon)
+    labels = np.maximum(np.ceil(days / DAY) - 1, np.floor(start / DAY)) * DAY
+    joined = np.where(committed, start, c.added_at)
+    done_at = np.where(c.done & np.isnan(c.done_at), start, c.done_at)
+    order = np.argsort(joined)
+    scope = np.concatenate([[0.0], np.cumsum(points[order])])[np.searchsorted(joined[order], days, side='right')]
+    finished = ~np.isnan(done_at)
+    done_order = np.argsort(done_at[finished])
+    burned = np.concatenate([[0.0], np.cumsum(points[finished][done_order])])
+    burned = burned[np.searchsorted(done_at[finished][done_order], days, side='right')]
+    remaining_series = scope - burned
+    total_days = max((end - start) / DAY, 1.0)
+    ideal = committed_points * np.clip(1 - (days - start) / DAY / total_days, 0, 1)
+    burndown = [
+        {'date': datetime.fromtimestamp(label, timezone.utc).strftime('%Y-%m-%d'),
+         'remaining': round(float(left), 1), 'ideal': round(float(target), 1)}
+        for label, left, target in zip(labels, remaining_series, ideal)
+    ]
+
+    # Workload per assignee
+    count = len(c.assignees)
+    issues_per = np.bincount(c.assignee, minlength=count)
+    points_per = np.bincount(c.assignee, weights=points, minlength=count)
+    open_per = np.bincount(c.assignee, weights=np.where(finished_by_now, 0, points), minlength=count)
+    open_issues_per = np.bincount(c.assignee, weights=~finished_by_now, minlength=count)
+    workload = sorted((
+        {'assignee': name, 'issues': int(issues_per[i]), 'points': float(points_per[i]),
+         'open_issues': int(open_issues_per[i]), 'open_points': float(open_per[i])}
+        for i, name in enumerate(c.assignees)
+    ), key=lambda row: -row['open_points'])
+    assigned_open = np.array([row['open_points'] for row in workload if row['assignee'] != 'Unassigned'])
+    median_open = float(np.median(assigned_open)) if len(assigned_open) else 0.0
+    overloaded = [row['assignee'] for row in workload
+                  if row['assignee'] != 'Unassigned' and median_open and row['open_points'] > OVERLOAD_FACTOR * median_open]
+
+    # Due-date risk
+    open_issues = ~finished_by_now
+    overdue = np.flatnonzero(open_issues & (c.due < now))
+    near_due = np.flatnonzero(open_issues & (c.due >= now) & (c.due < now + NEAR_DUE_DAYS * DAY))
+    overdue = overdue[np.argsort(c.due[overdue])]
+    near_due = near_due[np.argsort(c.due[near_due])]
+
+    # Pace: points burned per elapsed day vs needed per remaining day
+    elapsed_days = float(np.clip((now - start) / DAY, 0, total_days))
+    remaining_days = max(total_days - elapsed_days, 0.0)
+    actual_rate = completed_points / elapsed_days if elapsed_days else 0.0
+    required_rate = remaining_points / remaining_days if remaining_days else float(remaining_points > 0) * np.inf
+    flags = []
+    if remaining_points and actual_rate < required_rate:
+        flags.append('behind pace')
+    if committed_points and added_points > 0.1 * committed_points:
+        flags.append('scope creep')
+    if overloaded:
+        flags.append('workload imbalance')
+    if len(overdue):
+        flags.append('overdue issues')
+
+    return {
+        'sprint': {'id': c.sprint.get('id'), 'name': c.sprint.get('name'), 'state': c.sprint.get('state'),
+                   'goal': c.sprint.get('goal') or None},
+        'progress': {
+            'days_elapsed': round(elapsed_days, 1),
+            'days_total': round(total_days, 1),
+            'issues_total': len(c),
+            'issues_done': int(finished_by_now.sum()),
+            'unestimated_issues': int(np.isnan(c.points).sum()),
+            'committed_points': committed_points,
+            'completed_points': completed_points,
+            'remaining_points': remaining_points,
+            'completion_pct': round(100 * completed_points / total_points, 1) if total_points else 0.0,
+            'actual_points_per_day': round(actual_rate, 2),
+            'required_points_per_day': round(required_rate, 2) if np.isfinite(required_rate) else None,
+        },
+        'scope_change': {
+            'added_issues': int((~committed).sum()),
+            'added_points': added_points,
+            'reestimate_delta': reestimate_delta,
+            'added_keys': [c.keys[i] for i in np.flatnonzero(~committed)[:MAX_LISTED]],
+        },
+        'burndown': burndown,
+        'workload': workload,
+        'overloaded': overloaded,
+        'overdue': {'count': len(overdue), 'keys': [c.keys[i] for i in overdue[:MAX_LISTED]]},
+        'near_due': {'count': len(near_due), 'keys': [c.keys[i] for i in near_due[:MAX_LISTED]]},
+        'risk_flags': flags,
+    }
+
+
+def fetch_sprint(client, sprint_id: str, fields: Optional[List[str]] = None
+                 ) -> Optional[Tuple[Dict, List[Dict], Optional[Dict[str, List[Dict]]]]]:
+    """
+    Fetch a sprint with its issues and changelogs
+    
+    A fresh local mirror answers without calling Jira; otherwise the issues
+    come from one paginated JQL search with the changelog expanded.
+    
+    Args:
+        client: JiraAPI instance
+        sprint_id: The ID of the sprint
+        fields: Issue fields to request (default: METRIC_FIELDS)
+        
+    Returns:
+        (sprint, issues, changelogs per issue key or None when the issues
+        carry their own), or None if the sprint could not be fetched
+    """
+    sprint = client.get_sprint(sprint_id)
+    if not sprint or 'error' in sprint:
+        return None
+    if client._mirror_ready():
+        issues = client.mirror.get_sprint_issues(sprint_id)
+        if issues:
+            return sprint, issues, client.mirror.get_sprint_changelogs(sprint_id)
+    issues = list(client.iter_search_issues(f"sprint = {sprint_id}", page_size=100, fields=fields or METRIC_FIELDS,
+                                            expand='changelog'))
+    return sprint, issues, None
+
+
+def load_sprint(client, sprint_id: str) -> Optional[SprintColumns]:
+    """
+    Fetch a sprint with its issues and changelogs and build its columns
+    
+    Args:
+        client: JiraAPI instance
+        sprint_id: The ID of the sprint
+        
+    Returns:
+        SprintColumns, or None if the sprint could not be fetched
+    """
+    fetched = fetch_sprint(client, sprint_id)
+    return SprintColumns(*fetched) if fetched else None
+
+
+async def get_sprint_health(sprint_id: str) -> Dict:
+    """
+    Compute sprint health metrics in code: committed vs completed points,
+    burndown, scope creep, per-assignee workload and overdue / near-due
+    issues. Use these numbers as-is instead of recomputing them.
+    
+    Args:
+        sprint_id: The ID of the sprint.
+        
+    Returns:
+        Dictionary with progress, scope_change, burndown, workload,
+        overdue, near_due and risk_flags sections.
+    """
+    try:
+        columns = await asyncio.to_thread(load_sprint, tenant_jira(), sprint_id)
+    except Exception as e:
+        print(f"Error loading sprint {sprint_id}: {e}")
+        return {'sprint_id': sprint_id, 'error': str(e)}
+    if columns is None:
+        return {'sprint_id': sprint_id, 'error': 'Sprint not found'}
+    return sprint_health(columns)
+
+
+__getattr__ = lazy_globals(globals(), get_sprint_health_tool=function_tool(tenant_scoped(get_sprint_health)))
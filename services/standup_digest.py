@@ -0,0 +1,451 @@
+import asyncio
+import json
+import math
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import (
+    STANDUP_DIGEST_BOARDS, STANDUP_DIGEST_TIME, STANDUP_DIGEST_DAYS, STANDUP_DIGEST_STAGGER,
+    STANDUP_DIGEST_PATH, STANDUP_DIGEST_MAX_AGE, SLACK_BOT_TOKEN, SLACK_API_URL,
+)
+from services.tenants import current_tenant, tenant_async_jira, tenant_jira, tenant_registry, tenant_scoped
+from services.jira_models import IssueRecord, ISSUE_FIELDS
+from services.slack_api import SlackAPI
+from services.sprint_metrics import DAY, METRIC_FIELDS, SprintColumns, fetch_sprint, sprint_health
+from services.lazy import function_tool, lazy_globals
+
+# One search feeds both the standup lists and the health metrics
+DIGEST_FIELDS = list(dict.fromkeys(ISSUE_FIELDS + METRIC_FIELDS))
+# Issues listed per person and bucket
+MAX_PER_BUCKET = 10
+# Changed issues returned on top of a stored digest
+MAX_CHANGES = 50
+
+
+def _is_blocked(record: IssueRecord) -> bool:
+    return 'block' in (record.status or '').lower() or any(link.startswith('is blocked by') for link in record.links)
+
+
+def build_digest(client, board_id: str, now: Optional[float] = None) -> Optional[Dict]:
+    """
+    Build a board's standup and sprint health digest in code (no LLM call)
+
+    Args:
+        client: JiraAPI instance
+        board_id: The ID of the board
+        now: Evaluation time in epoch seconds (default: current time)
+
+    Returns:
+        Digest dictionary with the sprint, per-person done / in progress /
+        blocked lists, sprint health and build time, or None if the board
+        has no active sprint
+    """
+    now = time.time() if now is None else now
+    sprint = client.get_active_sprint(board_id)
+    if not sprint or 'error' in sprint:
+        return None
+    fetched = fetch_sprint(client, str(sprint['id']), DIGEST_FIELDS)
+    if fetched is None:
+        return None
+    sprint, issues, changelogs = fetched
+    columns = SprintColumns(sprint, issues, changelogs)
+
+    # "Yesterday" reaches back over the weekend on Mondays
+    since = now - DAY * (3 if datetime.fromtimestamp(now).weekday() == 0 else 1)
+    standup: Dict[str, Dict[str, List[Dict]]] = {}
+    for i, issue in enumerate(issues):
+        record = IssueRecord.from_jira(issue)
+        category = ((issue.get('fields') or {}).get('status') or {}).get('statusCategory') or {}
+        if columns.done[i]:
+            bucket = 'done' if columns.done_at[i] >= since else None
+        elif _is_blocked(record):
+            bucket = 'blocked'
+        elif category.get('key') == 'indeterminate':
+            bucket = 'in_progress'
+        else:
+            bucket = None
+        if bucket is None:
+            continue
+        person = standup.setdefault(record.assignee or 'Unassigned', {'done': [], 'in_progress': [], 'blocked': []})
+        if len(person[bucket]) < MAX_PER_BUCKET:
+            person[bucket].append({'key': record.key, 'summary': record.summary, 'status': record.status})
+
+    return {
+        'board_id': str(board_id),
+        'sprint': {'id': sprint.get('id'), 'name': sprint.get('name'), 'goal': sprint.get('goal') or None},
+        'built_at': datetime.fromtimestamp(now, timezone.utc).isoformat(timespec='seconds'),
+        'built_ts': now,
+        'standup': standup,
+        'health': sprint_health(columns, now),
+    }
+
+
+def format_digest(digest: Dict) -> str:
+    """
+    Render a digest as a Slack message
+
+    Args:
+        digest: Result of build_digest
+
+    Returns:
+        Slack mrkdwn text
+    """
+    sprint = digest['sprint']
+    progress = digest['health']['progress']
+    lines = [f"*Daily standup: {sprint['name']}*"]
+    if sprint.get('goal'):
+        lines.append(f"_Goal: {sprint['goal']}_")
+    lines.append(f"{progress['completed_points']:g}/{progress['committed_points']:g} points done "
+                 f"({progress['completion_pct']}%), day {progress['days_elapsed']:g} of {progress['days_total']:g}")
+    flags = digest['health']['risk_flags']
+    if flags:
+        lines.append(f":warning: {', '.join(flags)}")
+    labels = (('done', 'Done'), ('in_progress', 'In progress'), ('blocked', ':no_entry: Blocked'))
+    for person, buckets in sorted(digest['standup'].items()):
+        lines.append(f"\n*{person}*")
+        for bucket, label in labels:
+            if buckets[bucket]:
+                lines.append(f"• {label}: " + ", ".join(f"{item['key']} {item['summary']}" for item in buckets[bucket]))
+    overdue = digest['health']['overdue']
+    if overdue['count']:
+        lines.append(f"\nOverdue ({overdue['count']}): {', '.join(overdue['keys'])}")
+    return "\n".join(lines)
+
+
+class DigestStore:
+    """
+    Latest digest per board, in SQLite so every process serves the same copy,
+    plus the scheduled runs processes have claimed, so each run happens once.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a private store)
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS standup_digests (
+                board_id TEXT PRIMARY KEY, built_at REAL NOT NULL, data TEXT NOT NULL)
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS standup_digest_runs (
+                run TEXT PRIMARY KEY, owner TEXT NOT NULL, claimed_at REAL NOT NULL)
+        """)
+        self._conn.commit()
+
+    def get(self, board_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM standup_digests WHERE board_id = ?",
+                                     (str(board_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, digest: Dict, key: Optional[str] = None) -> None:
+        """Store a digest under ``key`` (default: its board id)."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO standup_digests VALUES (?, ?, ?)",
+                               (key or digest['board_id'], digest['built_ts'], json.dumps(digest)))
+            self._conn.commit()
+
+    def claim(self, run: str, owner: str) -> bool:
+        """
+        Claim a scheduled run for ``owner``; only the first process to claim
+        it (across every process sharing the database file) gets True.
+        """
+        with self._lock:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO standup_digest_runs VALUES (?, ?, ?)",
+                                        (run, owner, time.time()))
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+
+class DigestScheduler:
+    """
+    Precomputes each configured board's standup digest before the team asks
+    for it and posts it to the board's Slack channel.
+
+    Runs once a day at ``at`` (local time) on ``days``, one board at a time
+    with ``stagger`` seconds in between, so the burst of Jira reads is spread
+    out instead of landing at standup time alongside everyone's questions.
+    A digest asked for before the run (or for another board) is built on
+    demand, once, however many people ask at the same moment.
+
+    Every process sharing the store may run the schedule: each run is
+    claimed in the store first and skipped by all but the first claimer.
+    """
+
+    def __init__(self, client, store: DigestStore, boards: Dict[str, str], at: str = "08:30",
+                 days: Optional[List[int]] = None, stagger: float = 60.0,
+                 post: Optional[Callable[[str, str], None]] = None, tenant: str = ""):
+        """
+        Args:
+            client: JiraAPI used to build digests (None = the default
+                    tenant's, looked up when the first digest is built)
+            store: Where digests are kept
+            boards: Board id -> Slack channel ('' = precompute only)
+            at: Daily run time, "HH:MM" local time
+            days: Weekdays to run on (Monday = 0; default Monday to Friday)
+            stagger: Seconds between two boards of a run
+            post: Callable(channel, text) posting to Slack
+            tenant: Tenant whose boards these are; board ids are only unique
+                    within a Jira site, so other tenants' digests are stored
+                    under "tenant/board"
+        """
+        self._client = client
+        self.store = store
+        self.tenant = tenant
+        self.boards = dict(boards)
+        self.at = at
+        self.days = list(range(5)) if days is None else list(days)
+        self.stagger = stagger
+        self.post = post
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def client(self):
+        """JiraAPI the digests are built with."""
+        return self._client or tenant_registry.clients(tenant_registry.default).jira
+
+    def _key(self, board_id: str) -> str:
+        return f"{self.tenant}/{board_id}" if self.tenant else str(board_id)
+
+    def build(self, board_id: str) -> Optional[Dict]:
+        """Build and store a board's digest now; returns it, or None if there is no active sprint."""
+        digest = build_digest(self.client, board_id)
+        if digest is not None:
+            self.store.put(digest, self._key(board_id))
+        return digest
+
+    def get(self, board_id: str, max_age: float) -> Optional[Dict]:
+        """
+        Return the stored digest, building it if it is missing, older than
+        ``max_age`` seconds or (per a fresh mirror) no longer for the board's
+        active sprint; concurrent callers wait for a single build.
+        """
+        board_id = str(board_id)
+        digest = self.store.get(self._key(board_id))
+        if self._current(digest, max_age):
+            return digest
+        with self._lock:
+            lock = self._locks.setdefault(board_id, threading.Lock())
+        with lock:
+            digest = self.store.get(self._key(board_id))
+            if self._current(digest, max_age):
+                return digest
+            return self.build(board_id)
+
+    def _current(self, digest: Optional[Dict], max_age: float) -> bool:
+        if digest is None or time.time() - digest['built_ts'] > max_age:
+            return False
+        # A sprint started or closed since (e.g. reported by a Jira webhook) makes the digest moot
+        if self.client._mirror_ready():
+            sprint = self.client.mirror.get_active_sprint(digest['board_id'])
+            return sprint is None or str(sprint['id']) == str(digest['sprint']['id'])
+        return True
+
+    def run_once(self) -> Dict[str, bool]:
+        """
+        Build, store and post every board's digest, ``stagger`` seconds apart.
+
+        Returns:
+            Board id -> whether a digest was built
+        """
+        results = {}
+        for i, (board_id, channel) in enumerate(self.boards.items()):
+            if i and self._stop.wait(self.stagger):
+                break
+            try:
+                digest = self.build(board_id)
+            except Exception as e:
+                print(f"Error building standup digest for board {board_id}: {e}")
+                digest = None
+            results[board_id] = digest is not None
+            if digest is not None and channel and self.post is not None:
+                try:
+                    self.post(channel, format_digest(digest))
+                except Exception as e:
+                    print(f"Error posting standup digest for board {board_id}: {e}")
+        return results
+
+    def next_run(self, now: datetime) -> datetime:
+        """First scheduled run time after ``now``."""
+        hour, minute = (int(part) for part in self.at.split(":"))
+        run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        while run <= now or run.weekday() not in self.days:
+            run += timedelta(days=1)
+        return run
+
+    def start(self) -> None:
+        """Run on schedule in a background thread."""
+        if self._thread is not None and self._thread.is_alive() or not self.days:
+            return
+        self._stop.clear()
+
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        def loop():
+            while True:
+                now = datetime.now()
+                run = self.next_run(now)
+                if self._stop.wait((run - now).total_seconds()):
+                    return
+                if self.store.claim(f"{self.tenant}/{run.isoformat()}", owner):
+                    print(f"Standup digests: {self.run_once()}")
+
+        self._thread = threading.Thread(target=loop, name='standup-digests', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_pending_searches: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+
+def _forget_search(key: Tuple[str, str, str], search: asyncio.Future) -> None:
+    # A search of another event loop may have replaced this one under the same key; leave that entry be
+    if _pending_searches.get(key) is search:
+        del _pending_searches[key]
+
+
+async def digest_changes(client, digest: Dict) -> List[Dict]:
+    """
+    Issues of the digest's sprint updated since it was built
+
+    Args:
+        client: AsyncJiraAPI instance
+        digest: A stored digest
+
+    Returns:
+        Compact issue records, most recently updated first
+    """
+    # Relative JQL dates sidestep timezone differences with the Jira user profile
+    minutes = math.ceil((time.time() - digest['built_ts']) / 60) + 1
+    jql = f"sprint = {digest['sprint']['id']} AND updated >= -{minutes}m ORDER BY updated DESC"
+    # Everyone asking within the same minute sends the same query; share one request (per site and account)
+    key = (client.base_url, client.account, jql)
+    search = _pending_searches.get(key)
+    if search is None or search.get_loop() is not asyncio.get_running_loop():
+        search = asyncio.ensure_future(client.search_issues(jql, max_results=MAX_CHANGES, fields=ISSUE_FIELDS))
+        _pending_searches[key] = search
+        search.add_done_callback(lambda done: _forget_search(key, done))
+    result = await asyncio.shield(search)
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return [IssueRecord.from_jira(issue).to_dict() for issue in result.get('issues', [])]
+
+
+def _post_to_slack(channel: str, text: str) -> None:
+    resp = slack_api.call("chat.postMessage", {"channel": channel, "text": text})
+    if not resp.ok or not resp.json().get("ok"):
+        print(f"Error posting standup digest to {channel}: {resp.status_code} {resp.text}")
+
+
+slack_api = SlackAPI(SLACK_API_URL, SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
+
+_digest_scheduler: Optional[DigestScheduler] = None
+_digest_scheduler_lock = threading.Lock()
+# On-demand digests of the other tenants (built when asked for, not on a schedule)
+_tenant_schedulers: Dict[str, DigestScheduler] = {}
+
+
+def build_digest_scheduler(path: str = STANDUP_DIGEST_PATH) -> DigestScheduler:
+    """
+    The default tenant's DigestScheduler over the configured boards, not started
+
+    Args:
+        path: SQLite file of its DigestStore
+
+    Returns:
+        A new DigestScheduler
+    """
+    return DigestScheduler(
+        None, DigestStore(path), STANDUP_DIGEST_BOARDS, at=STANDUP_DIGEST_TIME, days=STANDUP_DIGEST_DAYS,
+        stagger=STANDUP_DIGEST_STAGGER, post=_post_to_slack if slack_api else None,
+    )
+
+
+def digest_scheduler() -> DigestScheduler:
+    """The process's default DigestScheduler, built (but not started) on first use."""
+    global _digest_scheduler
+    with _digest_scheduler_lock:
+        if _digest_scheduler is None:
+            _digest_scheduler = build_digest_scheduler()
+        return _digest_scheduler
+
+
+def start_digest_scheduler() -> bool:
+    """
+    Run the configured boards' digests on schedule in this process. Called
+    by a long-running entry point (the Slack bot); runs already claimed by
+    another process sharing STANDUP_DIGEST_PATH are skipped.
+
+    Returns:
+        False if no boards are configured
+    """
+    if not STANDUP_DIGEST_BOARDS:
+        return False
+    digest_scheduler().start()
+    return True
+
+
+def tenant_digest_scheduler() -> DigestScheduler:
+    """The running tenant's DigestScheduler; they all share one store."""
+    tenant = current_tenant()
+    if tenant.name == tenant_registry.default.name:
+        return digest_scheduler()
+    scheduler = _tenant_schedulers.get(tenant.name)
+    if scheduler is None:
+        scheduler = _tenant_schedulers.setdefault(
+            tenant.name, DigestScheduler(tenant_jira(), digest_scheduler().store, {}, tenant=tenant.name))
+    return scheduler
+
+
+async def get_standup_digest(board_id: str = "") -> Dict:
+    """
+    Get the board's daily standup and sprint health digest: per person what
+    was done since yesterday, what is in progress and what is blocked, plus
+    sprint progress, risk flags and overdue issues. It is precomputed each
+    morning; ``changed_since_digest`` lists the issues updated after it was
+    built, with their current status, and takes precedence over the digest.
+
+    Args:
+        board_id: The ID of the board (default: the team's board).
+
+    Returns:
+        Dictionary with the digest and changed_since_digest.
+    """
+    board_id = board_id or current_tenant().board_id
+    try:
+        digest = await asyncio.to_thread(tenant_digest_scheduler().get, board_id, STANDUP_DIGEST_MAX_AGE)
+    except Exception as e:
+        print(f"Error loading standup digest for board {board_id}: {e}")
+        return {'board_id': board_id, 'error': str(e)}
+    if digest is None:
+        return {'board_id': board_id, 'error': 'No active sprint'}
+    try:
+        changes = await digest_changes(tenant_async_jira(), digest)
+    except Exception as e:
+        print(f"Error fetching changes since the standup digest: {e}")
+        changes = {'error': str(e)}
+    digest = {k: v for k, v in digest.items() if k != 'built_ts'}
+    return {'digest': digest, 'changed_since_digest': changes}
+
+
+__getattr__ = lazy_globals(
+    globals(), get_standup_digest_tool=function_tool(tenant_scoped(get_standup_digest)))
+
+
+if __name__ == "__main__":
+    # Build and post every configured board now (e.g. from cron instead of the in-process schedule)
+    print(digest_scheduler().run_once())
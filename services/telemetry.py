@@ -0,0 +1,327 @@
+import bisect
+import contextlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from opentelemetry import trace
+from opentelemetry.trace import INVALID_SPAN, StatusCode
+from utils.config import TELEMETRY, TELEMETRY_EXPORTER, TELEMETRY_TRACE_FILE
+
+# Histogram buckets in seconds, from cache-hit Jira reads up to long agent runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_HELP = {
+    'sprintmind_agent_duration_seconds': 'Agent invocation time',
+    'sprintmind_tool_duration_seconds': 'Tool call time',
+    'sprintmind_llm_duration_seconds': 'LLM call time',
+    'sprintmind_llm_tokens_total': 'LLM tokens by type (input, output)',
+    'sprintmind_jira_request_duration_seconds': 'Jira HTTP request time, retries included',
+    'sprintmind_jira_bytes_total': 'Jira HTTP body bytes by direction (in = as received, compressed)',
+    'sprintmind_slack_stage_duration_seconds': 'Slack bridge stage time (queue_wait: until a worker took the event, '
+                                               'first_text: until the first reply text)',
+    'sprintmind_slack_api_duration_seconds': 'Slack Web API call time, rate-limit waits included',
+}
+
+# Issue keys and numeric ids in Jira paths, replaced to keep metric labels bounded
+_ID_SEGMENT = re.compile(r'/(?:[A-Z][A-Z0-9_]*-\d+|\d+)(?=/|$)')
+_NOOP_SPAN = contextlib.nullcontext(INVALID_SPAN)
+_tracer: Optional[trace.Tracer] = None
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+
+def url_template(url: str) -> str:
+    """URL path with issue keys and ids replaced by ``{id}``."""
+    return _ID_SEGMENT.sub('/{id}', urlsplit(url).path)
+
+
+def span(name: str, attributes: Optional[Dict] = None):
+    """
+    Time a block as a span of the current trace
+
+    Unless telemetry is set up this returns a shared no-op context whose
+    span ignores attributes and events, so instrumented hot paths cost a
+    function call when it is off.
+
+    Args:
+        name: Span name
+        attributes: Initial span attributes
+
+    Returns:
+        Context manager yielding the span
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def add_event(name: str, attributes: Optional[Dict] = None) -> None:
+    """Record an event (e.g. a cache hit or a retry) on the current span."""
+    if _tracer is not None:
+        trace.get_current_span().add_event(name, attributes or {})
+
+
+def set_attribute(key: str, value) -> None:
+    """Set an attribute on the current span."""
+    if _tracer is not None:
+        trace.get_current_span().set_attribute(key, value)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+class Metrics:
+    """
+    Counters and histograms rendered in the Prometheus text format.
+
+    Collectors registered with ``register_collector`` are called on each
+    scrape, so counters other components already keep (cache, retry and
+    request stats) are exported without touching their hot paths.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, tuple], float] = {}
+        self._histograms: Dict[Tuple[str, tuple], List[float]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, Dict, float]]]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Add one observation to a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per-bucket counts, then sum and count
+                histogram = self._histograms[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def register_collector(self, collect: Callable[[], Iterable[Tuple[str, str, Dict, float]]]) -> None:
+        """
+        Export values computed at scrape time
+
+        Args:
+            collect: Callable returning ``(name, 'counter' | 'gauge', labels, value)`` tuples
+        """
+        self._collectors.append(collect)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Current values in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        for (name, labels), value in sorted(counters.items()):
+            families.setdefault(name, ('counter', []))[1].append(f"{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), values in sorted(histograms.items()):
+            lines = families.setdefault(name, ('histogram', []))[1]
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-2] + [values[-1] - sum(values[:-2])]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative:g}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {values[-1]:g}")
+        for collect in self._collectors:
+            try:
+                samples = list(collect())
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, kind, labels, value in samples:
+                families.setdefault(name, (kind, []))[1].append(
+                    f"{name}{_format_labels(tuple(sorted(labels.items())))} {value:g}")
+        out = []
+        for name, (kind, lines) in families.items():
+            if name in METRIC_HELP:
+                out.append(f"# HELP {name} {METRIC_HELP[name]}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+
+metrics = Metrics()
+
+
+def _build_span_metrics_processor():
+    from opentelemetry.sdk.trace import SpanProcessor
+
+    class SpanMetricsProcessor(SpanProcessor):
+        """
+        Turns finished spans into metrics: ADK's agent, tool and LLM spans
+        (token counts included) and this package's Jira and Slack spans.
+        """
+
+        def __init__(self, registry: Metrics):
+            self.metrics = registry
+
+        def on_end(self, span) -> None:
+            attributes = span.attributes or {}
+            seconds = (span.end_time - span.start_time) / 1e9
+            outcome = 'error' if span.status.status_code == StatusCode.ERROR else 'ok'
+            operation = attributes.get('gen_ai.operation.name')
+            agent = attributes.get('gen_ai.agent.name', '')
+            if operation == 'invoke_agent':
+                self.metrics.observe('sprintmind_agent_duration_seconds', seconds, agent=agent, outcome=outcome)
+            elif operation == 'execute_tool':
+                self.metrics.observe('sprintmind_tool_duration_seconds', seconds, tool=attributes.get('gen_ai.tool.name', ''),
+                                     agent=agent, outcome=outcome)
+            elif operation == 'generate_content':
+                model = attributes.get('gen_ai.request.model', '')
+                self.metrics.observe('sprintmind_llm_duration_seconds', seconds, agent=agent, model=model)
+                for kind in ('input', 'output'):
+                    tokens = attributes.get(f'gen_ai.usage.{kind}_tokens')
+                    if tokens:
+                        self.metrics.inc('sprintmind_llm_tokens_total', tokens, agent=agent, model=model, type=kind)
+            elif span.name.startswith('jira '):
+                status = attributes.get('http.response.status_code', 'error')
+                self.metrics.observe('sprintmind_jira_request_duration_seconds', seconds,
+                                     method=attributes.get('http.request.method', ''),
+                                     route=attributes.get('url.template', ''), status=str(status))
+                for direction, attribute in (('out', 'http.request.body.size'), ('in', 'http.response.body.size')):
+                    if attributes.get(attribute):
+                        self.metrics.inc('sprintmind_jira_bytes_total', attributes[attribute], direction=direction)
+            elif span.name.startswith('slack.'):
+                self.metrics.observe('sprintmind_slack_stage_duration_seconds', seconds, stage=span.name[6:])
+                if 'slack.queue_seconds' in attributes:
+                    self.metrics.observe('sprintmind_slack_stage_duration_seconds', attributes['slack.queue_seconds'],
+                                         stage='queue_wait')
+                for event in span.events:
+                    if event.name == 'first_text':
+                        self.metrics.observe('sprintmind_slack_stage_duration_seconds',
+                                             (event.timestamp - span.start_time) / 1e9, stage='first_text')
+            elif span.name.startswith('slack '):
+                self.metrics.observe('sprintmind_slack_api_duration_seconds', seconds, method=span.name[6:],
+                                     status=str(attributes.get('http.response.status_code', 'error')))
+
+    return SpanMetricsProcessor(metrics)
+
+
+def _build_jsonl_exporter(path: str):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """Appends finished spans as OpenTelemetry JSON, one per line."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> 'SpanExportResult':
+            with self._lock, open(self.path, 'a') as f:
+                for finished in spans:
+                    f.write(finished.to_json(indent=None) + "\n")
+            return SpanExportResult.SUCCESS
+
+    return JsonLinesSpanExporter(path)
+
+
+def _load_exporter(kind: str):
+    if kind == 'console':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if kind == 'file':
+        return _build_jsonl_exporter(TELEMETRY_TRACE_FILE)
+    if kind == 'otlp':
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            print("TELEMETRY_EXPORTER=otlp needs opentelemetry-exporter-otlp-proto-http; traces are not exported")
+            return None
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        return OTLPSpanExporter()
+    return None
+
+
+def setup_telemetry(service_name: str, enabled: bool = TELEMETRY, exporter: str = TELEMETRY_EXPORTER) -> bool:
+    """
+    Start recording spans and span-derived metrics in this process
+
+    Reuses the global OpenTelemetry tracer provider when one is set (the ADK
+    API server sets one for its trace view), so ADK's own agent, tool and
+    LLM spans land in the same traces and metrics as the Jira and Slack
+    spans recorded here.
+
+    Args:
+        service_name: ``service.name`` of a tracer provider created here
+        enabled: Set False to leave telemetry off (the default unless TELEMETRY=1)
+        exporter: 'otlp', 'console', 'file' (TELEMETRY_TRACE_FILE) or 'none'
+
+    Returns:
+        Whether telemetry is on
+    """
+    global _tracer
+    if not enabled:
+        return False
+    if _tracer is not None:
+        return True
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({'service.name': service_name}))
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(_build_span_metrics_processor())
+    span_exporter = _load_exporter(exporter)
+    if span_exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = trace.get_tracer('sprintmind')
+    return True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int, host: str = '0.0.0.0') -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` from a background thread (for processes without a web app of their own)."""
+    global _metrics_server
+    if not port or _metrics_server is not None:
+        return _metrics_server
+    try:
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"Error starting the metrics server on port {port}: {e}")
+        return None
+    _metrics_server.daemon_threads = True
+    threading.Thread(target=_metrics_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _metrics_server
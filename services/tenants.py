@@ -0,0 +1,363 @@
+import contextlib
+import functools
+import inspect
+import json
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from requests.adapters import HTTPAdapter
+from utils.config import (
+    JIRA_BASE_URL, EMAIL, API_TOKEN, JIRA_BOARD_ID, TENANTS_FILE, TENANT_RATE_SHARE,
+    JIRA_POOL_CONNECTIONS, JIRA_POOL_MAXSIZE, JIRA_TIMEOUT,
+    JIRA_RATE_LIMIT, JIRA_RATE_BURST, JIRA_MAX_CONCURRENCY,
+)
+from services.jira_async import AsyncConnectionPool, AsyncJiraAPI
+from services.jira_cache import ResponseCache
+from services.rate_limit import RequestScheduler
+from services.telemetry import metrics
+
+DEFAULT_TENANT = "default"
+
+
+@dataclass
+class Tenant:
+    """One team: the Jira site, account and board its Slack conversations work on."""
+    name: str
+    jira_url: str
+    email: str
+    api_token: str = field(repr=False)
+    board_id: str = "1"
+    slack_team: str = ""
+    slack_channels: Tuple[str, ...] = ()
+    # Request budget on the site (default: TENANT_RATE_SHARE of the site's)
+    rate: Optional[float] = None
+    max_concurrency: Optional[int] = None
+
+    @property
+    def site(self) -> str:
+        return (self.jira_url or "").rstrip('/')
+
+
+def load_tenants(path: str) -> Tuple[List[Tenant], Dict[str, Dict]]:
+    """
+    Read the tenants file
+
+    The file is JSON with a ``tenants`` list and optional per-site limits::
+
+        {"sites": {"https://acme.atlassian.net": {"rate": 10, "burst": 20, "max_concurrency": 8}},
+         "tenants": [{"name": "payments", "jira_url": "https://acme.atlassian.net",
+                      "email": "sprintmind@acme.com", "api_token_env": "ACME_JIRA_TOKEN",
+                      "board_id": "12", "slack_team": "T0123", "slack_channels": ["C0456"]}]}
+
+    ``api_token_env`` names the environment variable holding the token, so
+    the file itself need not contain secrets (``api_token`` also works). A
+    tenant without ``slack_channels`` serves its whole Slack workspace.
+
+    Args:
+        path: JSON file ('' = no tenants besides the default one)
+
+    Returns:
+        The tenants, and site URL -> rate / burst / max_concurrency overrides
+    """
+    if not path:
+        return [], {}
+    with open(path) as f:
+        config = json.load(f)
+    tenants = []
+    for entry in config.get('tenants', []):
+        token = entry.get('api_token') or os.getenv(entry.get('api_token_env', ''), '')
+        tenants.append(Tenant(
+            name=entry['name'], jira_url=entry['jira_url'], email=entry['email'], api_token=token,
+            board_id=str(entry.get('board_id', '1')), slack_team=entry.get('slack_team', ''),
+            slack_channels=tuple(entry.get('slack_channels', [])),
+            rate=entry.get('rate'), max_concurrency=entry.get('max_concurrency'),
+        ))
+    sites = {url.rstrip('/'): limits for url, limits in config.get('sites', {}).items()}
+    return tenants, sites
+
+
+class TenantClients(NamedTuple):
+    jira: object  # JiraAPI
+    async_jira: AsyncJiraAPI
+
+
+class JiraSite:
+    """
+    What every tenant on one Jira site shares: keep-alive connections (sync
+    and async), the response cache and the site's request budget.
+    """
+
+    def __init__(self, url: str, scheduler: RequestScheduler, cache: Optional[ResponseCache] = None,
+                 pool_connections: int = JIRA_POOL_CONNECTIONS, pool_maxsize: int = JIRA_POOL_MAXSIZE,
+                 timeout: float = JIRA_TIMEOUT):
+        """
+        Args:
+            url: Site URL (e.g. 'https://yourcompany.atlassian.net')
+            scheduler: Rate limit, concurrency cap and retries of the whole site
+            cache: Response cache; keys carry the Jira account, so tenants
+                   with different permissions never see each other's entries
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of keep-alive connections
+            timeout: Request timeout of the async pool in seconds
+        """
+        self.url = url.rstrip('/')
+        self.scheduler = scheduler
+        self.cache = cache
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.async_pool = AsyncConnectionPool(pool_maxsize, timeout)
+
+
+class TenantRegistry:
+    """
+    Maps Slack workspaces and channels to tenants and builds each tenant's
+    Jira clients on first use.
+
+    Clients of tenants on the same site share that site's JiraSite. Each
+    tenant gets its own RequestScheduler (``share`` of the site's rate and
+    concurrency unless the tenant sets its own) chained to the site's, so a
+    busy team is held to its budget and the site as a whole to Jira's. The
+    default tenant (the JIRA_URL / JIRA_USER / JIRA_API_TOKEN / JIRA_BOARD_ID
+    settings) uses the clients ``services.jira_client`` builds for it, which
+    are also built on first use: other tenants' clients need them first, for
+    the shared cache and their site.
+    """
+
+    def __init__(self, tenants: List[Tenant], default: Tenant, sites: Optional[Dict[str, Dict]] = None,
+                 share: float = 0.25):
+        """
+        Args:
+            tenants: Configured tenants
+            default: Tenant of conversations no other tenant claims
+            sites: Site URL -> rate / burst / max_concurrency overrides
+            share: Fraction of the site's budget one tenant may use by default
+        """
+        self.default = default
+        self.tenants: Dict[str, Tenant] = {default.name: default}
+        self.tenants.update((tenant.name, tenant) for tenant in tenants)
+        self.site_limits = dict(sites or {})
+        self.share = share
+        self._by_channel: Dict[Tuple[str, str], Tenant] = {}
+        self._by_team: Dict[str, Tenant] = {}
+        for tenant in tenants:
+            for channel in tenant.slack_channels:
+                self._by_channel[(tenant.slack_team, channel)] = tenant
+            if tenant.slack_team and not tenant.slack_channels:
+                self._by_team[tenant.slack_team] = tenant
+        self.cache: Optional[ResponseCache] = None
+        self._build_default: Optional[Callable[[], Tuple[JiraSite, object, AsyncJiraAPI]]] = None
+        self._sites: Dict[str, JiraSite] = {}
+        self._clients: Dict[str, TenantClients] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: Optional[str]) -> Tenant:
+        """The tenant called ``name``; the default tenant if there is none."""
+        tenant = self.tenants.get(name or self.default.name)
+        if tenant is None:
+            print(f"Unknown tenant {name!r}, using {self.default.name!r}")
+            return self.default
+        return tenant
+
+    def resolve(self, team: Optional[str], channel: Optional[str]) -> Tenant:
+        """
+        The tenant a Slack conversation belongs to
+
+        Args:
+            team: Slack workspace (team) id
+            channel: Slack channel id
+
+        Returns:
+            The tenant claiming the channel, else the workspace, else the default
+        """
+        team, channel = team or '', channel or ''
+        return (self._by_channel.get((team, channel)) or self._by_channel.get(('', channel))
+                or self._by_team.get(team) or self.default)
+
+    def register_default(self, build: Callable[[], Tuple[JiraSite, object, AsyncJiraAPI]]) -> None:
+        """
+        Set how the default tenant's site and clients are built; ``build`` is
+        called once, when a tenant's clients are first needed. The site's
+        cache is then shared with every other site. Without it the default
+        tenant's clients are built like any other tenant's.
+        """
+        self._build_default = build
+
+    def _default_clients(self) -> Optional[TenantClients]:
+        with self._lock:
+            clients = self._clients.get(self.default.name)
+            if clients is None and self._build_default is not None:
+                site, jira, async_jira = self._build_default()
+                self._sites[site.url] = site
+                self.cache = site.cache
+                clients = self._clients[self.default.name] = TenantClients(jira, async_jira)
+            return clients
+
+    def built(self, tenant: Tenant) -> Optional[TenantClients]:
+        """The tenant's clients if they were built already, else None."""
+        return self._clients.get(tenant.name)
+
+    def site(self, url: str) -> JiraSite:
+        """The shared resources of a site, created on first use."""
+        url = url.rstrip('/')
+        with self._lock:
+            site = self._sites.get(url)
+            if site is None:
+                limits = self.site_limits.get(url, {})
+                scheduler = RequestScheduler(rate=limits.get('rate', JIRA_RATE_LIMIT),
+                                             burst=limits.get('burst', JIRA_RATE_BURST),
+                                             max_concurrency=limits.get('max_concurrency', JIRA_MAX_CONCURRENCY))
+                site = self._sites[url] = JiraSite(url, scheduler, self.cache)
+            return site
+
+    def clients(self, tenant: Tenant) -> TenantClients:
+        """
+        The tenant's JiraAPI and AsyncJiraAPI, built on first use
+
+        Args:
+            tenant: A registered tenant
+
+        Returns:
+            TenantClients(jira, async_jira)
+        """
+        clients = self._clients.get(tenant.name)
+        if clients is not None:
+            return clients
+        # Importing the client module registers how the default tenant's clients are built
+        from services.jira_client import JiraAPI
+        default = self._default_clients()
+        if default is not None and tenant.name == self.default.name:
+            return default
+
+        site = self.site(tenant.site)
+        parent = site.scheduler
+        rate = tenant.rate or parent.bucket.rate * self.share
+        scheduler = RequestScheduler(
+            rate=rate, burst=max(1.0, parent.bucket.capacity * rate / parent.bucket.rate),
+            max_concurrency=tenant.max_concurrency or max(1, round(parent.max_concurrency * self.share)),
+            parent=parent)
+        jira = JiraAPI(tenant.jira_url, tenant.email, tenant.api_token, cache=site.cache,
+                       scheduler=scheduler, adapter=site.adapter)
+        async_jira = AsyncJiraAPI(tenant.jira_url, tenant.email, tenant.api_token, cache=site.cache,
+                                  scheduler=scheduler, pool=site.async_pool)
+        # The local mirror was synced with the default account; tenants on the same account may read it
+        if default is not None and default.jira.mirror is not None and \
+                (tenant.site, tenant.email) == (self.default.site, self.default.email):
+            jira.attach_mirror(default.jira.mirror, default.jira.mirror_max_age)
+            async_jira.attach_mirror(default.jira.mirror, default.jira.mirror_max_age)
+        with self._lock:
+            return self._clients.setdefault(tenant.name, TenantClients(jira, async_jira))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Throttle counters of every tenant whose clients were built, except the
+        default tenant: its scheduler is the site's, which counts every tenant
+        on the site (exported as the sprintmind_jira_* metrics).
+        """
+        with self._lock:
+            clients = dict(self._clients)
+        return {name: client.jira.get_throttle_stats() for name, client in clients.items()
+                if name != self.default.name}
+
+
+_tenants, _sites = load_tenants(TENANTS_FILE)
+tenant_registry = TenantRegistry(
+    _tenants, Tenant(DEFAULT_TENANT, JIRA_BASE_URL, EMAIL, API_TOKEN, board_id=JIRA_BOARD_ID),
+    sites=_sites, share=TENANT_RATE_SHARE,
+)
+
+# Tenant of the tool call being run; set from the ADK session state ("tenant")
+_current_tenant: ContextVar[Optional[str]] = ContextVar('sprintmind_tenant', default=None)
+
+
+def current_tenant() -> Tenant:
+    """The tenant the running tool call belongs to (the default tenant outside one)."""
+    return tenant_registry.get(_current_tenant.get())
+
+
+def tenant_jira():
+    """The running tenant's JiraAPI."""
+    return tenant_registry.clients(current_tenant()).jira
+
+
+def tenant_async_jira() -> AsyncJiraAPI:
+    """The running tenant's AsyncJiraAPI."""
+    return tenant_registry.clients(current_tenant()).async_jira
+
+
+@contextlib.contextmanager
+def use_tenant(name: Optional[str]) -> Iterator[Tenant]:
+    """Run the enclosed code (and threads or tasks it starts) as tenant ``name``."""
+    token = _current_tenant.set(name)
+    try:
+        yield tenant_registry.get(name)
+    finally:
+        _current_tenant.reset(token)
+
+
+def tenant_scoped(func: Callable) -> Callable:
+    """
+    Wrap a tool function so it runs as the tenant of the calling session
+
+    The wrapper takes an extra ``tool_context`` argument, which ADK fills in
+    (and leaves out of the declaration the model sees), and reads the
+    ``tenant`` session state from it. Called without one, e.g. when the
+    answer cache repeats a call, the tenant already set by ``use_tenant``
+    applies.
+    """
+    signature = inspect.signature(func)
+    context = inspect.Parameter('tool_context', inspect.Parameter.KEYWORD_ONLY, default=None)
+
+    def tenant_of(tool_context) -> Optional[str]:
+        if tool_context is not None and tool_context.state.get('tenant'):
+            return tool_context.state.get('tenant')
+        return _current_tenant.get()
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, tool_context=None, **kwargs):
+            with use_tenant(tenant_of(tool_context)):
+                return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, tool_context=None, **kwargs):
+            with use_tenant(tenant_of(tool_context)):
+                return func(*args, **kwargs)
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values()) + [context])
+    return wrapper
+
+
+def tenant_method(method: Callable) -> Callable:
+    """
+    Tool function calling a JiraAPI or AsyncJiraAPI method (e.g.
+    ``AsyncJiraAPI.search_issues``) on the client of the calling session's
+    tenant. Its signature is the method's without ``self``.
+    """
+    name = method.__name__
+    signature = inspect.signature(method)
+
+    if inspect.iscoroutinefunction(method):
+        async def call(*args, **kwargs):
+            return await getattr(tenant_async_jira(), name)(*args, **kwargs)
+    else:
+        def call(*args, **kwargs):
+            return getattr(tenant_jira(), name)(*args, **kwargs)
+    functools.update_wrapper(call, method)
+    call.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return tenant_scoped(call)
+
+
+def _tenant_metrics():
+    """Per-tenant Jira request counters, so a team running into its budget shows up on its own."""
+    for tenant, stats in tenant_registry.snapshot().items():
+        labels = {'tenant': tenant}
+        for name in ('attempts', 'throttled', 'limiter_wait_seconds'):
+            if name in stats:
+                yield f'sprintmind_tenant_jira_{name}_total', 'counter', labels, stats[name]
+        if 'in_flight' in stats:
+            yield 'sprintmind_tenant_jira_in_flight', 'gauge', labels, stats['in_flight']
+
+
+metrics.register_collector(_tenant_metrics)
@@ -0,0 +1,266 @@
+import functools
+import hashlib
+import inspect
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.config import TOOL_TOKEN_BUDGET, TOOL_TOKEN_BUDGETS, TOOL_OUTPUT_TTL, TOOL_OUTPUT_MAXSIZE
+from services.jira_models import IssueRecord
+from services.telemetry import add_event
+from services.lazy import function_tool, lazy_globals
+
+# Rough characters per token of JSON tool output; close enough for Gemini and
+# GPT tokenizers to decide whether a payload needs summarizing
+CHARS_PER_TOKEN = 4
+
+# Fields kept for issues listed in a summary; descriptions, sprint names and
+# issue types are what make a listing large without helping to triage it
+SUMMARY_FIELDS = ("key", "summary", "status", "assignee", "due_date", "priority", "story_points", "links")
+
+DONE_STATUS_RE = re.compile(r"done|closed|resolved|complete|cancel", re.I)
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate the prompt tokens a tool result takes up
+
+    Args:
+        value: JSON-serializable tool result
+
+    Returns:
+        Approximate token count
+    """
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN + 1
+
+
+def _record(issue: Dict) -> Dict:
+    """Compact record of a raw Jira issue; compact records pass through."""
+    return IssueRecord.from_jira(issue).to_dict() if 'fields' in issue else issue
+
+
+def _is_blocked(record: Dict) -> bool:
+    return 'block' in (record.get('status') or '').lower() or \
+        any(link.startswith('is blocked by') for link in record.get('links', []))
+
+
+def _is_overdue(record: Dict, today: str) -> bool:
+    due = record.get('due_date')
+    return bool(due) and due < today and not DONE_STATUS_RE.search(record.get('status') or '')
+
+
+def _brief(record: Dict) -> Dict:
+    """The triage fields of a record; of its links only the blocking ones."""
+    brief = {name: record[name] for name in SUMMARY_FIELDS if name in record and name != 'links'}
+    blockers = [link for link in record.get('links', []) if 'block' in link]
+    if blockers:
+        brief['links'] = blockers
+    return brief
+
+
+def budget_for(tool: str) -> int:
+    """Token budget of a tool's output (0 = unlimited)."""
+    return TOOL_TOKEN_BUDGETS.get(tool, TOOL_TOKEN_BUDGET)
+
+
+class ToolOutputStore:
+    """
+    Full tool results that were summarized for the model, kept for paging.
+
+    Issues are kept as compact records. Handles are derived from the
+    content, so the same data always gets the same handle and a repeated
+    call yields an identical summary (which the answer cache relies on).
+    Entries expire after ``ttl`` seconds; the least recently used are
+    evicted beyond ``maxsize``.
+    """
+
+    def __init__(self, ttl: float = 3600, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, tool: str, issues: List[Dict]) -> str:
+        """Keep the issue records and return their handle."""
+        digest = hashlib.sha1(json.dumps(issues, sort_keys=True, default=str).encode()).hexdigest()[:12]
+        handle = f"{tool}:{digest}"
+        with self._lock:
+            self._entries[handle] = (time.time(), issues)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                del self._entries[handle]
+                return None
+            self._entries.move_to_end(handle)
+            return entry[1]
+
+
+tool_outputs = ToolOutputStore(TOOL_OUTPUT_TTL, TOOL_OUTPUT_MAXSIZE)
+
+
+def _page_size(records: List[Dict], budget: int) -> int:
+    """How many issues of this result fit in one page within ``budget`` tokens."""
+    per_issue = max(1, estimate_tokens(records) // max(1, len(records)))
+    return max(1, int(0.8 * budget) // per_issue)
+
+
+def summarize_issues(tool: str, result: Dict, budget: int, store: ToolOutputStore = tool_outputs) -> Dict:
+    """
+    Compress an issue-list tool result to about ``budget`` tokens
+
+    Issues are counted by status and by assignee (with story points);
+    blocked and overdue issues are kept as brief records, most overdue
+    first, and the rest are listed as keys per status while they fit. The
+    full list is kept in ``store`` under a handle the model can page
+    through with ``read_tool_output``. Other keys of the result (sprint id,
+    missing keys, totals) are kept.
+
+    Args:
+        tool: Name of the tool that produced the result
+        result: Tool result with an ``issues`` list
+        budget: Token budget for the summary
+        store: Where the full issue list is kept
+
+    Returns:
+        The summarized result
+    """
+    records = [_record(issue) for issue in result['issues']]
+    today = date.today().isoformat()
+    by_status, by_assignee = Counter(), {}
+    attention = []
+    for record in records:
+        by_status[record.get('status') or 'Unknown'] += 1
+        person = by_assignee.setdefault(record.get('assignee') or 'Unassigned', {'issues': 0, 'points': 0.0})
+        person['issues'] += 1
+        person['points'] += record.get('story_points') or 0
+        blocked, overdue = _is_blocked(record), _is_overdue(record, today)
+        if blocked or overdue:
+            brief = _brief(record)
+            if blocked:
+                brief['blocked'] = True
+            if overdue:
+                brief['overdue'] = True
+            attention.append(brief)
+    attention.sort(key=lambda r: (not r.get('overdue'), r.get('due_date') or '9999', r['key']))
+
+    handle = store.put(tool, records)
+    summary = {name: value for name, value in result.items() if name != 'issues'}
+    summary.update({
+        'summarized': f"{len(records)} issues (~{estimate_tokens(result)} tokens) exceed this tool's "
+                      f"{budget}-token budget. Blocked and overdue issues are listed in full; page through "
+                      f"everything with read_tool_output(handle, page), optionally filtered by status or assignee.",
+        'handle': handle,
+        'total_issues': len(records),
+        'pages': -(-len(records) // _page_size(records, budget)),
+        'by_status': dict(by_status.most_common()),
+        'by_assignee': dict(sorted(by_assignee.items(), key=lambda item: -item[1]['issues'])),
+    })
+
+    # Keep as many attention items as fit, then spend what is left on keys per status
+    used, kept = estimate_tokens(summary) + 10, 0
+    for brief in attention:
+        used += estimate_tokens(brief)
+        if used > budget:
+            break
+        kept += 1
+    summary['blocked_or_overdue'] = attention[:kept]
+    if kept < len(attention):
+        summary['blocked_or_overdue_omitted'] = len(attention) - kept
+    keys = {}
+    for record in records:
+        keys.setdefault(record.get('status') or 'Unknown', []).append(record['key'])
+    summary['keys_by_status'] = keys
+    if estimate_tokens(summary) > budget:
+        del summary['keys_by_status']
+    return summary
+
+
+def apply_budget(tool: str, result: Any, budget: Optional[int] = None) -> Any:
+    """
+    Summarize an issue-list result that is over the tool's token budget
+
+    Args:
+        tool: Tool name (TOOL_TOKEN_BUDGETS overrides TOOL_TOKEN_BUDGET per tool)
+        result: The tool's result
+        budget: Override for the configured budget
+
+    Returns:
+        The result unchanged if it fits (or is not an issue list), else its summary
+    """
+    budget = budget_for(tool) if budget is None else budget
+    if not budget or not isinstance(result, dict) or 'error' in result or not result.get('issues'):
+        return result
+    tokens = estimate_tokens(result)
+    if tokens <= budget:
+        return result
+    try:
+        summary = summarize_issues(tool, result, budget)
+    except Exception as e:
+        print(f"Error summarizing {tool} output: {e}")
+        return result
+    add_event('tool_output.summarized', {'tool': tool, 'tokens': tokens, 'summary_tokens': estimate_tokens(summary),
+                                         'budget': budget})
+    return summary
+
+
+def budgeted(func: Callable) -> Callable:
+    """
+    Wrap a tool function so its result goes through ``apply_budget``
+
+    The wrapper keeps the function's name, signature and docstring, so the
+    FunctionTool built from it looks the same to the model.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return apply_budget(func.__name__, await func(*args, **kwargs))
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return apply_budget(func.__name__, func(*args, **kwargs))
+    return wrapper
+
+
+def read_tool_output(handle: str, page: int = 1, status: str = "", assignee: str = "") -> Dict:
+    """
+    Read the full issues behind a summarized tool result, one page at a time.
+    Use the ``handle`` from a result marked ``summarized``.
+
+    Args:
+        handle: The summarized result's handle.
+        page: Page number, starting at 1.
+        status: Only issues with this status (e.g. 'In Progress'), optional.
+        assignee: Only issues assigned to this person ('Unassigned' for none), optional.
+
+    Returns:
+        Dictionary with the page of issues, the page count and the number of matching issues.
+    """
+    records = tool_outputs.get(handle)
+    if records is None:
+        return {'handle': handle, 'error': 'Unknown or expired handle; call the original tool again.'}
+    if status:
+        records = [r for r in records if (r.get('status') or '').lower() == status.lower()]
+    if assignee:
+        records = [r for r in records if (r.get('assignee') or 'Unassigned').lower() == assignee.lower()]
+    size = _page_size(records, budget_for(handle.split(':', 1)[0])) if records else 1
+    pages = max(1, -(-len(records) // size))
+    page = min(max(1, page), pages)
+    return {'handle': handle, 'page': page, 'pages': pages, 'matching': len(records),
+            'issues': records[(page - 1) * size:page * size]}
+
+
+__getattr__ = lazy_globals(globals(), read_tool_output_tool=function_tool(read_tool_output))
@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import slack_sessions  # noqa: E402
+from services.slack_sessions import SessionRegistry  # noqa: E402
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_idle_sessions_and_their_locks_are_evicted(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(slack_sessions, "time", clock)
+    registry = SessionRegistry(ttl=60)
+
+    for i in range(100):
+        key = SessionRegistry.key(f"U{i}", "C1", None)
+        with registry.lock(key):
+            registry.put(key, f"session-{i}")
+    # A conversation whose session was never created still got a lock
+    registry.lock(SessionRegistry.key("U-failed", "C1", None))
+    assert len(registry) == 100 and len(registry._locks) == 101
+
+    clock.now += 61
+    active = SessionRegistry.key("U-active", "C2", None)
+    with registry.lock(active):
+        registry.put(active, "session-active")
+
+    assert len(registry) == 1
+    assert list(registry._locks) == [active]
+    assert registry.get(active) == "session-active"
+
+
+def test_eviction_is_amortized_and_keeps_live_entries(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(slack_sessions, "time", clock)
+    registry = SessionRegistry(ttl=60, evict_interval=30)
+    old, recent = SessionRegistry.key("U1", "C1", None), SessionRegistry.key("U2", "C1", None)
+    registry.lock(old)
+    registry.put(old, "session-old")
+
+    clock.now += 20
+    registry.lock(recent)
+    registry.put(recent, "session-recent")
+    clock.now += 15
+    assert registry.get(recent) == "session-recent"  # first sweep: nothing idle yet
+
+    clock.now += 27
+    # The old session is idle now, but the next sweep is not due for another 3s
+    assert registry.get(recent) == "session-recent"
+    assert len(registry) == 2 and len(registry._locks) == 2
+
+    clock.now += 5
+    assert registry.get(recent) == "session-recent"
+    assert len(registry) == 1 and list(registry._locks) == [recent]
+
+
+def test_held_lock_is_not_evicted(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(slack_sessions, "time", clock)
+    registry = SessionRegistry(ttl=60)
+    key = SessionRegistry.key("U1", "C1", "1700000000.000100")
+    lock = registry.lock(key)
+    lock.acquire()
+    try:
+        clock.now += 120
+        assert registry.evict_idle() == 0
+        assert registry.lock(key) is lock
+    finally:
+        lock.release()
@@ -3,13 +3,138 @@ import os
 
 load_dotenv()
 
+# Project root; files given by a relative path live here, whatever the working directory, so
+# the Slack bot, the ADK server, the webhook receiver and the CLIs all use the same ones
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def project_path(path: str) -> str:
+    """Resolve a relative file path against the project root ("" and ":memory:" are left alone)."""
+    return path if path in ("", ":memory:") or os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
 JIRA_BASE_URL = os.getenv("JIRA_URL")
 EMAIL = os.getenv("JIRA_USER")
 API_TOKEN = os.getenv("JIRA_API_TOKEN")
+# Board the agents work on when a conversation is not mapped to another tenant
+JIRA_BOARD_ID = os.getenv("JIRA_BOARD_ID", "1")
 # LLM_MODEL = os.getenv("OPENAI_MODEL")
 # LLM_MODEL = os.getenv("GEMMA_MODEL")
 # LLM_MODEL = os.getenv("PHI_MODEL")
 # LLM_MODEL = os.getenv("MISTRAL_MODEL")
 # LLM_MODEL = os.getenv("LLAMA_MODEL")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-LLM_MODEL = "gemini-2.0-flash"
\ No newline at end of file
+LLM_MODEL = "gemini-2.0-flash"
+# Jira HTTP connection pool
+JIRA_POOL_CONNECTIONS = int(os.getenv("JIRA_POOL_CONNECTIONS", "4"))
+JIRA_POOL_MAXSIZE = int(os.getenv("JIRA_POOL_MAXSIZE", "16"))
+JIRA_TIMEOUT = float(os.getenv("JIRA_TIMEOUT", "30"))
+
+# Jira custom field ids (vary per site; see /rest/api/3/field)
+JIRA_STORY_POINTS_FIELD = os.getenv("JIRA_STORY_POINTS_FIELD", "customfield_10016")
+JIRA_SPRINT_FIELD = os.getenv("JIRA_SPRINT_FIELD", "customfield_10020")
+
+# Bulk creation of approved epic breakdowns
+JIRA_SUBTASK_TYPE = os.getenv("JIRA_SUBTASK_TYPE", "Sub-task")  # "Subtask" on team-managed projects
+JIRA_BULK_BATCH_SIZE = int(os.getenv("JIRA_BULK_BATCH_SIZE", "50"))  # Jira's limit per request
+
+# Jira response cache: "memory", "sqlite" or "none"
+JIRA_CACHE_BACKEND = os.getenv("JIRA_CACHE_BACKEND", "memory")
+JIRA_CACHE_PATH = project_path(os.getenv("JIRA_CACHE_PATH", "jira_cache.sqlite3"))
+JIRA_CACHE_MAXSIZE = int(os.getenv("JIRA_CACHE_MAXSIZE", "1024"))
+
+# Maximum concurrent requests from the async Jira client
+JIRA_MAX_CONCURRENCY = int(os.getenv("JIRA_MAX_CONCURRENCY", "8"))
+
+# Client-side Jira rate limit and retry policy
+JIRA_RATE_LIMIT = float(os.getenv("JIRA_RATE_LIMIT", "10"))
+JIRA_RATE_BURST = float(os.getenv("JIRA_RATE_BURST", "20"))
+JIRA_MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", "4"))
+JIRA_BACKOFF_BASE = float(os.getenv("JIRA_BACKOFF_BASE", "0.5"))
+JIRA_BACKOFF_MAX = float(os.getenv("JIRA_BACKOFF_MAX", "30"))
+
+# Local Jira mirror (disabled unless JIRA_MIRROR_PATH is set)
+JIRA_MIRROR_PATH = project_path(os.getenv("JIRA_MIRROR_PATH", ""))
+JIRA_MIRROR_JQL = os.getenv("JIRA_MIRROR_JQL", "updated >= -365d")
+JIRA_MIRROR_BOARDS = [b for b in os.getenv("JIRA_MIRROR_BOARDS", "1").split(",") if b]
+JIRA_MIRROR_MAX_AGE = float(os.getenv("JIRA_MIRROR_MAX_AGE", "300"))
+JIRA_MIRROR_SYNC_INTERVAL = float(os.getenv("JIRA_MIRROR_SYNC_INTERVAL", "60"))
+
+# Knowledge base semantic index
+KB_EMBEDDING_MODEL = os.getenv("KB_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+KB_INDEX_PATH = project_path(os.getenv("KB_INDEX_PATH", "kb_index"))
+KB_INDEX_JQL = os.getenv("KB_INDEX_JQL", "updated >= -730d")
+KB_INDEX_ANN = os.getenv("KB_INDEX_ANN", "auto")  # "auto" (use hnswlib if installed), "on" or "off"
+# Cross-encoder used to re-rank knowledge base hits (empty disables re-ranking)
+KB_RERANK_MODEL = os.getenv("KB_RERANK_MODEL", "")
+
+# Pre-router that sends clear single-agent requests straight to that agent
+INTENT_ROUTER = os.getenv("INTENT_ROUTER", "1") == "1"
+INTENT_ROUTER_THRESHOLD = float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.55"))
+INTENT_ROUTER_MARGIN = float(os.getenv("INTENT_ROUTER_MARGIN", "0.08"))
+# Compound requests run their agents in parallel (at most this many at once)
+INTENT_FANOUT = os.getenv("INTENT_FANOUT", "1") == "1"
+INTENT_FANOUT_CONCURRENCY = int(os.getenv("INTENT_FANOUT_CONCURRENCY", "3"))
+INTENT_FANOUT_TIMEOUT = float(os.getenv("INTENT_FANOUT_TIMEOUT", "120"))
+
+# Reuse answers to near-identical questions while the Jira data behind them is unchanged
+AGENT_CACHE = os.getenv("AGENT_CACHE", "1") == "1"
+AGENT_CACHE_TTL = float(os.getenv("AGENT_CACHE_TTL", "600"))
+AGENT_CACHE_MAXSIZE = int(os.getenv("AGENT_CACHE_MAXSIZE", "256"))
+AGENT_CACHE_SIMILARITY = float(os.getenv("AGENT_CACHE_SIMILARITY", "0.92"))
+
+# Standup digests precomputed off-peak and posted to Slack: "board:channel" pairs
+# (a board without a channel is precomputed but not posted)
+STANDUP_DIGEST_BOARDS = dict(
+    (entry.split(":", 1) + [""])[:2] for entry in os.getenv("STANDUP_DIGEST_BOARDS", "").split(",") if entry
+)
+STANDUP_DIGEST_TIME = os.getenv("STANDUP_DIGEST_TIME", "08:30")  # local time
+STANDUP_DIGEST_DAYS = [int(d) for d in os.getenv("STANDUP_DIGEST_DAYS", "0,1,2,3,4").split(",") if d]  # Monday = 0
+# Seconds between boards, so a run stays well under the Jira rate limit
+STANDUP_DIGEST_STAGGER = float(os.getenv("STANDUP_DIGEST_STAGGER", "60"))
+STANDUP_DIGEST_PATH = project_path(os.getenv("STANDUP_DIGEST_PATH", "standup_digests.sqlite3"))
+# Older digests are rebuilt when asked for
+STANDUP_DIGEST_MAX_AGE = float(os.getenv("STANDUP_DIGEST_MAX_AGE", "43200"))
+SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_API_URL = os.getenv("SLACK_API_URL", "https://slack.com/api")
+
+# Jira webhook receiver (services/jira_webhooks.py) applying changes to the mirror, caches and KB
+JIRA_WEBHOOK_PORT = int(os.getenv("JIRA_WEBHOOK_PORT", "3001"))
+JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET", "")  # HMAC secret set on the Jira webhook
+# Without a secret every request is refused, unless unsigned webhooks are explicitly allowed
+JIRA_WEBHOOK_ALLOW_UNSIGNED = os.getenv("JIRA_WEBHOOK_ALLOW_UNSIGNED", "0") == "1"
+JIRA_WEBHOOK_QUEUE_SIZE = int(os.getenv("JIRA_WEBHOOK_QUEUE_SIZE", "1000"))
+# Events applied per mirror transaction / KB update
+JIRA_WEBHOOK_BATCH_SIZE = int(os.getenv("JIRA_WEBHOOK_BATCH_SIZE", "100"))
+JIRA_WEBHOOK_KB = os.getenv("JIRA_WEBHOOK_KB", "1") == "1"
+# Append accepted payloads to this JSON-lines file, for `python -m services.jira_webhooks replay`
+JIRA_WEBHOOK_RECORD = project_path(os.getenv("JIRA_WEBHOOK_RECORD", ""))
+
+# Tracing and metrics: Jira, Slack, agent, tool and LLM spans (off unless TELEMETRY=1)
+TELEMETRY = os.getenv("TELEMETRY", "0") == "1"
+TELEMETRY_EXPORTER = os.getenv("TELEMETRY_EXPORTER", "none")  # "otlp", "console", "file" or "none"
+TELEMETRY_TRACE_FILE = project_path(os.getenv("TELEMETRY_TRACE_FILE", "traces.jsonl"))
+# Prometheus /metrics port of the ADK server process (0 = none); the Slack bot and
+# webhook receiver serve /metrics on their own port
+TELEMETRY_METRICS_PORT = int(os.getenv("TELEMETRY_METRICS_PORT", "9464"))
+
+# Issue-list tool results over their token budget are summarized for the model
+# (counts by status/assignee, blocked and overdue issues in full) with a handle
+# to page through the rest; 0 = never summarize. TOOL_TOKEN_BUDGETS overrides
+# per tool, e.g. "list_sprint_issues:6000,search_issues:3000"
+TOOL_TOKEN_BUDGET = int(os.getenv("TOOL_TOKEN_BUDGET", "4000"))
+TOOL_TOKEN_BUDGETS = {
+    name: int(budget) for name, budget in
+    (entry.split(":", 1) for entry in os.getenv("TOOL_TOKEN_BUDGETS", "").split(",") if entry)
+}
+# Full results behind summaries are kept this long (s) / this many, for paging
+TOOL_OUTPUT_TTL = float(os.getenv("TOOL_OUTPUT_TTL", "3600"))
+TOOL_OUTPUT_MAXSIZE = int(os.getenv("TOOL_OUTPUT_MAXSIZE", "64"))
+
+# Several teams in one process: a JSON file mapping Slack workspaces/channels to
+# a Jira site, account and board per team (see services/tenants.py). Without it
+# every conversation uses JIRA_URL / JIRA_USER / JIRA_API_TOKEN / JIRA_BOARD_ID.
+TENANTS_FILE = project_path(os.getenv("TENANTS_FILE", ""))
+# Share of its site's request rate and concurrency one team may use, unless the
+# file sets "rate" / "max_concurrency" for it
+TENANT_RATE_SHARE = float(os.getenv("TENANT_RATE_SHARE", "0.25"))